@@ -0,0 +1,72 @@
+# benchmarks/bench_async_fetch.py
+"""
+Wall-clock speedup of AsyncCandleFetcher over serial get_candles calls
+for a full sweep of instruments x timeframes against a mock server that
+injects per-request latency.
+
+Run from the repository root:
+    python -m benchmarks.bench_async_fetch
+"""
+
+import asyncio
+import os
+import time
+
+from benchmarks.mock_oanda import MockOandaServer
+from benchmarks.synthetic import GRANULARITY_NS
+from config import DataConfig
+
+LATENCY = 0.05  # seconds injected per request
+COUNT = 500
+
+
+def main():
+    os.environ.setdefault('OANDA_API_TOKEN', 'benchmark-token')
+    os.environ.setdefault('OANDA_ACCOUNT_ID', 'benchmark-account')
+
+    timeframes = [tf for tf in DataConfig.SUPPORTED_TIMEFRAMES
+                  if tf in GRANULARITY_NS]
+    jobs = [(instrument, tf, COUNT)
+            for instrument in DataConfig.SUPPORTED_INSTRUMENTS
+            for tf in timeframes]
+
+    print("=" * 60)
+    print("ASYNC FETCH BENCHMARK")
+    print("=" * 60)
+    print(f"{len(jobs)} jobs, {LATENCY * 1000:.0f}ms injected latency each")
+
+    with MockOandaServer(latency=LATENCY) as server:
+        os.environ['OANDA_BASE_URL'] = server.url
+        from src.oanda_api import OandaAPI
+        from src.oanda_async import AsyncCandleFetcher
+
+        api = OandaAPI()
+        start = time.perf_counter()
+        for instrument, tf, count in jobs:
+            api.get_candles(instrument, granularity=tf, count=count)
+        serial = time.perf_counter() - start
+
+        fetcher = AsyncCandleFetcher(max_concurrency=10)
+
+        async def stream():
+            first = None
+            rows = 0
+            async for result in fetcher.fetch(jobs):
+                if first is None:
+                    first = time.perf_counter() - start
+                rows += len(result.df)
+            return first, rows
+
+        start = time.perf_counter()
+        first_result, rows = asyncio.run(stream())
+        concurrent = time.perf_counter() - start
+        fetcher.close()
+
+    print(f"serial     : {serial:.2f}s")
+    print(f"concurrent : {concurrent:.2f}s "
+          f"(first result after {first_result * 1000:.0f}ms, {rows:,} rows)")
+    print(f"speedup    : {serial / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
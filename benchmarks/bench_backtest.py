@@ -0,0 +1,77 @@
+# benchmarks/bench_backtest.py
+"""
+Benchmark the backtest engines on a year of H1 EUR_USD.
+
+The bundled eur_usd_1h.csv is tiled to a year of FX trading hours
+(~6,200 bars, see bench_indicators.scale_up). Reports bars/second for a
+single vectorized run, a single event-driven run, and parameter sweeps
+of a few thousand combinations on one worker and on every CPU.
+
+Run from the repository root:
+    python -m benchmarks.bench_backtest
+"""
+
+import os
+import time
+
+from benchmarks.bench_indicators import load_csv, scale_up
+from src.backtest.engine import run_events, run_vectorized
+from src.backtest.strategies import SmaCrossover, rsi_reversion, \
+    sma_crossover
+from src.backtest.sweep import parameter_grid, run_sweep
+
+BARS = 24 * 5 * 52  # One year of H1 FX candles
+REPEATS = 20
+
+
+def best_of(func, *args, repeats=REPEATS):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    df = scale_up(load_csv('eur_usd_1h.csv'), BARS)
+    signal = sma_crossover(df, 20, 50)
+
+    print("=" * 60)
+    print(f"SINGLE RUN ({len(df):,} H1 bars)")
+    print("=" * 60)
+    vectorized = best_of(run_vectorized, df, signal)
+    events = best_of(run_events, df, SmaCrossover(20, 50), repeats=3)
+    print(f"{'vectorized':>14} {vectorized * 1e3:>9.2f} ms "
+          f"{len(df) / vectorized:>14,.0f} bars/s")
+    print(f"{'event-driven':>14} {events * 1e3:>9.2f} ms "
+          f"{len(df) / events:>14,.0f} bars/s")
+
+    sweeps = {
+        'sma_crossover': (sma_crossover, parameter_grid(
+            fast=range(2, 62), slow=range(10, 300, 4),
+            where=lambda p: p['fast'] < p['slow'])),
+        'rsi_reversion': (rsi_reversion, parameter_grid(
+            window=range(5, 41), lower=range(10, 45, 2),
+            upper=range(56, 91, 2))),
+    }
+
+    for name, (signal_func, grid) in sweeps.items():
+        print()
+        print("=" * 60)
+        print(f"SWEEP {name}: {len(grid):,} combinations")
+        print("=" * 60)
+        print(f"{'workers':>8} {'wall (s)':>10} {'combos/s':>10} "
+              f"{'bars/s':>14}")
+        for workers in sorted({1, os.cpu_count()}):
+            start = time.perf_counter()
+            results = run_sweep(df, signal_func, grid, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            assert len(results) == len(grid)
+            print(f"{workers:>8} {elapsed:>10.2f} "
+                  f"{len(grid) / elapsed:>10,.0f} "
+                  f"{len(grid) * len(df) / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
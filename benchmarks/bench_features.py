@@ -0,0 +1,98 @@
+# benchmarks/bench_features.py
+"""
+Benchmark parallel feature computation as the worker count grows.
+
+Ten synthetic instruments across six intraday granularities (60 series)
+go through compute_features_parallel with 1, 2, 4, ... workers up to
+the CPU count, each worker writing its series to a FeatureStore in a
+temporary directory, so the scaling includes storing. Final runs read
+from a BinaryCandleCache instead, with and without storing, to separate
+compute from storage.
+
+Run from the repository root:
+    python -m benchmarks.bench_features
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_candle_frame
+from config import DataConfig
+from src.features.parallel import compute_features_parallel
+from src.storage.binary_cache import BinaryCandleCache
+from src.storage.feature_store import FeatureStore
+
+ROWS_PER_SERIES = 200_000
+# 200k daily or weekly candles would run past pandas' year-2262 limit
+GRANULARITIES = ['M1', 'M5', 'M15', 'M30', 'H1', 'H4']
+
+
+def worker_counts():
+    counts, n = [], 1
+    while n < os.cpu_count():
+        counts.append(n)
+        n *= 2
+    return counts + [os.cpu_count()]
+
+
+def discard(features, instrument, granularity):
+    pass
+
+
+def timed_run(**kwargs):
+    start = time.perf_counter()
+    results = compute_features_parallel(**kwargs)
+    elapsed = time.perf_counter() - start
+    assert all(r['status'] == 'SUCCESS' for r in results)
+    return results, elapsed
+
+
+def main():
+    series = [(instrument, granularity)
+              for instrument in DataConfig.SUPPORTED_INSTRUMENTS
+              for granularity in GRANULARITIES]
+    frames = {key: make_candle_frame(ROWS_PER_SERIES, key[1], seed=i)
+              for i, key in enumerate(series)}
+
+    print("=" * 60)
+    print(f"{len(series)} SERIES x {ROWS_PER_SERIES:,} CANDLES "
+          f"({os.cpu_count()} CPUs)")
+    print("=" * 60)
+    print(f"{'workers':>8} {'wall (s)':>10} {'speedup':>9} "
+          f"{'efficiency':>11} {'storing (s)':>12}")
+
+    baseline = None
+    for workers in worker_counts():
+        with tempfile.TemporaryDirectory() as root:
+            results, elapsed = timed_run(
+                series=series, frames=frames, feature_store=FeatureStore(root),
+                max_workers=workers)
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        storing = sum(r['store_seconds'] for r in results)
+        print(f"{workers:>8} {elapsed:>10.2f} {speedup:>8.2f}x "
+              f"{speedup / workers:>10.0%} {storing:>12.2f}")
+
+    with tempfile.TemporaryDirectory() as root:
+        # Hand-over through memory-mapped cache files instead of
+        # SharedMemory copies
+        cache = BinaryCandleCache(os.path.join(root, 'cache'))
+        for (instrument, granularity), df in frames.items():
+            cache.append(instrument, granularity, df, durable=False)
+        _, mapped = timed_run(series=series, cache=cache, sink=discard)
+
+        store = FeatureStore(os.path.join(root, 'features'))
+        results, stored = timed_run(series=series, cache=cache,
+                                    feature_store=store)
+        cache.close()
+
+    print()
+    print(f"{'from binary cache':>24} {mapped:>10.2f} s (compute only)")
+    print(f"{'into FeatureStore':>24} {stored:>10.2f} s "
+          f"({sum(r['store_seconds'] for r in results):.2f} s storing, "
+          f"in the workers)")
+
+
+if __name__ == "__main__":
+    main()
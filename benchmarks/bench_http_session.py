@@ -0,0 +1,79 @@
+# benchmarks/bench_http_session.py
+"""
+Compare bare requests.get with OandaAPI's pooled session against the
+local mock server, fetching every DataConfig.SUPPORTED_INSTRUMENTS pair.
+
+Run from the repository root:
+    python -m benchmarks.bench_http_session
+"""
+
+import os
+import time
+
+import requests
+
+from benchmarks.mock_oanda import MockOandaServer
+from config import DataConfig
+from src.utils.parsers import parse_candles
+
+ROUNDS = 5
+COUNT = 100
+
+
+def fetch_bare(base_url):
+    for instrument in DataConfig.SUPPORTED_INSTRUMENTS:
+        url = f"{base_url}/v3/instruments/{instrument}/candles"
+        response = requests.get(url, params={'granularity': 'H1',
+                                             'count': COUNT})
+        parse_candles(response.json()['candles'])
+
+
+def fetch_pooled(api):
+    for instrument in DataConfig.SUPPORTED_INSTRUMENTS:
+        api.get_candles(instrument, granularity='H1', count=COUNT)
+
+
+def main():
+    os.environ.setdefault('OANDA_API_TOKEN', 'benchmark-token')
+    os.environ.setdefault('OANDA_ACCOUNT_ID', 'benchmark-account')
+
+    print("=" * 60)
+    print("HTTP SESSION BENCHMARK")
+    print("=" * 60)
+
+    with MockOandaServer() as server:
+        os.environ['OANDA_BASE_URL'] = server.url
+        from src.oanda_api import OandaAPI
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            fetch_bare(server.url)
+        bare = time.perf_counter() - start
+        bare_connections = server.connections_opened
+
+        api = OandaAPI()
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            fetch_pooled(api)
+        pooled = time.perf_counter() - start
+        pooled_connections = server.connections_opened - bare_connections
+
+        requests_made = ROUNDS * len(DataConfig.SUPPORTED_INSTRUMENTS)
+        print(f"Requests per mode: {requests_made}")
+        print(f"bare requests.get : {bare:.3f}s, "
+              f"{bare_connections} connections opened")
+        print(f"pooled session    : {pooled:.3f}s, "
+              f"{pooled_connections} connections opened")
+        print(f"\nRequest stats: {api.get_request_stats()}")
+
+    # Retries: the first two responses are 503 with Retry-After
+    with MockOandaServer(fail_first=2, retry_after=0.1) as server:
+        os.environ['OANDA_BASE_URL'] = server.url
+        api = OandaAPI()
+        df = api.get_candles('EUR_USD', granularity='H1', count=COUNT)
+        print(f"\nWith 2 injected 503s: {len(df)} candles, "
+              f"{api.total_retries} retries")
+
+
+if __name__ == "__main__":
+    main()
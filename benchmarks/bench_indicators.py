@@ -0,0 +1,253 @@
+# benchmarks/bench_indicators.py
+"""
+Benchmark the vectorized indicators against naive per-candle loops.
+
+The three bundled CSVs (eur_usd_1h, usd_jpy_4h, btc_usd_daily) are
+tiled end to end, each copy continuing from the previous one's last
+close and time, up to 10M rows. The loops are only timed up to
+LOOP_LIMIT rows; beyond that they would take minutes.
+
+Run from the repository root:
+    python -m benchmarks.bench_indicators
+"""
+
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import FeatureConfig, PathConfig
+from src.features import indicators
+from src.features.incremental import IndicatorState
+
+CSV_FILES = {
+    'eur_usd_1h.csv': 'H1',
+    'usd_jpy_4h.csv': 'H4',
+    'btc_usd_daily.csv': 'D',
+}
+SIZES = [100_000, 1_000_000, 10_000_000]
+LOOP_LIMIT = 1_000_000
+INCREMENTAL_CANDLES = 50_000
+
+
+def load_csv(name):
+    df = pd.read_csv(os.path.join(PathConfig.DATA_DIR, name))
+    df['time'] = pd.to_datetime(df['time'], utc=True)
+    return df
+
+
+def scale_up(df, size):
+    """Tile a candle frame to `size` rows with continuous prices/times."""
+    copies = -(-size // len(df))
+    step = df['time'].diff().median()
+    span = step * len(df)
+
+    prices = df[['open', 'high', 'low', 'close']].to_numpy()
+    # Rescale each copy so it opens where the previous one closed
+    drift = df['close'].iloc[-1] / df['open'].iloc[0]
+    factors = np.repeat(drift ** np.arange(copies), len(df))[:size]
+    tiled = np.tile(prices, (copies, 1))[:size] * factors[:, None]
+
+    times = df['time'].to_numpy(dtype='datetime64[ns]')
+    offsets = np.repeat(np.arange(copies), len(df))[:size] * \
+        span.to_timedelta64()
+    return pd.DataFrame({
+        'time': pd.to_datetime(np.tile(times, copies)[:size] + offsets,
+                               utc=True),
+        'open': tiled[:, 0],
+        'high': tiled[:, 1],
+        'low': tiled[:, 2],
+        'close': tiled[:, 3],
+        'volume': np.tile(df['volume'].to_numpy(), copies)[:size],
+    })
+
+
+# ----------------------------------------------------------------------
+# Naive references: one Python loop per indicator
+# ----------------------------------------------------------------------
+
+def loop_sma(close, n):
+    out = [math.nan] * len(close)
+    for i in range(n - 1, len(close)):
+        out[i] = sum(close[i - n + 1:i + 1]) / n
+    return out
+
+
+def loop_seeded(values, alpha, n):
+    out = [math.nan] * len(values)
+    seen, previous = [], math.nan
+    for i, x in enumerate(values):
+        if x != x:
+            out[i] = previous
+            continue
+        if len(seen) < n:
+            seen.append(x)
+            if len(seen) == n:
+                previous = sum(seen) / n
+        else:
+            previous = previous + alpha * (x - previous)
+        out[i] = previous
+    return out
+
+
+def loop_wma(close, n):
+    weights = range(1, n + 1)
+    total = n * (n + 1) / 2
+    out = [math.nan] * len(close)
+    for i in range(n - 1, len(close)):
+        out[i] = sum(w * x for w, x in zip(weights, close[i - n + 1:i + 1])) \
+            / total
+    return out
+
+
+def loop_rsi(close, n):
+    gains, losses = [math.nan], [math.nan]
+    for previous, current in zip(close, close[1:]):
+        delta = current - previous
+        gains.append(max(delta, 0.0))
+        losses.append(max(-delta, 0.0))
+    average_gain = loop_seeded(gains, 1 / n, n)
+    average_loss = loop_seeded(losses, 1 / n, n)
+    out = []
+    for gain, loss in zip(average_gain, average_loss):
+        if gain != gain:
+            out.append(math.nan)
+        elif loss == 0:
+            out.append(100.0)
+        else:
+            out.append(100 - 100 / (1 + gain / loss))
+    return out
+
+
+def loop_atr(high, low, close, n):
+    ranges = [high[0] - low[0]]
+    for i in range(1, len(close)):
+        ranges.append(max(high[i] - low[i], abs(high[i] - close[i - 1]),
+                          abs(low[i] - close[i - 1])))
+    return loop_seeded(ranges, 1 / n, n)
+
+
+def loop_bollinger(close, n, k):
+    upper = [math.nan] * len(close)
+    for i in range(n - 1, len(close)):
+        window = close[i - n + 1:i + 1]
+        mean = sum(window) / n
+        std = math.sqrt(sum((x - mean) ** 2 for x in window) / n)
+        upper[i] = mean + k * std
+    return upper
+
+
+def loop_macd(close, fast, slow, signal):
+    fast_line = loop_seeded(close, 2 / (fast + 1), fast)
+    slow_line = loop_seeded(close, 2 / (slow + 1), slow)
+    line = [f - s for f, s in zip(fast_line, slow_line)]
+    return loop_seeded(line, 2 / (signal + 1), signal)
+
+
+def loop_vwap(high, low, close, volume):
+    out, weighted, total = [], 0.0, 0.0
+    for h, lo, c, v in zip(high, low, close, volume):
+        weighted += (h + lo + c) / 3 * v
+        total += v
+        out.append(weighted / total if total else math.nan)
+    return out
+
+
+def loop_volatility(close, n):
+    returns = [math.nan] + [math.log(b / a) for a, b in zip(close, close[1:])]
+    out = [math.nan] * len(close)
+    for i in range(n, len(close)):
+        window = returns[i - n + 1:i + 1]
+        mean = sum(window) / n
+        out[i] = math.sqrt(sum((x - mean) ** 2 for x in window) / (n - 1))
+    return out
+
+
+def run_loops(df):
+    high, low = df['high'].tolist(), df['low'].tolist()
+    close, volume = df['close'].tolist(), df['volume'].tolist()
+    return {
+        'sma': loop_sma(close, FeatureConfig.SMA_WINDOW),
+        'ema': loop_seeded(close, 2 / (FeatureConfig.EMA_WINDOW + 1),
+                           FeatureConfig.EMA_WINDOW),
+        'wma': loop_wma(close, FeatureConfig.WMA_WINDOW),
+        'rsi': loop_rsi(close, FeatureConfig.RSI_WINDOW),
+        'atr': loop_atr(high, low, close, FeatureConfig.ATR_WINDOW),
+        'bb_upper': loop_bollinger(close, FeatureConfig.BOLLINGER_WINDOW,
+                                   FeatureConfig.BOLLINGER_STD),
+        'macd_signal': loop_macd(close, FeatureConfig.MACD_FAST,
+                                 FeatureConfig.MACD_SLOW,
+                                 FeatureConfig.MACD_SIGNAL),
+        'vwap': loop_vwap(high, low, close, volume),
+        'volatility': loop_volatility(close,
+                                      FeatureConfig.VOLATILITY_WINDOW),
+    }
+
+
+def run_vectorized(df):
+    close = df['close']
+    return {
+        'sma': indicators.sma(close),
+        'ema': indicators.ema(close),
+        'wma': indicators.wma(close),
+        'rsi': indicators.rsi(close),
+        'atr': indicators.atr(df['high'], df['low'], close),
+        'bb_upper': indicators.bollinger(close)[1],
+        'macd_signal': indicators.macd(close)[1],
+        'vwap': indicators.vwap(df, anchor=False),
+        'volatility': indicators.volatility(close),
+    }
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print(f"numba kernels: {'yes' if indicators.njit else 'no (pandas ewm)'}")
+
+    for name, granularity in CSV_FILES.items():
+        base = load_csv(name)
+
+        # Loops and vectorized code must agree before timing them
+        expected, _ = timed(run_loops, base)
+        actual, _ = timed(run_vectorized, base)
+        for key, values in expected.items():
+            np.testing.assert_allclose(actual[key], values, rtol=1e-7,
+                                       atol=1e-12, err_msg=key)
+
+        print()
+        print("=" * 60)
+        print(f"{name} ({granularity}, {len(base)} rows tiled)")
+        print("=" * 60)
+        print(f"{'rows':>12} {'loops (s)':>11} {'vectorized (s)':>15} "
+              f"{'speedup':>9}")
+
+        for size in SIZES:
+            df = scale_up(base, size)
+            _, vectorized = timed(run_vectorized, df)
+            if size <= LOOP_LIMIT:
+                _, loops = timed(run_loops, df)
+                print(f"{size:>12,} {loops:>11.2f} {vectorized:>15.3f} "
+                      f"{loops / vectorized:>8.0f}x")
+            else:
+                print(f"{size:>12,} {'-':>11} {vectorized:>15.3f} "
+                      f"{'-':>9}")
+
+    print()
+    print("=" * 60)
+    print("INCREMENTAL UPDATE (all indicators, eur_usd_1h)")
+    print("=" * 60)
+    candles = scale_up(load_csv('eur_usd_1h.csv'), INCREMENTAL_CANDLES) \
+        .to_dict('records')
+    state = IndicatorState()
+    _, elapsed = timed(lambda: [state.update(c) for c in candles])
+    print(f"{elapsed / len(candles) * 1e6:.1f} us per candle")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_loader.py
+"""
+Compare the COPY + ON CONFLICT loader with row-by-row executemany
+upserts into raw_market_data.
+
+Needs DATABASE_URL pointing at a PostgreSQL database created from
+database/schema.sql. Every run is rolled back, so no rows are kept.
+
+Run from the repository root:
+    python -m benchmarks.bench_loader [max_rows]
+"""
+
+import sys
+import time
+
+from benchmarks.synthetic import make_candle_frame
+from src.db.connection import get_connection, is_sqlite
+from src.db.loader import copy_candles, upsert_candles
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def timed_load(conn, loader, df):
+    start = time.perf_counter()
+    loader(conn, df, 'BENCH_USD', 'M1')
+    elapsed = time.perf_counter() - start
+    conn.rollback()
+    return elapsed
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else max(SIZES)
+
+    conn = get_connection()
+    if is_sqlite(conn):
+        print("❌ COPY needs PostgreSQL; point DATABASE_URL at Postgres")
+        return
+
+    print("=" * 60)
+    print("RAW_MARKET_DATA LOADER BENCHMARK")
+    print("=" * 60)
+    print(f"{'rows':>10} {'executemany (s)':>16} {'COPY (s)':>10} "
+          f"{'speedup':>9} {'COPY rows/s':>12}")
+
+    try:
+        for size in [s for s in SIZES if s <= max_rows]:
+            df = make_candle_frame(size)
+            executemany = timed_load(conn, upsert_candles, df)
+            copy = timed_load(conn, copy_candles, df)
+            print(f"{size:>10,} {executemany:>16.2f} {copy:>10.2f} "
+                  f"{executemany / copy:>8.1f}x {size / copy:>12,.0f}")
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
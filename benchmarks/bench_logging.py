@@ -0,0 +1,114 @@
+# benchmarks/bench_logging.py
+"""
+Cost of logging on the caller's thread.
+
+First, the time per logger.info call with lazy arguments: logging
+below the level, the previous synchronous FileHandler, and the queued
+writer with text and JSON-lines output. Then the get_candles loop
+against a zero-latency mock server with logging on and off, where the
+difference is the overhead a fetch actually pays.
+
+Log files go to a temporary directory; the console is left quiet.
+
+Run from the repository root:
+    python -m benchmarks.bench_logging
+"""
+
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.mock_oanda import MockOandaServer
+from config import LogConfig
+from src.utils.logger import configure_logging, shutdown_logging
+
+CALLS = 200_000
+FETCHES = 500
+COUNT = 500
+
+
+def time_calls(logger):
+    start = time.perf_counter()
+    for i in range(CALLS):
+        logger.info("Fetched %d candles for %s (%s)", i, 'EUR_USD', 'H1',
+                    extra={'rows': i})
+    elapsed = time.perf_counter() - start
+    # Until the writer has caught up
+    shutdown_logging()
+    drained = time.perf_counter() - start
+    return elapsed, drained
+
+
+def synchronous(path):
+    # What setup_logger did before: a blocking FileHandler on the root
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter(LogConfig.LOG_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    return handler
+
+
+def fetch_loop(api):
+    start = time.perf_counter()
+    for _ in range(FETCHES):
+        api.get_candles('EUR_USD', granularity='M5', count=COUNT)
+    return FETCHES / (time.perf_counter() - start)
+
+
+def main():
+    os.environ.setdefault('OANDA_API_TOKEN', 'benchmark-token')
+    os.environ.setdefault('OANDA_ACCOUNT_ID', 'benchmark-account')
+
+    with tempfile.TemporaryDirectory() as root:
+        LogConfig.LOG_FILE = os.path.join(root, 'bench.log')
+        LogConfig.LOG_TO_CONSOLE = False
+        logger = logging.getLogger('Bench')
+
+        print("=" * 60)
+        print(f"LOGGING COST ({CALLS:,} logger.info calls)")
+        print("=" * 60)
+        print(f"{'mode':>14} {'ns/call':>9} {'drained (s)':>12}")
+
+        runs = [
+            ('below level', lambda: configure_logging(level='WARNING')),
+            ('synchronous', lambda: synchronous(
+                os.path.join(root, 'sync.log'))),
+            ('queued text', lambda: configure_logging(json_lines=False)),
+            ('queued json', lambda: configure_logging(json_lines=True)),
+        ]
+        for name, setup in runs:
+            handler = setup()
+            elapsed, drained = time_calls(logger)
+            if handler is not None:
+                logging.getLogger().removeHandler(handler)
+                handler.close()
+            print(f"{name:>14} {elapsed / CALLS * 1e9:>9.0f} {drained:>12.2f}")
+
+        with MockOandaServer() as server:
+            os.environ['OANDA_BASE_URL'] = server.url
+            from src.oanda_api import OandaAPI
+
+            configure_logging()
+            api = OandaAPI()
+            fetch_loop(api)  # warm the connection pool
+
+            configure_logging(level='WARNING')
+            off = fetch_loop(api)
+            configure_logging()
+            on = fetch_loop(api)
+            shutdown_logging()
+
+        print()
+        print(f"get_candles x {FETCHES} ({COUNT} candles each)")
+        print(f"  logging off: {off:,.0f} calls/s")
+        print(f"  logging on : {on:,.0f} calls/s "
+              f"({(off / on - 1) * 100:+.1f}% time per call)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_metrics.py
+"""
+Per-call overhead of the metrics helpers, enabled and disabled, against
+an uninstrumented call of the same empty function.
+
+Run from the repository root:
+    python -m benchmarks.bench_metrics
+"""
+
+import time
+
+from src.utils import metrics
+
+CALLS = 1_000_000
+
+
+def work():
+    return None
+
+
+@metrics.timed('bench_timed_seconds')
+def timed_work():
+    return None
+
+
+def loop_plain():
+    for _ in range(CALLS):
+        work()
+
+
+def loop_timed():
+    for _ in range(CALLS):
+        timed_work()
+
+
+def loop_timer():
+    for _ in range(CALLS):
+        with metrics.timer('bench_timer_seconds', stage='bench'):
+            work()
+
+
+def loop_count():
+    for _ in range(CALLS):
+        metrics.count('bench_total', stage='bench')
+        work()
+
+
+def measure(loop):
+    start = time.perf_counter()
+    loop()
+    return (time.perf_counter() - start) / CALLS * 1e9
+
+
+def main():
+    baseline = measure(loop_plain)
+
+    print("=" * 60)
+    print(f"METRICS OVERHEAD ({CALLS:,} calls, ns added per call)")
+    print("=" * 60)
+    print(f"plain call: {baseline:.0f} ns")
+    print(f"{'helper':>10} {'disabled':>10} {'enabled':>10}")
+    for name, loop in (('timed', loop_timed), ('timer', loop_timer),
+                       ('count', loop_count)):
+        metrics.disable()
+        off = measure(loop) - baseline
+        metrics.enable()
+        on = measure(loop) - baseline
+        print(f"{name:>10} {off:>10.0f} {on:>10.0f}")
+
+    print()
+    print(metrics.REGISTRY.to_prometheus())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_outliers.py
+"""
+Benchmark rolling outlier detection.
+
+Compares, per incoming candle:
+  * recompute  - check_outliers over the full history (the old approach)
+  * incremental - RollingOutlierDetector.update
+and the vectorized rolling_outliers backfill against feeding the
+incremental detector candle by candle.
+
+Run from the repository root:
+    python -m benchmarks.bench_outliers
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_candle_frame
+from src.utils.outliers import RollingOutlierDetector, rolling_outliers
+from src.utils.validators import check_outliers
+
+HISTORY = 100_000  # Candles already stored when new ones arrive
+ARRIVALS = 2_000  # Candles scored one at a time
+WINDOWS = [50, 100, 500]
+BACKFILL_SIZES = [100_000, 1_000_000]
+
+
+def per_candle_recompute(df, arrivals):
+    timings = []
+    for i in range(arrivals):
+        frame = df.iloc[:HISTORY + i + 1]
+        start = time.perf_counter()
+        check_outliers(frame, 'close')
+        timings.append(time.perf_counter() - start)
+    return np.array(timings)
+
+
+def per_candle_incremental(close, window, arrivals):
+    detector = RollingOutlierDetector(window=window)
+    detector.warm_up(close[:HISTORY])
+    timings = np.empty(arrivals)
+    for i, value in enumerate(close[HISTORY:HISTORY + arrivals]):
+        start = time.perf_counter()
+        detector.update(value)
+        timings[i] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    df = make_candle_frame(HISTORY + ARRIVALS, 'M1')
+    close = df['close'].to_numpy()
+
+    print("=" * 60)
+    print("PER-CANDLE OUTLIER SCORING")
+    print("=" * 60)
+    print(f"{'method':>22} {'mean (us)':>11} {'p99 (us)':>10}")
+
+    recompute = per_candle_recompute(df, ARRIVALS // 10)
+    print(f"{'check_outliers':>22} {recompute.mean() * 1e6:>11.1f} "
+          f"{np.percentile(recompute, 99) * 1e6:>10.1f}")
+    for window in WINDOWS:
+        timings = per_candle_incremental(close, window, ARRIVALS)
+        print(f"{f'incremental w={window}':>22} "
+              f"{timings.mean() * 1e6:>11.1f} "
+              f"{np.percentile(timings, 99) * 1e6:>10.1f}")
+
+    print()
+    print("=" * 60)
+    print("BACKFILL (window=100)")
+    print("=" * 60)
+    print(f"{'candles':>10} {'incremental (s)':>16} {'vectorized (s)':>15} "
+          f"{'speedup':>9}")
+
+    for size in BACKFILL_SIZES:
+        close = make_candle_frame(size, 'M1', seed=size)['close']
+
+        start = time.perf_counter()
+        detector = RollingOutlierDetector(window=100)
+        scores = pd.DataFrame([detector.update(value) for value in close])
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = rolling_outliers(close, window=100)
+        vectorized = time.perf_counter() - start
+
+        # Both modes must flag the same candles
+        assert (scores['is_outlier'].to_numpy() ==
+                batch['is_outlier'].to_numpy()).all()
+        print(f"{size:>10,} {incremental:>16.3f} {vectorized:>15.3f} "
+              f"{incremental / vectorized:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
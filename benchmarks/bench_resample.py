@@ -0,0 +1,97 @@
+# benchmarks/bench_resample.py
+"""
+Benchmark deriving higher granularities from M1 candles.
+
+Compares resample_candles against a pandas groupby/agg over the same
+buckets, and the incremental CandleResampler against re-resampling the
+whole history whenever a new M1 candle arrives.
+
+Run from the repository root:
+    python -m benchmarks.bench_resample
+"""
+
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_candle_frame
+from src.utils.resampler import (CandleResampler, _bucket_keys,
+                                 resample_candles)
+
+SIZES = [100_000, 1_000_000, 5_000_000]
+TARGETS = ['M5', 'H1', 'H4', 'D', 'W', 'M']
+HISTORY = 500_000  # M1 candles already resampled when new ones arrive
+ARRIVALS = 1_000
+REPEATS = 3
+
+
+def resample_groupby(df, granularity):
+    """pandas reference: group on the same bucket keys and aggregate."""
+    keys = _bucket_keys(df['time'], granularity)
+    return df.groupby(keys, sort=False).agg(
+        open=('open', 'first'), high=('high', 'max'), low=('low', 'min'),
+        close=('close', 'last'), volume=('volume', 'sum'))
+
+
+def best_of(func, *args):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    print("=" * 60)
+    print("RESAMPLE M1 -> ALL TARGETS")
+    print("=" * 60)
+    print(f"{'M1 candles':>12} {'groupby (s)':>12} {'reduceat (s)':>13} "
+          f"{'speedup':>9}")
+
+    for size in SIZES:
+        df = make_candle_frame(size, 'M1')
+        for granularity in TARGETS:
+            expected = resample_groupby(df, granularity)
+            result = resample_candles(df, granularity)
+            assert (expected['close'].to_numpy() ==
+                    result['close'].to_numpy()).all()
+
+        groupby = sum(best_of(resample_groupby, df, granularity)
+                      for granularity in TARGETS)
+        reduceat = sum(best_of(resample_candles, df, granularity)
+                       for granularity in TARGETS)
+        print(f"{size:>12,} {groupby:>12.3f} {reduceat:>13.3f} "
+              f"{groupby / reduceat:>8.1f}x")
+
+    print()
+    print("=" * 60)
+    print(f"ONE NEW M1 CANDLE ({HISTORY:,} in history), H1 target")
+    print("=" * 60)
+
+    df = make_candle_frame(HISTORY + ARRIVALS, 'M1')
+    resampler = CandleResampler('H1', 'M1')
+    resampler.update(df.iloc[:HISTORY])
+
+    start = time.perf_counter()
+    for i in range(HISTORY, HISTORY + ARRIVALS):
+        resampler.update(df.iloc[i:i + 1])
+    incremental = (time.perf_counter() - start) / ARRIVALS
+
+    start = time.perf_counter()
+    for i in range(HISTORY, HISTORY + 20):
+        resample_candles(df.iloc[:i + 1], 'H1')
+    full = (time.perf_counter() - start) / 20
+
+    print(f"{'full resample':>20} {full * 1e3:>10.3f} ms")
+    print(f"{'incremental':>20} {incremental * 1e3:>10.3f} ms "
+          f"({full / incremental:.0f}x)")
+
+    pd.testing.assert_frame_equal(
+        resample_candles(df, 'H1').tail(1).reset_index(drop=True),
+        pd.DataFrame([resampler.current]).astype(
+            {'volume': 'int64'}), check_dtype=False)
+
+
+if __name__ == "__main__":
+    main()
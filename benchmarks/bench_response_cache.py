@@ -0,0 +1,76 @@
+# benchmarks/bench_response_cache.py
+"""
+Repeated get_candles sweeps with and without a ResponseCache, against a
+mock server that injects per-request latency.
+
+The same instruments x timeframes ranges are fetched three times: a
+cold pass that fills the cache, a warm pass served from disk, and an
+offline pass that never touches the server. Requests reaching the
+server are counted on its side.
+
+Run from the repository root:
+    python -m benchmarks.bench_response_cache
+"""
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.mock_oanda import MockOandaServer
+from benchmarks.synthetic import GRANULARITY_NS
+from config import DataConfig
+
+LATENCY = 0.05  # seconds injected per request
+COUNT = 500
+START = pd.Timestamp('2024-01-02T00:00:00Z')
+
+
+def sweep(api, jobs):
+    start = time.perf_counter()
+    rows = 0
+    for instrument, tf in jobs:
+        df = api.get_candles(instrument, granularity=tf, count=COUNT,
+                             start=START)
+        rows += 0 if df is None else len(df)
+    return time.perf_counter() - start, rows
+
+
+def main():
+    os.environ.setdefault('OANDA_API_TOKEN', 'benchmark-token')
+    os.environ.setdefault('OANDA_ACCOUNT_ID', 'benchmark-account')
+
+    timeframes = [tf for tf in DataConfig.SUPPORTED_TIMEFRAMES
+                  if tf in GRANULARITY_NS]
+    jobs = [(instrument, tf)
+            for instrument in DataConfig.SUPPORTED_INSTRUMENTS
+            for tf in timeframes]
+
+    print("=" * 60)
+    print("RESPONSE CACHE BENCHMARK")
+    print("=" * 60)
+    print(f"{len(jobs)} requests per pass, "
+          f"{LATENCY * 1000:.0f}ms injected latency each")
+    print(f"{'pass':>10} {'seconds':>9} {'rows':>9} {'server hits':>12}")
+
+    with MockOandaServer(latency=LATENCY) as server, \
+            tempfile.TemporaryDirectory() as root:
+        os.environ['OANDA_BASE_URL'] = server.url
+        from src.oanda_api import OandaAPI
+        from src.storage.response_cache import ResponseCache
+
+        cache = ResponseCache(root=root, ttl=3600)
+        api = OandaAPI(cache=cache)
+        for name in ('cold', 'warm', 'offline'):
+            cache.offline = name == 'offline'
+            served = server.requests_served
+            elapsed, rows = sweep(api, jobs)
+            print(f"{name:>10} {elapsed:>9.3f} {rows:>9,} "
+                  f"{server.requests_served - served:>12}")
+
+        print(f"stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# benchmarks/bench_schema.py
+"""
+Compare the heap layout in schema.sql with the partitioned layout in
+schema_partitioned.sql: bulk insert rate, on-disk size and range-query
+latency.
+
+Each layout is built in its own scratch schema (bench_heap,
+bench_partitioned) in the DATABASE_URL database; both are dropped at
+the end.
+
+Run from the repository root:
+    python -m benchmarks.bench_schema [rows_per_instrument]
+"""
+
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_candle_frame
+from src.db.connection import get_connection
+from src.db.loader import copy_candles
+
+INSTRUMENTS = ['EUR_USD', 'GBP_USD', 'USD_JPY']
+ROWS_PER_INSTRUMENT = 500_000
+START = '2023-01-01T00:00:00Z'
+QUERIES = 50
+
+
+def read_sql(name):
+    with open(os.path.join('database', name)) as f:
+        return f.read()
+
+
+def build_layout(conn, schema, partitioned):
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {schema}")
+    cursor.execute(f"SET search_path TO {schema}")
+    cursor.execute(read_sql('schema.sql'))
+    if partitioned:
+        cursor.execute("DROP TABLE raw_market_data CASCADE")
+        cursor.execute(read_sql('schema_partitioned.sql'))
+    conn.commit()
+    cursor.close()
+
+
+def load(conn, frames, partitioned):
+    cursor = conn.cursor()
+    if partitioned:
+        first = min(df['time'].iloc[0] for df in frames.values())
+        last = max(df['time'].iloc[-1] for df in frames.values())
+        cursor.execute("SELECT ensure_market_data_partitions(%s, %s)",
+                       (first.date(), (last + pd.DateOffset(months=1)).date()))
+        conn.commit()
+
+    start = time.perf_counter()
+    for instrument, df in frames.items():
+        copy_candles(conn, df, instrument, 'M1')
+        conn.commit()
+    elapsed = time.perf_counter() - start
+
+    conn.autocommit = True
+    cursor.execute("VACUUM ANALYZE raw_market_data")
+    conn.autocommit = False
+    cursor.close()
+    return elapsed
+
+
+def on_disk_size(conn):
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT COALESCE(SUM(pg_total_relation_size(relid)),
+                        pg_total_relation_size('raw_market_data'))
+        FROM pg_partition_tree('raw_market_data')
+    """)
+    size = cursor.fetchone()[0]
+    cursor.close()
+    return size
+
+
+def query_latency(conn, frames, window):
+    cursor = conn.cursor()
+    rng = random.Random(0)
+    timings = []
+    for _ in range(QUERIES):
+        instrument = rng.choice(list(frames))
+        times = frames[instrument]['time']
+        start = times.iloc[rng.randrange(len(times))]
+        began = time.perf_counter()
+        cursor.execute("""
+            SELECT time, open, high, low, close, volume
+            FROM raw_market_data
+            WHERE instrument = %s AND granularity = 'M1'
+              AND time >= %s AND time < %s
+        """, (instrument, start.to_pydatetime(),
+              (start + window).to_pydatetime()))
+        cursor.fetchall()
+        timings.append(time.perf_counter() - began)
+    cursor.close()
+    return pd.Series(timings).median()
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS_PER_INSTRUMENT
+    frames = {instrument: make_candle_frame(rows, 'M1', start=START, seed=i)
+              for i, instrument in enumerate(INSTRUMENTS)}
+    total = rows * len(INSTRUMENTS)
+
+    print("=" * 70)
+    print("RAW_MARKET_DATA LAYOUT BENCHMARK")
+    print("=" * 70)
+    print(f"{total:,} M1 rows across {len(INSTRUMENTS)} instruments\n")
+    print(f"{'layout':<12} {'insert rows/s':>14} {'size (MB)':>10} "
+          f"{'1-day query (ms)':>17} {'1-week query (ms)':>18}")
+
+    conn = get_connection()
+    try:
+        for schema, partitioned in [('bench_heap', False),
+                                    ('bench_partitioned', True)]:
+            build_layout(conn, schema, partitioned)
+            elapsed = load(conn, frames, partitioned)
+            size = on_disk_size(conn)
+            day = query_latency(conn, frames, pd.Timedelta(days=1))
+            week = query_latency(conn, frames, pd.Timedelta(days=7))
+            label = 'partitioned' if partitioned else 'heap'
+            print(f"{label:<12} {total / elapsed:>14,.0f} "
+                  f"{size / 1024 ** 2:>10.1f} {day * 1000:>17.2f} "
+                  f"{week * 1000:>18.2f}")
+    finally:
+        conn.rollback()
+        cursor = conn.cursor()
+        for schema in ('bench_heap', 'bench_partitioned'):
+            cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
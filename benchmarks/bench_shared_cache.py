@@ -0,0 +1,150 @@
+# benchmarks/bench_shared_cache.py
+"""
+Latest-window reads from the SharedCandleCache against the same query on
+the database.
+
+A temporary SQLite database holds one M1 series. The cache is filled
+from it on the first read (the miss), then reader processes attach to
+the block by name and time latest() while the parent keeps appending
+candles through update(), as the ingest pipeline would.
+
+Run from the repository root:
+    python -m benchmarks.bench_shared_cache
+"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_ohlcv
+from src.db.connection import SQLITE_PREFIX, create_sqlite_schema
+from src.db.loader import load_candles
+from src.db.pool import ConnectionPool
+from src.db.reader import read_latest
+from src.storage.shared_cache import SharedCandleCache
+from src.utils.logger import configure_logging
+
+INSTRUMENT = 'BENCH_USD'
+ROWS = 100_000
+WINDOW = 500
+READS = 100_000
+READERS = 4
+
+
+def percentiles(seconds):
+    us = np.asarray(seconds) * 1e6
+    return np.percentile(us, 50), np.percentile(us, 99), us.max()
+
+
+def reader(prefix, ready, results):
+    cache = SharedCandleCache(prefix=prefix)
+    times = np.empty(READS)
+    ready.wait()
+    for i in range(READS):
+        start = time.perf_counter()
+        window = cache.latest(INSTRUMENT, 'M1', WINDOW)
+        window['close'][-1]
+        times[i] = time.perf_counter() - start
+    del window
+    results.put((percentiles(times), cache.stats()['retries']))
+    cache.close()
+
+
+def writer(cache, last, stop, written):
+    # One new candle at a time, like a live feed
+    df = make_ohlcv(1, 'M1')
+    while not stop.is_set():
+        last += pd.Timedelta(minutes=1)
+        df['time'] = last
+        cache.update(df, INSTRUMENT, 'M1')
+        written[0] += 1
+
+
+def main():
+    configure_logging(level='WARNING')
+    tmp = tempfile.TemporaryDirectory()
+    pool = ConnectionPool(f"{SQLITE_PREFIX}{os.path.join(tmp.name, 'b.db')}")
+    history = make_ohlcv(ROWS, 'M1')
+    with pool.connection() as conn:
+        create_sqlite_schema(conn)
+        load_candles(conn, history, INSTRUMENT, 'M1')
+
+    print("=" * 60)
+    print(f"SHARED CANDLE CACHE ({WINDOW}-candle window of {ROWS:,})")
+    print("=" * 60)
+
+    times = []
+    with pool.connection() as conn:
+        for _ in range(200):
+            start = time.perf_counter()
+            read_latest(conn, INSTRUMENT, 'M1', WINDOW)
+            times.append(time.perf_counter() - start)
+    p50, p99, _ = percentiles(times)
+    print(f"{'database read_latest':>28}: p50 {p50:>9.1f} us  "
+          f"p99 {p99:>9.1f} us")
+
+    prefix = f"bench{os.getpid()}"
+    cache = SharedCandleCache(db=pool, prefix=prefix)
+    try:
+        start = time.perf_counter()
+        cache.latest(INSTRUMENT, 'M1', WINDOW)
+        print(f"{'miss (fill from database)':>28}: "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+        for label, read in (
+                ('latest (view)', lambda: cache.latest(
+                    INSTRUMENT, 'M1', WINDOW)),
+                ('latest (copy)', lambda: cache.latest(
+                    INSTRUMENT, 'M1', WINDOW, copy=True)),
+                ('latest_frame', lambda: cache.latest_frame(
+                    INSTRUMENT, 'M1', WINDOW))):
+            times = []
+            for _ in range(10_000):
+                start = time.perf_counter()
+                read()
+                times.append(time.perf_counter() - start)
+            p50, p99, _ = percentiles(times)
+            print(f"{label:>28}: p50 {p50:>9.1f} us  p99 {p99:>9.1f} us")
+
+        # Reader processes while the parent appends
+        context = multiprocessing.get_context('spawn')
+        ready = context.Event()
+        results = context.Queue()
+        readers = [context.Process(target=reader,
+                                   args=(prefix, ready, results))
+                   for _ in range(READERS)]
+        for process in readers:
+            process.start()
+
+        stop = threading.Event()
+        written = [0]
+        thread = threading.Thread(target=writer, args=(
+            cache, history['time'].iat[-1], stop, written))
+        thread.start()
+        ready.set()
+        stats = [results.get() for _ in readers]
+        stop.set()
+        thread.join()
+        for process in readers:
+            process.join()
+
+        print(f"\n{READERS} reader processes x {READS:,} reads, "
+              f"{written[0]:,} candles appended meanwhile")
+        for i, ((p50, p99, worst), retries) in enumerate(stats):
+            print(f"{f'reader {i}':>28}: p50 {p50:>9.1f} us  "
+                  f"p99 {p99:>9.1f} us  max {worst:>9.1f} us  "
+                  f"retries {retries}")
+    finally:
+        cache.close()
+        cache.unlink(INSTRUMENT, 'M1')
+        pool.closeall()
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_stream.py
+"""
+Throughput and end-to-end latency of PriceStream against the local
+replay server.
+
+Three runs over EUR_USD, USD_JPY and BTC_USD:
+    * unpaced: the server writes as fast as the client reads
+    * paced: the year of replayed data in about ten seconds, to measure
+      latency at a steady message rate
+    * disconnects: the server drops the connection every 2,000 prices
+      and the client must reconnect without losing any
+
+Latency is the consumer's receive time minus the server's write time
+(both wall clock, same machine).
+
+Run from the repository root:
+    python -m benchmarks.bench_stream
+"""
+
+import asyncio
+import os
+import time
+
+import numpy as np
+
+from benchmarks.replay_oanda import ReplayPricingServer
+
+INSTRUMENTS = ['EUR_USD', 'USD_JPY', 'BTC_USD']
+PACED_SPEEDUP = 3_000_000  # btc_usd_daily.csv spans a year
+
+
+async def consume(api, expected, **kwargs):
+    latencies = np.empty(expected, dtype=np.int64)
+    async with api.price_stream(INSTRUMENTS, **kwargs) as stream:
+        start = time.perf_counter()
+        count = 0
+        async for tick in stream:
+            latencies[count] = time.time_ns() - tick.time
+            count += 1
+            if count == expected:
+                break
+        elapsed = time.perf_counter() - start
+        stats = stream.stats()
+    return elapsed, latencies / 1e6, stats
+
+
+def run(name, server, api, **kwargs):
+    with server:
+        api.stream_url = server.url
+        expected = server.total_ticks(INSTRUMENTS)
+        elapsed, latencies, stats = asyncio.run(
+            consume(api, expected, **kwargs))
+
+    print(f"{name:>12} {expected:>9,} {expected / elapsed:>12,.0f} "
+          f"{np.percentile(latencies, 50):>9.3f} "
+          f"{np.percentile(latencies, 99):>9.3f} "
+          f"{stats['reconnects']:>10}")
+
+
+def main():
+    os.environ.setdefault('OANDA_API_TOKEN', 'benchmark-token')
+    os.environ.setdefault('OANDA_ACCOUNT_ID', 'benchmark-account')
+    os.environ.setdefault('OANDA_BASE_URL', 'http://127.0.0.1')
+    from src.oanda_api import OandaAPI
+
+    api = OandaAPI()
+
+    print("=" * 60)
+    print("PRICING STREAM REPLAY")
+    print("=" * 60)
+    print(f"{'run':>12} {'ticks':>9} {'ticks/s':>12} {'p50 (ms)':>9} "
+          f"{'p99 (ms)':>9} {'reconnects':>10}")
+
+    run('unpaced', ReplayPricingServer(loops=20), api)
+    run('paced', ReplayPricingServer(speedup=PACED_SPEEDUP), api)
+    run('disconnects', ReplayPricingServer(loops=2, disconnect_after=2000,
+                                           max_chunk=1000), api)
+
+
+if __name__ == "__main__":
+    main()
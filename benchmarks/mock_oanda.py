@@ -0,0 +1,176 @@
+# benchmarks/mock_oanda.py
+"""
+Local stand-in for the OANDA v3 REST API.
+
+Serves /v3/instruments/{instrument}/candles with synthetic candles over
+HTTP/1.1 keep-alive, with optional injected latency and error responses,
+so OandaAPI can be exercised and benchmarked without network access.
+Payload size follows the request (count, from/to, and OANDA's `price`
+components, e.g. price=MBA) up to `max_candles` per response.
+
+Usage:
+    with MockOandaServer(latency=0.05) as server:
+        os.environ['OANDA_BASE_URL'] = server.url
+        ...
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from benchmarks.synthetic import GRANULARITY_NS, make_candle_payload
+
+MAX_CANDLES = 5000
+COMPONENTS = {'M': 'mid', 'B': 'bid', 'A': 'ask'}
+CANDLES_PATH = re.compile(r'^/v3/instruments/([A-Z0-9_]+)/candles$')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # client's delayed ACK adds ~40ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.mock.record_connection()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        mock = self.server.mock
+        mock.record_request()
+
+        if mock.latency:
+            time.sleep(mock.latency)
+
+        parsed = urlparse(self.path)
+        match = CANDLES_PATH.match(parsed.path)
+        if not match:
+            self._send_json(404, {'errorMessage': 'Not found'})
+            return
+
+        if mock.should_fail():
+            headers = {}
+            if mock.retry_after is not None:
+                headers['Retry-After'] = str(mock.retry_after)
+            self._send_json(mock.error_status,
+                            {'errorMessage': 'Injected failure'}, headers)
+            return
+
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        granularity = params.get('granularity', 'S5')
+        if granularity not in GRANULARITY_NS:
+            self._send_json(400, {'errorMessage': 'Invalid granularity'})
+            return
+
+        candles = mock.build_candles(granularity, params)
+        self._send_json(200, {
+            'instrument': match.group(1),
+            'granularity': granularity,
+            'candles': candles,
+        })
+
+
+class MockOandaServer:
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0,
+                 error_rate=0.0, error_status=503, retry_after=None,
+                 fail_first=0, seed=0, max_candles=MAX_CANDLES):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.fail_first = fail_first
+        self.max_candles = max_candles
+
+        self.requests_served = 0
+        self.connections_opened = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_request(self):
+        with self._lock:
+            self.requests_served += 1
+
+    def should_fail(self):
+        with self._lock:
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                return True
+            return self._random.random() < self.error_rate
+
+    def build_candles(self, granularity, params):
+        step = GRANULARITY_NS[granularity]
+
+        if 'from' in params:
+            start = pd.Timestamp(params['from']).value
+            start += -start % step
+            if 'to' in params:
+                # OANDA's `to` is inclusive of a candle opening on it
+                end = pd.Timestamp(params['to']).value
+                count = max(0, (end - start) // step + 1)
+            else:
+                count = int(params.get('count', 500))
+        else:
+            count = int(params.get('count', 500))
+            end = pd.Timestamp(params['to']).value if 'to' in params \
+                else time.time_ns()
+            start = (end // step - count) * step
+
+        count = min(count, self.max_candles)
+        if count == 0:
+            return []
+        components = tuple(COMPONENTS[c] for c in params.get('price', 'M')
+                           if c in COMPONENTS) or ('mid',)
+        return make_candle_payload(count, granularity,
+                                   start=pd.Timestamp(start, tz='UTC'),
+                                   components=components,
+                                   seed=start // step)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -0,0 +1,278 @@
+# benchmarks/replay_oanda.py
+"""
+Local stand-in for OANDA's pricing stream that replays the bundled CSVs.
+
+Serves /v3/accounts/{account_id}/pricing/stream as a chunked
+newline-delimited JSON body. Each candle becomes four ticks (open, then
+low and high in the order the candle most likely traded them, then
+close) spread over its period, and the instruments requested are merged
+in time order. Bid and ask sit half_spread_bps either side of the
+price.
+
+speedup=3600 plays an hour of market time per second; speedup=None
+sends as fast as the client reads. With restamp=True (the default) each
+message carries the wall-clock time it was written, so the client can
+measure end-to-end latency as received - time. disconnect_after drops
+the connection after that many prices to exercise reconnects; the next
+connection resumes where the last one stopped.
+
+Usage:
+    with ReplayPricingServer(speedup=3600) as server:
+        os.environ['OANDA_STREAM_URL'] = server.url
+        ...
+"""
+
+import asyncio
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from config import PathConfig
+
+REPLAY_FILES = {
+    'EUR_USD': 'eur_usd_1h.csv',
+    'USD_JPY': 'usd_jpy_4h.csv',
+    'BTC_USD': 'btc_usd_daily.csv',
+}
+STREAM_PATH = re.compile(r'^/v3/accounts/([^/]+)/pricing/stream$')
+
+# Position of each tick within its candle, as a fraction of the period
+TICK_OFFSETS = np.array([0.0, 0.25, 0.5, 0.75])
+
+
+def _format_time(ns):
+    return f"{np.datetime_as_string(np.datetime64(int(ns), 'ns'))}Z"
+
+
+def build_ticks(instrument, path=None):
+    """
+    Tick times (int ns) and prices for one instrument's CSV, four per
+    candle: open, low/high (low first on up candles), close.
+    """
+    df = pd.read_csv(path or os.path.join(PathConfig.DATA_DIR,
+                                          REPLAY_FILES[instrument]))
+    times = pd.to_datetime(df['time'], utc=True) \
+        .dt.as_unit('ns').astype('int64').to_numpy()
+    period = int(np.median(np.diff(times))) if len(times) > 1 else 0
+
+    up = (df['close'] >= df['open']).to_numpy()
+    first = np.where(up, df['low'], df['high'])
+    second = np.where(up, df['high'], df['low'])
+    prices = np.column_stack((df['open'], first, second, df['close']))
+    tick_times = times[:, None] + (TICK_OFFSETS * period).astype(np.int64)
+    return tick_times.ravel(), prices.ravel()
+
+
+class ReplayPricingServer:
+
+    def __init__(self, host='127.0.0.1', port=0, speedup=None, restamp=True,
+                 half_spread_bps=0.5, heartbeat_interval=5.0, loops=1,
+                 disconnect_after=None, max_chunk=None):
+        self.host = host
+        self.port = port
+        self.speedup = speedup
+        self.restamp = restamp
+        self.half_spread = half_spread_bps * 1e-4
+        self.heartbeat_interval = heartbeat_interval
+        self.loops = loops
+        self.disconnect_after = disconnect_after
+        # Split the body into chunks of at most this many bytes, cutting
+        # through messages, to exercise incremental parsing
+        self.max_chunk = max_chunk
+
+        self.connections = 0
+        self.prices_sent = 0
+        self._cursors = {}
+        self._schedules = {}
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def schedule(self, instruments):
+        """Merged (times, instrument index, prices) for a subscription."""
+        key = tuple(instruments)
+        if key not in self._schedules:
+            parts = [build_ticks(instrument) for instrument in instruments]
+            times = np.concatenate([part[0] for part in parts])
+            prices = np.concatenate([part[1] for part in parts])
+            owners = np.repeat(np.arange(len(parts)),
+                               [len(part[0]) for part in parts])
+            order = np.argsort(times, kind='stable')
+            self._schedules[key] = (times[order], owners[order],
+                                    prices[order])
+        return self._schedules[key]
+
+    def total_ticks(self, instruments):
+        return len(self.schedule(instruments)[0]) * self.loops
+
+    # Protocol ------------------------------------------------------------
+
+    async def _write(self, writer, payload):
+        step = self.max_chunk or len(payload)
+        for offset in range(0, len(payload), step):
+            part = payload[offset:offset + step]
+            writer.write(b'%x\r\n%s\r\n' % (len(part), part))
+        await writer.drain()
+
+    async def _respond(self, writer, status, body):
+        payload = body.encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n"
+            .encode() + payload)
+        await writer.drain()
+
+    async def _heartbeats(self, writer):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await self._write(writer, (
+                f'{{"type":"HEARTBEAT","time":"{_format_time(time.time_ns())}"'
+                f'}}\n').encode())
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        heartbeats = None
+        try:
+            request_line = (await reader.readline()).decode()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode().partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            parsed = urlparse(request_line.split()[1])
+            if not STREAM_PATH.match(parsed.path):
+                await self._respond(writer, '404 Not Found',
+                                    '{"errorMessage":"Not found"}')
+                return
+            if not headers.get('authorization', '').startswith('Bearer '):
+                await self._respond(writer, '401 Unauthorized',
+                                    '{"errorMessage":"Missing token"}')
+                return
+            instruments = parse_qs(parsed.query).get(
+                'instruments', [''])[0].split(',')
+            unknown = [i for i in instruments if i not in REPLAY_FILES]
+            if unknown:
+                await self._respond(
+                    writer, '400 Bad Request',
+                    f'{{"errorMessage":"Invalid instruments {unknown}"}}')
+                return
+
+            writer.write(b"HTTP/1.1 200 OK\r\n"
+                         b"Content-Type: application/octet-stream\r\n"
+                         b"Transfer-Encoding: chunked\r\n\r\n")
+            await writer.drain()
+            heartbeats = asyncio.ensure_future(self._heartbeats(writer))
+            await self._replay(writer, instruments)
+            # Like a quiet market: heartbeats only from here on
+            await heartbeats
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if heartbeats is not None:
+                heartbeats.cancel()
+            writer.close()
+
+    async def _replay(self, writer, instruments):
+        times, owners, prices = self.schedule(instruments)
+        key = tuple(instruments)
+        total = len(times) * self.loops
+        span = int(times[-1] - times[0]) if len(times) else 0
+        sent = 0
+
+        started = time.monotonic()
+        position = self._cursors.get(key, 0)
+        origin = None
+        while position < total:
+            # Everything due by now goes out in one chunk
+            batch = []
+            now = time.monotonic()
+            while position < total:
+                i = position % len(times)
+                market_time = int(times[i]) + \
+                    (position // len(times)) * (span + 1)
+                if origin is None:
+                    origin = market_time
+                if self.speedup and \
+                        (market_time - origin) / 1e9 / self.speedup > \
+                        now - started:
+                    break
+
+                price = prices[i]
+                stamp = time.time_ns() if self.restamp else market_time
+                instrument = instruments[owners[i]]
+                bid = price * (1 - self.half_spread)
+                ask = price * (1 + self.half_spread)
+                batch.append(
+                    f'{{"type":"PRICE","instrument":"{instrument}",'
+                    f'"time":"{_format_time(stamp)}","tradeable":true,'
+                    f'"bids":[{{"price":"{bid:.5f}",'
+                    f'"liquidity":1000000}}],'
+                    f'"asks":[{{"price":"{ask:.5f}",'
+                    f'"liquidity":1000000}}]}}\n')
+                position += 1
+                sent += 1
+                if len(batch) >= 256 or (self.disconnect_after and
+                                         sent >= self.disconnect_after):
+                    break
+
+            if batch:
+                await self._write(writer, ''.join(batch).encode())
+                self.prices_sent += len(batch)
+            self._cursors[key] = position
+
+            if self.disconnect_after and sent >= self.disconnect_after:
+                raise ConnectionError("Injected disconnect")
+            if not batch:
+                i = position % len(times)
+                due = (int(times[i]) + (position // len(times)) * (span + 1)
+                       - origin) / 1e9 / self.speedup
+                await asyncio.sleep(max(due - (time.monotonic() - started),
+                                        0))
+
+    # Lifecycle -----------------------------------------------------------
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(asyncio.start_server(
+            self._handle, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+        tasks = asyncio.all_tasks(self._loop)
+        for task in tasks:
+            task.cancel()
+        self._loop.run_until_complete(
+            asyncio.gather(*tasks, return_exceptions=True))
+        self._server.close()
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -0,0 +1,369 @@
+# benchmarks/suite.py
+"""
+Reproducible benchmark suite for the ingest hot paths.
+
+Every case runs against local stand-ins only: the mock OANDA server
+for fetches, make_ohlcv / make_candle_payload for data (fixed seeds), a
+temporary SQLite database for the DB store/query cases (or --db URL,
+e.g. a scratch PostgreSQL database) and a temporary CandleStore.
+
+    fetch          OandaAPI.get_candles (HTTP + parse)
+    fetch_retry    the same with 20% injected 503s
+    parse          parse_candles
+    validate       validate_data
+    validate_keyed validate_data with instrument/granularity columns
+    store_db       load_candles (rolled back after each run)
+    query_db       iter_candles over stored rows
+    store_parquet  CandleStore.append
+    query_parquet  CandleStore.read
+    end_to_end     fetch, validate, store and read back one series
+
+Each case is warmed up once, then timed `repeat` times with the garbage
+collector off (as asv does); the median is what gets compared. Results
+are saved to benchmarks/results/<time>_<commit>.json with the machine
+details, and --compare flags cases whose median moved by more than
+--threshold against an earlier run (exit status 1 on a regression).
+
+Run from the repository root:
+    python -m benchmarks.suite
+    python -m benchmarks.suite -k parse -k validate --quick
+    python -m benchmarks.suite --compare latest
+    python -m benchmarks.suite --compare 1a2b3c4 --threshold 0.2
+"""
+
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.mock_oanda import MockOandaServer
+from benchmarks.synthetic import make_candle_payload, make_ohlcv
+from src.db.connection import SQLITE_PREFIX, create_sqlite_schema, \
+    get_connection, placeholder
+from src.db.loader import load_candles
+from src.db.reader import iter_candles
+from src.storage.candle_store import CandleStore
+from src.utils.logger import configure_logging
+from src.utils.parsers import parse_candles
+from src.utils.validators import validate_data
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'results')
+INSTRUMENT = 'BENCH_USD'
+
+CASES = []
+
+
+def case(name, sizes):
+    """
+    Register a benchmark. The decorated setup(env, size) runs untimed
+    and returns the callable to time, or (run, reset) where reset()
+    runs untimed after every call.
+    """
+    def register(setup):
+        CASES.append((name, sizes, setup))
+        return setup
+    return register
+
+
+class Environment:
+    """Servers, API clients, a database and a scratch directory."""
+
+    def __init__(self, db_url=None):
+        self.tmp = tempfile.TemporaryDirectory()
+        os.environ.setdefault('OANDA_API_TOKEN', 'benchmark-token')
+        os.environ.setdefault('OANDA_ACCOUNT_ID', 'benchmark-account')
+        from src.oanda_api import OandaAPI
+
+        self.server = MockOandaServer().start()
+        self.flaky_server = MockOandaServer(error_rate=0.2,
+                                            retry_after=0).start()
+        self.api = self._api(OandaAPI, self.server)
+        self.flaky_api = self._api(OandaAPI, self.flaky_server)
+
+        db_url = db_url or \
+            f"{SQLITE_PREFIX}{os.path.join(self.tmp.name, 'bench.db')}"
+        self.conn = get_connection(db_url)
+        if db_url.startswith(SQLITE_PREFIX):
+            create_sqlite_schema(self.conn)
+
+    @staticmethod
+    def _api(api_class, server):
+        os.environ['OANDA_BASE_URL'] = server.url
+        return api_class()
+
+    def path(self, name):
+        return tempfile.mkdtemp(prefix=name, dir=self.tmp.name)
+
+    def close(self):
+        self.conn.rollback()
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"DELETE FROM raw_market_data WHERE instrument = "
+            f"{placeholder(self.conn)}", (INSTRUMENT,))
+        cursor.close()
+        self.conn.commit()
+        self.conn.close()
+        self.server.stop()
+        self.flaky_server.stop()
+        self.tmp.cleanup()
+
+
+# Cases -------------------------------------------------------------------
+
+@case('fetch', [500, 5000])
+def fetch(env, size):
+    return lambda: env.api.get_candles('EUR_USD', 'M1', count=size)
+
+
+@case('fetch_retry', [500])
+def fetch_retry(env, size):
+    return lambda: env.flaky_api.get_candles('EUR_USD', 'M1', count=size)
+
+
+@case('parse', [5_000, 100_000])
+def parse(env, size):
+    payload = make_candle_payload(size)
+    return lambda: parse_candles(payload)
+
+
+@case('validate', [100_000, 1_000_000, 10_000_000])
+def validate(env, size):
+    df = make_ohlcv(size, market_hours=True)
+    return lambda: validate_data(df, 'M1')
+
+
+@case('validate_keyed', [1_000_000, 10_000_000])
+def validate_keyed(env, size):
+    # As stored: one series with instrument/granularity string columns,
+    # granularity inferred from the frame
+    df = make_ohlcv(size, market_hours=True)
+    df['instrument'] = INSTRUMENT
+    df['granularity'] = 'M1'
+    return lambda: validate_data(df)
+
+
+@case('store_db', [10_000, 100_000])
+def store_db(env, size):
+    df = make_ohlcv(size)
+    return (lambda: load_candles(env.conn, df, INSTRUMENT, 'M1'),
+            env.conn.rollback)
+
+
+@case('query_db', [100_000])
+def query_db(env, size):
+    load_candles(env.conn, make_ohlcv(size, 'H1'), INSTRUMENT, 'H1')
+    env.conn.commit()
+
+    def run():
+        for _ in iter_candles(env.conn, INSTRUMENT, 'H1'):
+            pass
+    return run
+
+
+@case('store_parquet', [100_000, 1_000_000])
+def store_parquet(env, size):
+    df = make_ohlcv(size)
+    return lambda: CandleStore(root=env.path('store')).append(
+        df, INSTRUMENT, 'M1')
+
+
+@case('query_parquet', [1_000_000])
+def query_parquet(env, size):
+    store = CandleStore(root=env.path('query'))
+    store.append(make_ohlcv(size), INSTRUMENT, 'M1')
+    return lambda: store.read(INSTRUMENT, 'M1')
+
+
+@case('end_to_end', [5000])
+def end_to_end(env, size):
+    def run():
+        df = env.api.get_candles('EUR_USD', 'M5', count=size)
+        validate_data(df, 'M5')
+        load_candles(env.conn, df, INSTRUMENT, 'M5')
+        for _ in iter_candles(env.conn, INSTRUMENT, 'M5'):
+            pass
+    return run, env.conn.rollback
+
+
+# Running -----------------------------------------------------------------
+
+def measure(run, reset, repeat):
+    run()
+    reset()
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+        reset()
+
+    median = statistics.median(times)
+    return {
+        'min': min(times),
+        'median': median,
+        'mean': statistics.fmean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'repeat': repeat,
+    }
+
+
+def run_suite(env, patterns=(), quick=False, repeat=5):
+    results = {}
+    print(f"{'case':>24} {'median (s)':>11} {'min (s)':>10} "
+          f"{'rows/s':>14}")
+    for name, sizes, setup in CASES:
+        if patterns and not any(p in name for p in patterns):
+            continue
+        for size in sizes[:1] if quick else sizes:
+            prepared = setup(env, size)
+            run, reset = prepared if isinstance(prepared, tuple) \
+                else (prepared, lambda: None)
+            stats = measure(run, reset, repeat)
+            stats['rows_per_s'] = size / stats['median']
+            key = f"{name}[{size}]"
+            results[key] = stats
+            print(f"{key:>24} {stats['median']:>11.4f} {stats['min']:>10.4f} "
+                  f"{stats['rows_per_s']:>14,.0f}")
+    return results
+
+
+# Saving and comparing ----------------------------------------------------
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def save_results(results):
+    commit = _git('rev-parse', 'HEAD') or 'unknown'
+    now = datetime.now(timezone.utc)
+    record = {
+        'commit': commit,
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': now.isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'results': results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR,
+                        f"{now:%Y%m%dT%H%M%S}_{commit[:10]}.json")
+    with open(path, 'w') as f:
+        json.dump(record, f, indent=2)
+    return path
+
+
+def find_results(ref, exclude=None):
+    """A results file by path, 'latest', or commit prefix (newest wins)."""
+    if os.path.isfile(ref):
+        return ref
+    paths = sorted(p for p in glob.glob(os.path.join(RESULTS_DIR, '*.json'))
+                   if p != exclude)
+    if ref != 'latest':
+        commit = _git('rev-parse', ref) or ref
+        paths = [p for p in paths
+                 if os.path.basename(p).split('_', 1)[1].startswith(
+                     commit[:10])]
+    return paths[-1] if paths else None
+
+
+def compare(results, baseline_path, threshold):
+    """Print median ratios against a baseline; return regressed cases."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline['commit'][:10]} ({baseline['timestamp']})")
+    if baseline['machine'] != machine_info():
+        print("⚠️  Different machine or library versions; ratios are "
+              "indicative only")
+
+    regressions = []
+    for key, stats in results.items():
+        before = baseline['results'].get(key)
+        if before is None:
+            continue
+        ratio = stats['median'] / before['median']
+        if ratio > 1 + threshold:
+            verdict = 'SLOWER'
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            verdict = 'faster'
+        else:
+            verdict = ''
+        print(f"{key:>24} {before['median']:>11.4f} -> "
+              f"{stats['median']:>9.4f} {ratio:>6.2f}x {verdict}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-k', dest='patterns', action='append', default=[],
+                        help='only cases whose name contains this')
+    parser.add_argument('--quick', action='store_true',
+                        help='smallest size of each case only')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--db', help='database URL (default: temp SQLite)')
+    parser.add_argument('--compare', metavar='REF',
+                        help="results file, commit or 'latest'")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='relative median change to flag (default 0.1)')
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args()
+
+    # Log I/O is measured in bench_logging; keep it out of these numbers
+    configure_logging(level='WARNING')
+
+    print("=" * 60)
+    print("BENCHMARK SUITE")
+    print("=" * 60)
+    env = Environment(args.db)
+    try:
+        results = run_suite(env, args.patterns, args.quick, args.repeat)
+    finally:
+        env.close()
+
+    path = None
+    if not args.no_save:
+        path = save_results(results)
+        print(f"\nSaved {path}")
+
+    if args.compare:
+        baseline = find_results(args.compare, exclude=path)
+        if baseline is None:
+            print(f"❌ No saved results for {args.compare}")
+            sys.exit(2)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# benchmarks/synthetic.py
+"""
+Synthetic OANDA payloads for offline benchmarks.
+"""
+
+import numpy as np
+import pandas as pd
+
+GRANULARITY_NS = {
+    'M1': 60 * 10**9,
+    'M5': 5 * 60 * 10**9,
+    'M15': 15 * 60 * 10**9,
+    'M30': 30 * 60 * 10**9,
+    'H1': 3600 * 10**9,
+    'H4': 4 * 3600 * 10**9,
+    'D': 86400 * 10**9,
+    'W': 7 * 86400 * 10**9,
+}
+
+
+def _market_open(times):
+    # FX trades from Sunday 21:00 to Friday 21:00 UTC
+    minutes = (times // (60 * 10**9)) % (7 * 1440)
+    # Day 0 of the epoch week (1970-01-01) was a Thursday
+    weekday = (minutes // 1440 + 3) % 7  # Monday = 0
+    minute_of_day = minutes % 1440
+    closed = (weekday == 5) | \
+        ((weekday == 4) & (minute_of_day >= 21 * 60)) | \
+        ((weekday == 6) & (minute_of_day < 21 * 60))
+    return ~closed
+
+
+def _session_factor(times):
+    # Intraday volatility/volume profile: quiet Asian hours, a London
+    # open bump and the London/New York overlap peak
+    hour = (times // (3600 * 10**9)) % 24 + 0.5
+    return 0.55 + 0.35 * np.exp(-((hour - 8) / 1.5) ** 2) + \
+        0.8 * np.exp(-((hour - 14.5) / 2.5) ** 2)
+
+
+def make_ohlcv(n, granularity='M1', start='2024-01-01T00:00:00Z', seed=42,
+               volatility=2e-4, market_hours=False, price=1.1):
+    """
+    Realistic synthetic candles as a parse_candles-shaped DataFrame.
+
+    Returns follow a stochastic-volatility process: fat-tailed
+    (Student-t, 4 dof) innovations scaled by a persistent log-volatility
+    and, for intraday granularities, a session profile. Volume scales
+    with the session and the size of the move. High/low extend past the
+    body by a random fraction of the bar's volatility.
+
+    Parameters:
+    -----------
+    volatility : float
+        Typical per-bar log-return standard deviation
+    market_hours : bool
+        Leave out the FX weekend (Friday 21:00 to Sunday 21:00 UTC), so
+        the time grid has gaps like real data
+    """
+    rng = np.random.default_rng(seed)
+    step = GRANULARITY_NS[granularity]
+    origin = pd.Timestamp(start).value
+    if market_hours:
+        # About 5/7 of the grid is open; draw enough and keep n
+        candidates = origin + np.arange(n * 7 // 5 + 10080 * 60 * 10**9 //
+                                        step + 8, dtype=np.int64) * step
+        times = candidates[_market_open(candidates)][:n]
+    else:
+        times = origin + np.arange(n, dtype=np.int64) * step
+
+    # Persistent log-volatility: an exponentially smoothed random walk
+    # of shocks, rescaled to unit variance
+    log_vol = pd.Series(rng.normal(0, 1, n)).ewm(alpha=0.02).mean() \
+        .to_numpy()
+    log_vol = 0.5 * (log_vol - log_vol.mean()) / (log_vol.std() or 1.0)
+    sigma = volatility * np.exp(log_vol - 0.125)
+    if step < GRANULARITY_NS['D']:
+        season = _session_factor(times)
+        sigma *= season
+    else:
+        season = np.ones(n)
+
+    shocks = rng.standard_t(4, n) / np.sqrt(2.0)
+    returns = sigma * shocks
+    close = price * np.exp(np.cumsum(returns))
+    open_ = np.concatenate(([price], close[:-1]))
+    high = np.maximum(open_, close) * \
+        (1 + np.abs(rng.normal(0, 0.5, n)) * sigma)
+    low = np.minimum(open_, close) * \
+        (1 - np.abs(rng.normal(0, 0.5, n)) * sigma)
+
+    activity = season * (1 + np.abs(shocks)) * \
+        rng.lognormal(0, 0.4, n)
+    volume = np.maximum(1, (activity * 800).astype(np.int64))
+
+    return pd.DataFrame({
+        'time': pd.to_datetime(times, utc=True),
+        'open': open_.round(5),
+        'high': high.round(5),
+        'low': low.round(5),
+        'close': close.round(5),
+        'volume': volume,
+    })
+
+
+def make_candle_frame(n, granularity='M1', start='2024-01-01T00:00:00Z',
+                      seed=42):
+    """
+    Build a parse_candles-shaped DataFrame directly, without JSON, on a
+    gapless time grid (see make_ohlcv).
+    """
+    return make_ohlcv(n, granularity, start=start, seed=seed)
+
+
+def make_candle_payload(n, granularity='M1', start='2024-01-01T00:00:00Z',
+                        components=('mid',), seed=42):
+    """Build a list of OANDA-style candle dicts with string prices."""
+    df = make_ohlcv(n, granularity, start=start, seed=seed)
+    time_strings = np.datetime_as_string(
+        df['time'].dt.tz_localize(None).to_numpy(), unit='ns')
+    columns = [df[column].to_numpy()
+               for column in ('open', 'high', 'low', 'close')]
+    volume = df['volume'].to_numpy()
+
+    candles = []
+    for i in range(n):
+        candle = {
+            'complete': i < n - 1,
+            'volume': int(volume[i]),
+            'time': f"{time_strings[i]}Z",
+        }
+        prices = {'o': f"{columns[0][i]:.5f}", 'h': f"{columns[1][i]:.5f}",
+                  'l': f"{columns[2][i]:.5f}", 'c': f"{columns[3][i]:.5f}"}
+        for component in components:
+            candle[component] = prices
+        candles.append(candle)
+    return candles
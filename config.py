@@ -4,6 +4,28 @@ class APIConfig:
     MAX_RETRIES = 3
     TIMEOUT = 30  # seconds
 
+    # HTTP connection pooling
+    POOL_CONNECTIONS = 10  # Number of host pools to cache
+    POOL_MAXSIZE = 10  # Max keep-alive connections per host
+
+    # Retry backoff: BACKOFF_FACTOR * 2 ** attempt, plus random jitter
+    BACKOFF_FACTOR = 0.5  # seconds
+    BACKOFF_MAX = 30  # seconds
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    # Concurrent fetching (OANDA allows ~120 requests/second per connection)
+    MAX_CONCURRENCY = 10  # Requests in flight at once
+    RATE_LIMIT = 100  # Requests per second (token-bucket refill rate)
+    RATE_BURST = 20  # Token-bucket capacity
+
+    # Pricing stream (OANDA sends a heartbeat every 5 seconds)
+    STREAM_TIMEOUT = 10  # Seconds without any message before reconnecting
+    STREAM_QUEUE_SIZE = 10_000  # Ticks buffered for the consumer
+
+    # On-disk cache of get_candles responses
+    CACHE_TTL = 30  # Seconds an entry with forming candles stays fresh
+    CACHE_MAX_BYTES = 256 * 1024 * 1024  # LRU eviction beyond this size
+
 
 class DataConfig:
     # Default parameters
@@ -37,10 +59,73 @@ class DataConfig:
         'M',    # Monthly
     ]
 
+    # Candle alignment, as OANDA's dailyAlignment / alignmentTimezone /
+    # weeklyAlignment: H4 and longer candles start at 17:00 New York time
+    # and weekly candles on Friday
+    DAILY_ALIGNMENT = 17  # Hour of day (0-23) in ALIGNMENT_TIMEZONE
+    ALIGNMENT_TIMEZONE = 'America/New_York'
+    WEEKLY_ALIGNMENT = 'Friday'
+
     # Data quality settings
     MAX_NULL_PERCENTAGE = 5.0  # Maximum % of null values allowed
     MAX_DUPLICATE_PERCENTAGE = 1.0  # Maximum % of duplicates allowed
 
+    # Rolling outlier detection on log returns
+    OUTLIER_WINDOW = 100  # Previous returns each candle is scored against
+    OUTLIER_MIN_PERIODS = 20  # Returns needed before scoring starts
+    OUTLIER_ZSCORE = 4.0  # Rolling z-score threshold
+    OUTLIER_MAD = 5.0  # Robust (median/MAD) z-score threshold
+
+    # Real-time tick aggregation
+    TICK_LATENESS = 2.0  # Seconds a candle stays open past its end
+    CANDLE_BATCH_SIZE = 1000  # Completed candles per hand-off to sinks
+    CANDLE_BATCH_DELAY = 1.0  # Max seconds a completed candle is held
+
+    # Shared-memory cache of the latest candles per series
+    SHARED_CACHE_CANDLES = 5000  # Ring capacity per series
+    SHARED_CACHE_PREFIX = 'fxcandles'  # Shared memory block name prefix
+
+
+class FeatureConfig:
+    # Default indicator parameters (periods are in candles)
+    SMA_WINDOW = 20
+    EMA_WINDOW = 20
+    WMA_WINDOW = 20
+    RSI_WINDOW = 14
+    ATR_WINDOW = 14
+    BOLLINGER_WINDOW = 20
+    BOLLINGER_STD = 2.0  # Band width in standard deviations
+    MACD_FAST = 12
+    MACD_SLOW = 26
+    MACD_SIGNAL = 9
+    VOLATILITY_WINDOW = 20
+    VWAP_ANCHOR = 'D'  # Session VWAP resets each trading day (None = never)
+
+    # Parallel computation across series
+    MAX_WORKERS = None  # Worker processes (None = one per CPU)
+
+
+class BacktestConfig:
+    INITIAL_CAPITAL = 100_000.0
+    # Costs in basis points of the fill price; each fill pays half the
+    # spread plus the slippage
+    SPREAD_BPS = 1.0
+    SLIPPAGE_BPS = 0.5
+
+    # Parameter sweeps
+    MAX_WORKERS = None  # Worker processes (None = one per CPU)
+    SWEEP_CHUNK_SIZE = 64  # Parameter combinations per task
+
+
+class PipelineConfig:
+    # Partitions waiting between two stages (backpressure beyond this)
+    QUEUE_SIZE = 8
+
+    # Threads per stage of the ingest pipeline
+    EXTRACT_WORKERS = 4  # HTTP-bound
+    PROCESS_WORKERS = 2  # parse / validate / transform
+    LOAD_WORKERS = 2  # Each holds a pooled DB connection while loading
+
 
 class PathConfig:
     DATA_DIR = 'data/'
@@ -66,6 +151,22 @@ class LogConfig:
     MAX_LOG_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
     BACKUP_COUNT = 5  # Keep 5 backup log files
 
+    # One JSON object per line instead of LOG_FORMAT
+    LOG_JSON = False
+
+
+class MetricsConfig:
+    # Timers and counters (src/utils/metrics); cheap enough to leave on
+    ENABLED = True
+
+    # Histogram bucket upper bounds, seconds
+    BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+               0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    # Prometheus export targets
+    EXPORT_FILE = 'logs/metrics.prom'
+    HTTP_PORT = 9108
+
 
 class DatabaseConfig:
     # Connection pool settings
@@ -76,6 +177,7 @@ class DatabaseConfig:
 
     # Query settings
     BATCH_SIZE = 1000  # Number of rows to insert at once
+    COPY_BATCH_SIZE = 100_000  # Rows streamed per COPY into staging
     QUERY_TIMEOUT = 60  # Seconds before query timeout
 
 
@@ -87,6 +189,18 @@ def validate_config():
         raise ValueError("MAX_RETRIES must be >= 0")
     if APIConfig.TIMEOUT <= 0:
         raise ValueError("TIMEOUT must be > 0")
+    if APIConfig.POOL_MAXSIZE <= 0:
+        raise ValueError("POOL_MAXSIZE must be > 0")
+    if APIConfig.BACKOFF_FACTOR < 0:
+        raise ValueError("BACKOFF_FACTOR must be >= 0")
+    if APIConfig.MAX_CONCURRENCY <= 0:
+        raise ValueError("MAX_CONCURRENCY must be > 0")
+    if APIConfig.RATE_LIMIT <= 0 or APIConfig.RATE_BURST <= 0:
+        raise ValueError("RATE_LIMIT and RATE_BURST must be > 0")
+    if APIConfig.STREAM_TIMEOUT <= 0 or APIConfig.STREAM_QUEUE_SIZE <= 0:
+        raise ValueError("STREAM_TIMEOUT and STREAM_QUEUE_SIZE must be > 0")
+    if APIConfig.CACHE_TTL < 0 or APIConfig.CACHE_MAX_BYTES <= 0:
+        raise ValueError("CACHE_TTL must be >= 0 and CACHE_MAX_BYTES > 0")
 
     # Validate Data config
     if DataConfig.DEFAULT_GRANULARITY not in DataConfig.SUPPORTED_TIMEFRAMES:
@@ -94,10 +208,76 @@ def validate_config():
             f"DEFAULT_GRANULARITY must be one of {DataConfig.SUPPORTED_TIMEFRAMES}")
     if DataConfig.DEFAULT_COUNT <= 0:
         raise ValueError("DEFAULT_COUNT must be > 0")
+    if not 0 <= DataConfig.DAILY_ALIGNMENT <= 23:
+        raise ValueError("DAILY_ALIGNMENT must be an hour between 0 and 23")
+    if DataConfig.WEEKLY_ALIGNMENT not in ('Monday', 'Tuesday', 'Wednesday',
+                                           'Thursday', 'Friday', 'Saturday',
+                                           'Sunday'):
+        raise ValueError("WEEKLY_ALIGNMENT must be a day name")
+    if not 2 <= DataConfig.OUTLIER_MIN_PERIODS <= DataConfig.OUTLIER_WINDOW:
+        raise ValueError(
+            "OUTLIER_MIN_PERIODS must be between 2 and OUTLIER_WINDOW")
+    if DataConfig.OUTLIER_ZSCORE <= 0 or DataConfig.OUTLIER_MAD <= 0:
+        raise ValueError("OUTLIER_ZSCORE and OUTLIER_MAD must be > 0")
+    if DataConfig.TICK_LATENESS < 0:
+        raise ValueError("TICK_LATENESS must be >= 0")
+    if DataConfig.CANDLE_BATCH_SIZE <= 0 or DataConfig.CANDLE_BATCH_DELAY < 0:
+        raise ValueError(
+            "CANDLE_BATCH_SIZE must be > 0 and CANDLE_BATCH_DELAY >= 0")
+    if DataConfig.SHARED_CACHE_CANDLES <= 0:
+        raise ValueError("SHARED_CACHE_CANDLES must be > 0")
+
+    # Validate Feature config
+    windows = [FeatureConfig.SMA_WINDOW, FeatureConfig.EMA_WINDOW,
+               FeatureConfig.WMA_WINDOW, FeatureConfig.RSI_WINDOW,
+               FeatureConfig.ATR_WINDOW, FeatureConfig.BOLLINGER_WINDOW,
+               FeatureConfig.MACD_FAST, FeatureConfig.MACD_SLOW,
+               FeatureConfig.MACD_SIGNAL, FeatureConfig.VOLATILITY_WINDOW]
+    if min(windows) < 2:
+        raise ValueError("Indicator windows must be >= 2")
+    if FeatureConfig.MACD_FAST >= FeatureConfig.MACD_SLOW:
+        raise ValueError("MACD_FAST must be < MACD_SLOW")
+    if FeatureConfig.MAX_WORKERS is not None and \
+            FeatureConfig.MAX_WORKERS <= 0:
+        raise ValueError("MAX_WORKERS must be > 0")
+
+    # Validate Backtest config
+    if BacktestConfig.INITIAL_CAPITAL <= 0:
+        raise ValueError("INITIAL_CAPITAL must be > 0")
+    if BacktestConfig.SPREAD_BPS < 0 or BacktestConfig.SLIPPAGE_BPS < 0:
+        raise ValueError("SPREAD_BPS and SLIPPAGE_BPS must be >= 0")
+    if BacktestConfig.SWEEP_CHUNK_SIZE <= 0:
+        raise ValueError("SWEEP_CHUNK_SIZE must be > 0")
+    if BacktestConfig.MAX_WORKERS is not None and \
+            BacktestConfig.MAX_WORKERS <= 0:
+        raise ValueError("MAX_WORKERS must be > 0")
+
+    # Validate Log config
+    if LogConfig.LOG_LEVEL not in ('DEBUG', 'INFO', 'WARNING', 'ERROR',
+                                   'CRITICAL'):
+        raise ValueError(f"Invalid LOG_LEVEL: {LogConfig.LOG_LEVEL}")
+    if LogConfig.MAX_LOG_FILE_SIZE <= 0 or LogConfig.BACKUP_COUNT < 0:
+        raise ValueError("MAX_LOG_FILE_SIZE must be > 0 and BACKUP_COUNT >= 0")
+
+    # Validate Pipeline config
+    if PipelineConfig.QUEUE_SIZE <= 0 or min(
+            PipelineConfig.EXTRACT_WORKERS, PipelineConfig.PROCESS_WORKERS,
+            PipelineConfig.LOAD_WORKERS) <= 0:
+        raise ValueError("QUEUE_SIZE and pipeline worker counts must be > 0")
+
+    # Validate Metrics config
+    if not MetricsConfig.BUCKETS or min(MetricsConfig.BUCKETS) <= 0:
+        raise ValueError("BUCKETS must be non-empty and > 0")
 
     # Validate Database config
     if DatabaseConfig.POOL_SIZE <= 0:
         raise ValueError("POOL_SIZE must be > 0")
+    if DatabaseConfig.MAX_OVERFLOW < 0:
+        raise ValueError("MAX_OVERFLOW must be >= 0")
+    if DatabaseConfig.POOL_TIMEOUT <= 0 or DatabaseConfig.POOL_RECYCLE <= 0:
+        raise ValueError("POOL_TIMEOUT and POOL_RECYCLE must be > 0")
+    if DatabaseConfig.BATCH_SIZE <= 0 or DatabaseConfig.COPY_BATCH_SIZE <= 0:
+        raise ValueError("BATCH_SIZE and COPY_BATCH_SIZE must be > 0")
 
     return True
 
@@ -9,15 +9,26 @@ This script:
 """
 
 import os
+import sys
 import psycopg2
 from dotenv import load_dotenv
 
+# Allow `python database/create_database.py` from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db.pool import get_pool  # noqa: E402
+
 # Load environment variables
 load_dotenv()
 
 
-def create_tables():
-    """Create database tables from schema.sql file."""
+def create_tables(partitioned=False):
+    """
+    Create database tables from schema.sql file.
+
+    With partitioned=True, raw_market_data is then replaced by the
+    time/granularity partitioned layout in schema_partitioned.sql.
+    """
 
     print("=" * 60)
     print("DATABASE SETUP - Creating Tables")
@@ -33,52 +44,62 @@ def create_tables():
         return False
 
     try:
-        # Connect to database
+        # Connect to database; the pool takes the connection back (and
+        # rolls back anything uncommitted) however this block exits
         print(f"\n1. Connecting to database...")
-        conn = psycopg2.connect(db_url)
-        cursor = conn.cursor()
-        print("✅ Connected successfully")
-
-        # Read schema.sql file
-        print("\n2. Reading schema.sql...")
-        schema_path = os.path.join('database', 'schema.sql')
-
-        if not os.path.exists(schema_path):
-            print(f"❌ ERROR: {schema_path} not found")
-            return False
-
-        with open(schema_path, 'r') as f:
-            schema_sql = f.read()
-
-        print("✅ Schema file loaded")
-
-        # Execute schema
-        print("\n3. Creating tables...")
-        cursor.execute(schema_sql)
-        conn.commit()
-        print("✅ Tables created successfully")
-
-        # Verify tables exist
-        print("\n4. Verifying tables...")
-        cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public'
-            ORDER BY table_name;
-        """)
-
-        tables = cursor.fetchall()
-
-        if tables:
-            print(f"✅ Found {len(tables)} tables:")
-            for table in tables:
-                print(f"   - {table[0]}")
-        else:
-            print("⚠️  No tables found")
-
-        # Close connection
-        cursor.close()
-        conn.close()
+        pool = get_pool(db_url)
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            print("✅ Connected successfully")
+
+            # Read schema.sql file
+            print("\n2. Reading schema.sql...")
+            schema_path = os.path.join('database', 'schema.sql')
+
+            if not os.path.exists(schema_path):
+                print(f"❌ ERROR: {schema_path} not found")
+                return False
+
+            with open(schema_path, 'r') as f:
+                schema_sql = f.read()
+
+            print("✅ Schema file loaded")
+
+            # Execute schema
+            print("\n3. Creating tables...")
+            cursor.execute(schema_sql)
+
+            if partitioned:
+                partitioned_path = os.path.join('database',
+                                                'schema_partitioned.sql')
+                with open(partitioned_path, 'r') as f:
+                    partitioned_sql = f.read()
+                cursor.execute("DROP TABLE raw_market_data CASCADE;")
+                cursor.execute(partitioned_sql)
+                print("✅ Using partitioned raw_market_data layout")
+
+            conn.commit()
+            print("✅ Tables created successfully")
+
+            # Verify tables exist
+            print("\n4. Verifying tables...")
+            cursor.execute("""
+                SELECT table_name 
+                FROM information_schema.tables 
+                WHERE table_schema = 'public'
+                ORDER BY table_name;
+            """)
+
+            tables = cursor.fetchall()
+
+            if tables:
+                print(f"✅ Found {len(tables)} tables:")
+                for table in tables:
+                    print(f"   - {table[0]}")
+            else:
+                print("⚠️  No tables found")
+
+            cursor.close()
 
         print("\n" + "=" * 60)
         print("✅ DATABASE SETUP COMPLETE!")
@@ -107,19 +128,18 @@ def test_connection():
         return False
 
     try:
-        conn = psycopg2.connect(db_url)
-        cursor = conn.cursor()
+        pool = get_pool(db_url)
+        with pool.connection() as conn:
+            cursor = conn.cursor()
 
-        # Test query
-        cursor.execute("SELECT version();")
-        version = cursor.fetchone()
+            # Test query
+            cursor.execute("SELECT version();")
+            version = cursor.fetchone()
+            cursor.close()
 
         print(f"✅ Connection successful!")
         print(f"   PostgreSQL version: {version[0].split(',')[0]}")
 
-        cursor.close()
-        conn.close()
-
         return True
 
     except Exception as e:
@@ -130,5 +150,5 @@ def test_connection():
 if __name__ == "__main__":
     print("\n🚀 FOREX/CRYPTO DATA PIPELINE - DATABASE SETUP\n")
 
-    # Create tables
-    create_tables()
+    # Create tables (pass --partitioned for the partitioned layout)
+    create_tables(partitioned='--partitioned' in sys.argv[1:])
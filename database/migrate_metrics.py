@@ -0,0 +1,56 @@
+# database/migrate_metrics.py
+"""
+Add the metrics column to extraction_metadata on a database created
+before it was part of schema.sql.
+
+Sync runs record a JSON summary of their timers and counters there.
+Without the column they still work, but the metrics are not stored.
+Safe to run more than once.
+
+Usage (from the repo root):
+    python database/migrate_metrics.py
+"""
+
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# Allow `python database/migrate_metrics.py` from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db.connection import has_column  # noqa: E402
+from src.db.pool import get_pool  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+
+def migrate():
+    """Add extraction_metadata.metrics if it is missing."""
+
+    print("=" * 60)
+    print("DATABASE MIGRATION - extraction_metadata.metrics")
+    print("=" * 60)
+
+    try:
+        with get_pool().connection() as conn:
+            if has_column(conn, 'extraction_metadata', 'metrics'):
+                print("✅ Column already exists, nothing to do")
+                return True
+
+            cursor = conn.cursor()
+            cursor.execute(
+                "ALTER TABLE extraction_metadata ADD COLUMN metrics TEXT")
+            cursor.close()
+
+        print("✅ Added extraction_metadata.metrics")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed, nothing was changed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    migrate()
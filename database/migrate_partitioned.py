@@ -0,0 +1,118 @@
+# database/migrate_partitioned.py
+"""
+Migrate an existing raw_market_data heap table to the partitioned layout
+in schema_partitioned.sql.
+
+This script, in a single transaction:
+1. Renames the current table (and its indexes) to raw_market_data_legacy
+2. Creates the partitioned raw_market_data
+3. Creates monthly partitions covering the legacy data
+4. Copies every row across and checks the row counts match
+
+The legacy table is kept for verification unless --drop-legacy is given.
+
+Usage (from the repo root):
+    python database/migrate_partitioned.py [--drop-legacy]
+"""
+
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# Allow `python database/migrate_partitioned.py` from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db.pool import get_pool  # noqa: E402
+
+# Load environment variables
+load_dotenv()
+
+LEGACY_RENAMES = [
+    "ALTER TABLE raw_market_data RENAME TO raw_market_data_legacy",
+    "ALTER INDEX raw_market_data_pkey RENAME TO raw_market_data_legacy_pkey",
+    "ALTER INDEX unique_candle RENAME TO raw_market_data_legacy_unique_candle",
+    "ALTER INDEX idx_instrument_time RENAME TO idx_legacy_instrument_time",
+    "ALTER INDEX idx_granularity RENAME TO idx_legacy_granularity",
+]
+
+
+def migrate(drop_legacy=False):
+    """Convert raw_market_data to the partitioned layout."""
+
+    print("=" * 60)
+    print("DATABASE MIGRATION - Partitioned raw_market_data")
+    print("=" * 60)
+
+    pool = get_pool()
+    conn = pool.getconn()
+    cursor = conn.cursor()
+
+    try:
+        print("\n1. Renaming current table to raw_market_data_legacy...")
+        for statement in LEGACY_RENAMES:
+            cursor.execute(statement)
+        print("✅ Renamed")
+
+        print("\n2. Creating partitioned raw_market_data...")
+        with open(os.path.join('database', 'schema_partitioned.sql')) as f:
+            cursor.execute(f.read())
+        print("✅ Created")
+
+        print("\n3. Creating monthly partitions for existing data...")
+        cursor.execute("""
+            SELECT COALESCE(SUM(ensure_market_data_partitions(
+                first_time::DATE,
+                (last_time + INTERVAL '1 month')::DATE,
+                ARRAY[granularity])), 0)
+            FROM (
+                SELECT granularity, MIN(time) AS first_time,
+                       MAX(time) AS last_time
+                FROM raw_market_data_legacy
+                WHERE granularity IN ('M1', 'M5', 'M15', 'M30', 'H1', 'H4')
+                GROUP BY granularity
+            ) ranges
+        """)
+        print(f"✅ Created {cursor.fetchone()[0]} monthly partitions")
+
+        print("\n4. Copying rows...")
+        cursor.execute("""
+            INSERT INTO raw_market_data
+                (instrument, granularity, time, open, high, low, close, volume)
+            SELECT instrument, granularity, time,
+                   open, high, low, close, volume
+            FROM raw_market_data_legacy
+            ORDER BY granularity, instrument, time
+        """)
+        copied = cursor.rowcount
+
+        cursor.execute("SELECT COUNT(*) FROM raw_market_data_legacy")
+        legacy_rows = cursor.fetchone()[0]
+        if copied != legacy_rows:
+            raise RuntimeError(
+                f"Copied {copied} rows but legacy table has {legacy_rows}")
+        print(f"✅ Copied {copied} rows")
+
+        if drop_legacy:
+            cursor.execute("DROP TABLE raw_market_data_legacy")
+            print("✅ Dropped raw_market_data_legacy")
+
+        conn.commit()
+
+        print("\n" + "=" * 60)
+        print("✅ MIGRATION COMPLETE!")
+        print("=" * 60)
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n❌ Migration failed, nothing was changed: {e}")
+        return False
+
+    finally:
+        cursor.close()
+        pool.putconn(conn)
+
+
+if __name__ == "__main__":
+    migrate(drop_legacy='--drop-legacy' in sys.argv[1:])
@@ -49,6 +49,10 @@ CREATE TABLE extraction_metadata (
     rows_extracted INTEGER NOT NULL DEFAULT 0,
     status VARCHAR(20) NOT NULL,
     error_message TEXT,
+    last_candle_time TIMESTAMP WITH TIME ZONE,  -- Watermark for incremental sync
+    -- JSON summary of the run's timers and counters. On an existing
+    -- database, add it with database/migrate_metrics.py
+    metrics TEXT,
     
     -- Constraints
     CONSTRAINT valid_status CHECK (status IN ('SUCCESS', 'FAILED', 'PARTIAL'))
@@ -57,3 +61,5 @@ CREATE TABLE extraction_metadata (
 -- Create index for tracking
 CREATE INDEX idx_extraction_time ON extraction_metadata(extraction_time);
 CREATE INDEX idx_status ON extraction_metadata(status);
+CREATE INDEX idx_extraction_series
+    ON extraction_metadata(instrument, granularity, extraction_time);
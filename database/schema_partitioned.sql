@@ -0,0 +1,128 @@
+-- database/schema_partitioned.sql
+-- Alternative storage layout for raw_market_data
+--
+-- Same columns the loader writes, but:
+--   * partitioned by LIST (granularity), and intraday granularities are
+--     sub-partitioned by RANGE (time) into monthly tables
+--   * composite primary key (instrument, granularity, time) instead of a
+--     SERIAL id plus a separate unique constraint
+--   * BRIN index on time, which stays a few pages per partition
+--   * fixed-width DOUBLE PRECISION prices instead of DECIMAL(20, 5), with
+--     8-byte columns first so rows pack without alignment padding
+--
+-- Used by `create_database.py --partitioned` for fresh installs and by
+-- migrate_partitioned.py to convert an existing heap table.
+
+-- ============================================================================
+-- Table: raw_market_data (partitioned)
+-- ============================================================================
+CREATE TABLE raw_market_data (
+    time TIMESTAMP WITH TIME ZONE NOT NULL,
+    open DOUBLE PRECISION NOT NULL,
+    high DOUBLE PRECISION NOT NULL,
+    low DOUBLE PRECISION NOT NULL,
+    close DOUBLE PRECISION NOT NULL,
+    volume INTEGER NOT NULL,
+    instrument VARCHAR(20) NOT NULL,
+    granularity VARCHAR(10) NOT NULL,
+
+    -- Constraints
+    CONSTRAINT raw_market_data_pkey PRIMARY KEY (instrument, granularity, time),
+    CONSTRAINT valid_prices CHECK (
+        open > 0 AND
+        high > 0 AND
+        low > 0 AND
+        close > 0 AND
+        high >= low
+    )
+) PARTITION BY LIST (granularity);
+
+-- Intraday granularities: one partition each, split into months
+CREATE TABLE raw_market_data_m1 PARTITION OF raw_market_data
+    FOR VALUES IN ('M1') PARTITION BY RANGE (time);
+CREATE TABLE raw_market_data_m5 PARTITION OF raw_market_data
+    FOR VALUES IN ('M5') PARTITION BY RANGE (time);
+CREATE TABLE raw_market_data_m15 PARTITION OF raw_market_data
+    FOR VALUES IN ('M15') PARTITION BY RANGE (time);
+CREATE TABLE raw_market_data_m30 PARTITION OF raw_market_data
+    FOR VALUES IN ('M30') PARTITION BY RANGE (time);
+CREATE TABLE raw_market_data_h1 PARTITION OF raw_market_data
+    FOR VALUES IN ('H1') PARTITION BY RANGE (time);
+CREATE TABLE raw_market_data_h4 PARTITION OF raw_market_data
+    FOR VALUES IN ('H4') PARTITION BY RANGE (time);
+
+-- Catch-all month partitions so a load never fails for lack of a partition
+CREATE TABLE raw_market_data_m1_default PARTITION OF raw_market_data_m1 DEFAULT;
+CREATE TABLE raw_market_data_m5_default PARTITION OF raw_market_data_m5 DEFAULT;
+CREATE TABLE raw_market_data_m15_default PARTITION OF raw_market_data_m15 DEFAULT;
+CREATE TABLE raw_market_data_m30_default PARTITION OF raw_market_data_m30 DEFAULT;
+CREATE TABLE raw_market_data_h1_default PARTITION OF raw_market_data_h1 DEFAULT;
+CREATE TABLE raw_market_data_h4_default PARTITION OF raw_market_data_h4 DEFAULT;
+
+-- Daily and longer stay small enough for a single table each
+CREATE TABLE raw_market_data_d PARTITION OF raw_market_data
+    FOR VALUES IN ('D');
+CREATE TABLE raw_market_data_w PARTITION OF raw_market_data
+    FOR VALUES IN ('W');
+CREATE TABLE raw_market_data_mn PARTITION OF raw_market_data
+    FOR VALUES IN ('M');
+CREATE TABLE raw_market_data_other PARTITION OF raw_market_data DEFAULT;
+
+-- Range scans on time; BRIN suits append-mostly, time-ordered data
+CREATE INDEX idx_raw_market_data_time_brin
+    ON raw_market_data USING brin (time) WITH (pages_per_range = 32);
+
+-- ============================================================================
+-- Function: ensure_market_data_partitions
+-- Purpose: Create monthly partitions for the given intraday granularities
+--          (all of them by default) covering [p_from, p_to). Existing
+--          months are skipped.
+--
+-- copy_candles (src/db/loader.py) calls it for the months of every load.
+-- PostgreSQL refuses to create a month once rows for it have landed in
+-- the DEFAULT partition; such months are skipped with a WARNING and keep
+-- using DEFAULT until their rows are moved out.
+-- ============================================================================
+DROP FUNCTION IF EXISTS ensure_market_data_partitions(DATE, DATE, TEXT[]);
+CREATE FUNCTION ensure_market_data_partitions(
+    p_from DATE,
+    p_to DATE,
+    p_granularities TEXT[] DEFAULT ARRAY['M1', 'M5', 'M15', 'M30', 'H1', 'H4']
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_granularity TEXT;
+    v_month DATE;
+    v_name TEXT;
+    v_created INTEGER := 0;
+BEGIN
+    FOREACH v_granularity IN ARRAY p_granularities
+    LOOP
+        v_month := date_trunc('month', p_from)::DATE;
+        WHILE v_month < p_to LOOP
+            v_name := format('raw_market_data_%s_%s',
+                             lower(v_granularity), to_char(v_month, 'YYYYMM'));
+            IF to_regclass(v_name) IS NULL THEN
+                BEGIN
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                        v_name, 'raw_market_data_' || lower(v_granularity),
+                        v_month::TIMESTAMP AT TIME ZONE 'UTC',
+                        (v_month + INTERVAL '1 month')::TIMESTAMP AT TIME ZONE 'UTC');
+                    v_created := v_created + 1;
+                EXCEPTION WHEN check_violation THEN
+                    RAISE WARNING '% has rows in the DEFAULT partition; not created',
+                        v_name;
+                END;
+            END IF;
+            v_month := (v_month + INTERVAL '1 month')::DATE;
+        END LOOP;
+    END LOOP;
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Current month and the next one
+SELECT ensure_market_data_partitions(
+    date_trunc('month', CURRENT_DATE)::DATE,
+    (date_trunc('month', CURRENT_DATE) + INTERVAL '2 months')::DATE);
@@ -0,0 +1,64 @@
+-- database/schema_sqlite.sql
+-- SQLite version of schema.sql, for local runs and tests against a
+-- sqlite:///path DATABASE_URL.
+--
+-- Times are stored as ISO-8601 UTC text (see src/db/connection.py
+-- to_db_time), which sorts chronologically. Tables are only created if
+-- missing, so this can be applied to an existing file; delete the file
+-- to start clean.
+
+-- ============================================================================
+-- Table: raw_market_data
+-- Purpose: Store historical price data from OANDA API
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS raw_market_data (
+    id INTEGER PRIMARY KEY,
+    instrument TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    time TEXT NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume INTEGER NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+
+    -- Constraints
+    CONSTRAINT unique_candle UNIQUE (instrument, granularity, time),
+    CONSTRAINT valid_prices CHECK (
+        open > 0 AND
+        high > 0 AND
+        low > 0 AND
+        close > 0 AND
+        high >= low
+    )
+);
+
+CREATE INDEX IF NOT EXISTS idx_instrument_time
+    ON raw_market_data(instrument, time);
+CREATE INDEX IF NOT EXISTS idx_granularity ON raw_market_data(granularity);
+
+-- ============================================================================
+-- Table: extraction_metadata
+-- Purpose: Track data extraction runs and status
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS extraction_metadata (
+    id INTEGER PRIMARY KEY,
+    instrument TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    extraction_time TEXT DEFAULT CURRENT_TIMESTAMP,
+    rows_extracted INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    error_message TEXT,
+    last_candle_time TEXT,  -- Watermark for incremental sync
+    metrics TEXT,  -- JSON summary of the run's timers and counters
+
+    -- Constraints
+    CONSTRAINT valid_status CHECK (status IN ('SUCCESS', 'FAILED', 'PARTIAL'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_extraction_time
+    ON extraction_metadata(extraction_time);
+CREATE INDEX IF NOT EXISTS idx_status ON extraction_metadata(status);
+CREATE INDEX IF NOT EXISTS idx_extraction_series
+    ON extraction_metadata(instrument, granularity, extraction_time);
@@ -0,0 +1,31 @@
+# src/backtest/data.py
+
+import os
+
+import pandas as pd
+
+from config import PathConfig
+from src.db.reader import iter_candles
+
+CANDLE_COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume']
+
+
+def load_csv(path):
+    """
+    Candles from a CSV dump, e.g. 'eur_usd_1h.csv' from the data
+    directory or any path.
+    """
+    if not os.path.exists(path):
+        path = os.path.join(PathConfig.DATA_DIR, path)
+    df = pd.read_csv(path)
+    df['time'] = pd.to_datetime(df['time'], utc=True)
+    return df[CANDLE_COLUMNS].sort_values('time', ignore_index=True)
+
+
+def load_db(conn, instrument, granularity, start=None, end=None):
+    """Candles of one series in [start, end) from raw_market_data."""
+    chunks = [chunk[CANDLE_COLUMNS] for chunk in
+              iter_candles(conn, instrument, granularity, start, end)]
+    if not chunks:
+        return pd.DataFrame(columns=CANDLE_COLUMNS)
+    return pd.concat(chunks, ignore_index=True)
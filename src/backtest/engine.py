@@ -0,0 +1,304 @@
+# src/backtest/engine.py
+"""
+Backtest engines over parse_candles-style frames.
+
+Both modes share one fill and cost model:
+    * a decision taken at the close of bar t fills at the open of bar
+      t+1, so a strategy never trades on a price it has not seen
+    * every fill pays half the spread plus slippage, in basis points of
+      the fill price
+    * equity is marked at each close
+
+run_vectorized takes a whole target-position signal at once (fraction
+of equity, negative for short) and is the one to use for sweeps.
+run_events calls a Strategy bar by bar and lets it size and place its
+own orders through a Broker.
+
+Usage:
+    result = run_vectorized(df, sma_crossover(df, 20, 50))
+    result = run_events(df, SmaCrossover(20, 50))
+    print(result['stats'])
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from config import BacktestConfig
+
+Bar = namedtuple('Bar', ['index', 'time', 'open', 'high', 'low', 'close',
+                         'volume'])
+
+
+def fill_cost(spread_bps=None, slippage_bps=None):
+    """Cost of one fill as a fraction of the traded notional."""
+    spread_bps = BacktestConfig.SPREAD_BPS if spread_bps is None \
+        else spread_bps
+    slippage_bps = BacktestConfig.SLIPPAGE_BPS if slippage_bps is None \
+        else slippage_bps
+    return (spread_bps / 2.0 + slippage_bps) * 1e-4
+
+
+def periods_per_year(times):
+    """Bars per year, measured from the span of the data."""
+    if len(times) < 2:
+        return np.nan
+    years = (times.iloc[-1] - times.iloc[0]) / pd.Timedelta(days=365.25)
+    return (len(times) - 1) / years if years > 0 else np.nan
+
+
+def performance(equity, bars_per_year):
+    """
+    Summary statistics of an equity curve.
+
+    Returns:
+    --------
+    dict
+        total_return, annual_return, volatility, sharpe and max_drawdown
+        (the last as a negative fraction)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    returns = equity[1:] / equity[:-1] - 1.0
+    total_return = equity[-1] / equity[0] - 1.0
+    years = len(returns) / np.float64(bars_per_year)
+
+    std = returns.std(ddof=1) if len(returns) > 1 else np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = returns.mean() / std * np.sqrt(bars_per_year)
+        annual_return = (1.0 + total_return) ** (1.0 / years) - 1.0 \
+            if total_return > -1.0 else -1.0
+    drawdown = equity / np.maximum.accumulate(equity) - 1.0
+
+    return {
+        'total_return': float(total_return),
+        'annual_return': float(annual_return),
+        'volatility': float(std * np.sqrt(bars_per_year)),
+        'sharpe': float(sharpe) if std > 0 else np.nan,
+        'max_drawdown': float(drawdown.min()),
+    }
+
+
+# ----------------------------------------------------------------------
+# Vectorized mode
+# ----------------------------------------------------------------------
+
+def simulate(open_, close, target, cost):
+    """
+    Equity growth of a target-position signal, as plain arrays.
+
+    target[t] is the fraction of equity wanted after the close of bar t
+    (NaN means flat). It is held from the open of bar t+1, so bar t
+    earns target[t-2] over the overnight gap from close[t-1] to open[t]
+    and target[t-1] from open[t] to close[t]. Exposure is rebalanced to
+    the target every bar without cost; only target changes pay `cost`.
+
+    Returns:
+    --------
+    tuple
+        (growth factor per bar, position held during each bar)
+    """
+    target = np.nan_to_num(np.asarray(target, dtype=np.float64))
+    held = np.concatenate(([0.0], target[:-1]))
+    before = np.concatenate(([0.0], held[:-1]))
+
+    gap = np.zeros(len(close))
+    gap[1:] = open_[1:] / close[:-1] - 1.0
+    intrabar = close / open_ - 1.0
+
+    growth = (1.0 + before * gap) * \
+        (1.0 - np.abs(held - before) * cost) * (1.0 + held * intrabar)
+    return growth, held
+
+
+def run_vectorized(df, signal, spread_bps=None, slippage_bps=None,
+                   initial_capital=None):
+    """
+    Backtest a target-position signal with array operations.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Candles with time, open and close, in time order
+    signal : array-like
+        Target fraction of equity per bar (1 = fully long, -1 = fully
+        short, 0 or NaN = flat), decided at that bar's close
+
+    Returns:
+    --------
+    dict
+        equity and position Series indexed by time, and stats
+        (performance() plus trades and exposure)
+    """
+    initial_capital = initial_capital or BacktestConfig.INITIAL_CAPITAL
+    growth, held = simulate(df['open'].to_numpy(dtype=np.float64),
+                            df['close'].to_numpy(dtype=np.float64),
+                            signal, fill_cost(spread_bps, slippage_bps))
+    equity = initial_capital * np.cumprod(growth)
+
+    stats = performance(equity, periods_per_year(df['time']))
+    stats['trades'] = int(np.count_nonzero(np.diff(held)))
+    stats['exposure'] = float(np.mean(held != 0))
+
+    index = pd.DatetimeIndex(df['time'])
+    return {
+        'equity': pd.Series(equity, index=index),
+        'position': pd.Series(held, index=index),
+        'stats': stats,
+    }
+
+
+# ----------------------------------------------------------------------
+# Event-driven mode
+# ----------------------------------------------------------------------
+
+class Strategy:
+    """
+    Base class for event-driven strategies.
+
+    on_start gets the whole frame once, so indicators can be computed
+    vectorized up front and read by bar.index in on_bar. Only values up
+    to bar.index may be used in on_bar.
+    """
+
+    def on_start(self, df, broker):
+        pass
+
+    def on_bar(self, bar, broker):
+        raise NotImplementedError
+
+
+class Broker:
+    """
+    Cash-and-units account filling market orders at the next open.
+
+    Orders placed during a bar are netted and filled at the following
+    bar's open; orders left after the last bar never fill.
+    """
+
+    def __init__(self, initial_capital=None, spread_bps=None,
+                 slippage_bps=None):
+        self.cash = initial_capital or BacktestConfig.INITIAL_CAPITAL
+        self.cost = fill_cost(spread_bps, slippage_bps)
+        self.units = 0.0
+        self.equity = self.cash
+        self.price = np.nan
+        self.trades = []  # (time, units, fill price, cost)
+        self._order = 0.0
+        self._target = None
+
+    # Orders --------------------------------------------------------------
+
+    def order(self, units):
+        """
+        Buy (positive) or sell (negative) units at the next open, on top
+        of any target order placed before it.
+        """
+        self._order += units
+
+    def order_target_units(self, units):
+        """
+        Trade to hold exactly `units` after the next open; replaces any
+        order placed earlier in the bar.
+        """
+        self._order = 0.0
+        self._target = ('units', units)
+
+    def order_target_percent(self, fraction):
+        """
+        Trade to hold `fraction` of equity (negative for short), sized
+        at the next open's price; replaces any order placed earlier in
+        the bar.
+        """
+        self._order = 0.0
+        self._target = ('percent', fraction)
+
+    # Position sizing -----------------------------------------------------
+
+    def risk_units(self, stop_distance, risk_fraction):
+        """
+        Units for which a move of `stop_distance` (in price) against
+        the position loses `risk_fraction` of current equity.
+        """
+        if stop_distance <= 0:
+            return 0.0
+        return self.equity * risk_fraction / stop_distance
+
+    @property
+    def position(self):
+        """Held exposure as a fraction of equity, at the last close."""
+        if self.equity <= 0 or self.price != self.price:
+            return 0.0
+        return self.units * self.price / self.equity
+
+    # Engine hooks --------------------------------------------------------
+
+    def _fill(self, time, price):
+        units = self._order
+        if self._target is not None:
+            kind, value = self._target
+            if kind == 'percent':
+                # Equity at the open, before costs
+                value = value * (self.cash + self.units * price) / price
+            units += value - self.units
+        self._order = 0.0
+        self._target = None
+        if units == 0:
+            return
+
+        fill_price = price * (1.0 + self.cost) if units > 0 \
+            else price * (1.0 - self.cost)
+        self.cash -= units * fill_price
+        self.units += units
+        self.trades.append((time, units, fill_price,
+                            abs(units) * price * self.cost))
+
+    def _mark(self, price):
+        self.price = price
+        self.equity = self.cash + self.units * price
+
+
+def run_events(df, strategy, spread_bps=None, slippage_bps=None,
+               initial_capital=None):
+    """
+    Backtest a Strategy one bar at a time.
+
+    For each bar: pending orders fill at its open, equity is marked at
+    its close, then strategy.on_bar sees the completed bar.
+
+    Returns:
+    --------
+    dict
+        equity and position Series indexed by time, trades as a
+        DataFrame (time, units, price, cost) and stats
+    """
+    broker = Broker(initial_capital, spread_bps, slippage_bps)
+    strategy.on_start(df, broker)
+
+    times = df['time']
+    columns = [df[name].to_numpy(dtype=np.float64)
+               for name in ('open', 'high', 'low', 'close', 'volume')]
+    equity = np.empty(len(df))
+    position = np.empty(len(df))
+
+    for i, (time, open_, high, low, close, volume) in enumerate(
+            zip(times, *columns)):
+        broker._fill(time, open_)
+        broker._mark(close)
+        equity[i] = broker.equity
+        position[i] = broker.position
+        strategy.on_bar(Bar(i, time, open_, high, low, close, volume),
+                        broker)
+
+    stats = performance(equity, periods_per_year(times))
+    stats['trades'] = len(broker.trades)
+    stats['exposure'] = float(np.mean(position != 0))
+
+    index = pd.DatetimeIndex(times)
+    return {
+        'equity': pd.Series(equity, index=index),
+        'position': pd.Series(position, index=index),
+        'trades': pd.DataFrame(broker.trades,
+                               columns=['time', 'units', 'price', 'cost']),
+        'stats': stats,
+    }
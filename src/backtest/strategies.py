@@ -0,0 +1,74 @@
+# src/backtest/strategies.py
+"""
+Example strategies: vectorized signal functions for run_vectorized and
+run_sweep, and their event-driven counterparts for run_events.
+
+Signal functions take the candle frame plus parameters and return the
+target fraction of equity per bar; they must be module-level functions
+so sweeps can send them to worker processes.
+"""
+
+import numpy as np
+
+from src.backtest.engine import Strategy
+from src.features import indicators
+
+
+def sma_crossover(df, fast, slow, allow_short=True):
+    """Long while SMA(fast) > SMA(slow), else short (or flat)."""
+    close = df['close'].to_numpy(dtype=np.float64)
+    fast_line = indicators.sma(close, fast)
+    slow_line = indicators.sma(close, slow)
+    signal = np.where(fast_line > slow_line, 1.0,
+                      -1.0 if allow_short else 0.0)
+    signal[np.isnan(slow_line) | np.isnan(fast_line)] = 0.0
+    return signal
+
+
+def rsi_reversion(df, window, lower, upper):
+    """
+    Long after RSI closes below `lower`, short after it closes above
+    `upper`, holding the position until the opposite signal.
+    """
+    value = indicators.rsi(df['close'].to_numpy(dtype=np.float64), window)
+    signal = np.full(len(value), np.nan)
+    signal[value < lower] = 1.0
+    signal[value > upper] = -1.0
+    signal[0] = 0.0 if np.isnan(signal[0]) else signal[0]
+    # Forward-fill the last entry signal
+    filled = np.where(~np.isnan(signal), np.arange(len(signal)), 0)
+    return signal[np.maximum.accumulate(filled)]
+
+
+class SmaCrossover(Strategy):
+    """
+    Event-driven SMA crossover with volatility-based sizing: each entry
+    risks `risk_fraction` of equity on a stop `atr_multiple` ATRs away,
+    capped at `max_leverage` times equity.
+    """
+
+    def __init__(self, fast, slow, risk_fraction=0.01, atr_multiple=2.0,
+                 max_leverage=1.0):
+        self.fast = fast
+        self.slow = slow
+        self.risk_fraction = risk_fraction
+        self.atr_multiple = atr_multiple
+        self.max_leverage = max_leverage
+
+    def on_start(self, df, broker):
+        close = df['close'].to_numpy(dtype=np.float64)
+        self.direction = np.sign(sma_crossover(df, self.fast, self.slow))
+        self.atr = indicators.atr(df['high'].to_numpy(dtype=np.float64),
+                                  df['low'].to_numpy(dtype=np.float64),
+                                  close)
+
+    def on_bar(self, bar, broker):
+        direction = self.direction[bar.index]
+        atr = self.atr[bar.index]
+        if direction == np.sign(broker.units) or atr != atr:
+            return
+
+        units = broker.risk_units(self.atr_multiple * atr,
+                                  self.risk_fraction)
+        units = min(units, self.max_leverage * broker.equity / bar.close)
+        broker.order_target_units(direction * units)
@@ -0,0 +1,119 @@
+# src/backtest/sweep.py
+"""
+Parameter sweeps of vectorized strategies on a process pool.
+
+The candles are handed to each worker once, through the pool
+initializer (inherited without pickling under fork); tasks carry only
+a chunk of parameter combinations and return only their stats.
+
+Usage:
+    grid = parameter_grid(fast=range(5, 50), slow=range(20, 200, 5),
+                          where=lambda p: p['fast'] < p['slow'])
+    results = run_sweep(df, sma_crossover, grid)
+    print(results.sort_values('sharpe').tail())
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from config import BacktestConfig
+from src.backtest.engine import fill_cost, performance, periods_per_year, \
+    simulate
+from src.utils.logger import setup_logger
+
+logger = setup_logger('Sweep')
+
+# Worker state, set once per process by _init_worker
+_frame = None
+_context = None
+
+
+def parameter_grid(where=None, **axes):
+    """
+    Every combination of the given parameter values, as dicts.
+
+    `where` optionally filters combinations, e.g. fast < slow.
+    """
+    names = list(axes)
+    grid = (dict(zip(names, values))
+            for values in itertools.product(*axes.values()))
+    return [params for params in grid if where is None or where(params)]
+
+
+def _init_worker(df, context):
+    global _frame, _context
+    _frame = df
+    _context = context
+
+
+def _evaluate(signal_func, params_list):
+    open_, close, cost, bars_per_year, initial_capital = _context
+    results = []
+    for params in params_list:
+        growth, held = simulate(open_, close, signal_func(_frame, **params),
+                                cost)
+        stats = performance(initial_capital * np.cumprod(growth),
+                            bars_per_year)
+        stats['trades'] = int(np.count_nonzero(np.diff(held)))
+        stats['exposure'] = float(np.mean(held != 0))
+        results.append({**params, **stats})
+    return results
+
+
+def run_sweep(df, signal_func, grid, spread_bps=None, slippage_bps=None,
+              initial_capital=None, max_workers=None, chunk_size=None):
+    """
+    Backtest signal_func(df, **params) for every params in `grid`.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Candles with time, open, high, low, close, volume
+    signal_func : callable
+        Module-level function returning a target-position signal, as in
+        src.backtest.strategies
+    grid : list of dict
+        Parameter combinations, e.g. from parameter_grid
+    max_workers : int, optional
+        Defaults to BacktestConfig.MAX_WORKERS, i.e. one per CPU; 1 runs
+        in this process
+    chunk_size : int, optional
+        Combinations per task, BacktestConfig.SWEEP_CHUNK_SIZE by default
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per combination: the parameters, then performance()
+        stats, trades and exposure
+    """
+    max_workers = max_workers or BacktestConfig.MAX_WORKERS or \
+        os.cpu_count()
+    chunk_size = chunk_size or BacktestConfig.SWEEP_CHUNK_SIZE
+    context = (df['open'].to_numpy(dtype=np.float64),
+               df['close'].to_numpy(dtype=np.float64),
+               fill_cost(spread_bps, slippage_bps),
+               periods_per_year(df['time']),
+               initial_capital or BacktestConfig.INITIAL_CAPITAL)
+    chunks = [grid[i:i + chunk_size] for i in range(0, len(grid), chunk_size)]
+
+    started = time.perf_counter()
+    if max_workers == 1:
+        _init_worker(df, context)
+        results = [_evaluate(signal_func, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker,
+                                 initargs=(df, context)) as pool:
+            results = list(pool.map(_evaluate,
+                                    itertools.repeat(signal_func), chunks))
+    elapsed = time.perf_counter() - started
+
+    bars = len(df) * len(grid)
+    logger.info("Swept %d combinations of %s over %d bars in %.2fs "
+                "(%.0f bars/s)", len(grid), signal_func.__name__, len(df),
+                elapsed, bars / elapsed if elapsed > 0 else 0)
+    return pd.DataFrame(itertools.chain.from_iterable(results))
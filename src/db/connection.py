@@ -0,0 +1,83 @@
+# src/db/connection.py
+
+import os
+import sqlite3
+
+from dotenv import load_dotenv
+
+from src.utils.timeframes import to_utc
+
+load_dotenv()
+
+SQLITE_PREFIX = 'sqlite:///'
+SQLITE_SCHEMA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
+        __file__)))), 'database', 'schema_sqlite.sql')
+
+
+def get_connection(db_url=None, check_same_thread=True):
+    """
+    Open a connection to DATABASE_URL (or `db_url`).
+
+    postgresql:// URLs connect through psycopg2. sqlite:///path URLs open
+    a SQLite file instead, which is handy as a local stand-in for tests.
+    SQLite connections are tied to the opening thread unless
+    check_same_thread=False (as for pooled connections, which are used
+    by one thread at a time but not always the same one).
+    """
+    db_url = db_url or os.getenv('DATABASE_URL')
+    if not db_url:
+        raise ValueError("DATABASE_URL not found in environment variables")
+
+    if db_url.startswith(SQLITE_PREFIX):
+        return sqlite3.connect(db_url[len(SQLITE_PREFIX):],
+                               check_same_thread=check_same_thread)
+
+    import psycopg2
+    return psycopg2.connect(db_url)
+
+
+def create_sqlite_schema(conn):
+    """
+    Create the tables of database/schema_sqlite.sql on a SQLite
+    connection, if they do not exist yet.
+    """
+    with open(SQLITE_SCHEMA_PATH) as f:
+        conn.executescript(f.read())
+
+
+def is_sqlite(conn):
+    return isinstance(conn, sqlite3.Connection)
+
+
+def has_column(conn, table, column):
+    """Whether `table` has `column`, e.g. before a migration has run."""
+    cursor = conn.cursor()
+    try:
+        if is_sqlite(conn):
+            cursor.execute(f"PRAGMA table_info({table})")
+            return any(row[1] == column for row in cursor.fetchall())
+        # to_regclass resolves the table through search_path, as the
+        # queries that use it will
+        cursor.execute("""
+            SELECT 1 FROM pg_attribute
+            WHERE attrelid = to_regclass(%s) AND attname = %s
+              AND NOT attisdropped
+        """, (table, column))
+        return cursor.fetchone() is not None
+    finally:
+        cursor.close()
+
+
+def placeholder(conn):
+    """Parameter marker for the connection's DB-API paramstyle."""
+    return '?' if is_sqlite(conn) else '%s'
+
+
+def to_db_time(conn, value):
+    # psycopg2 adapts datetimes natively; SQLite stores ISO-8601 text,
+    # which sorts correctly as long as every value is UTC
+    ts = to_utc(value)
+    if is_sqlite(conn):
+        return ts.isoformat()
+    return ts.to_pydatetime()
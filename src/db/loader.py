@@ -0,0 +1,235 @@
+# src/db/loader.py
+
+import io
+import struct
+
+import numpy as np
+import pandas as pd
+
+from config import DatabaseConfig
+from src.db.connection import is_sqlite, placeholder, to_db_time
+from src.utils.logger import setup_logger
+from src.utils.metrics import count, timed
+
+logger = setup_logger('Loader')
+
+CANDLE_COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume']
+
+UPSERT_SQL = """
+    INSERT INTO raw_market_data
+        (instrument, granularity, time, open, high, low, close, volume)
+    VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p})
+    ON CONFLICT (instrument, granularity, time) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume
+"""
+
+
+STAGING_TABLE = 'raw_market_data_staging'
+
+# Staging holds only fixed-width columns so batches can be sent in
+# PostgreSQL's binary COPY format straight from NumPy arrays. It lives
+# for the session (pooled connections reuse it) rather than ON COMMIT
+# DROP, which would drop it after each statement under autocommit.
+CREATE_STAGING_SQL = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+        time TIMESTAMP WITH TIME ZONE NOT NULL,
+        open DOUBLE PRECISION NOT NULL,
+        high DOUBLE PRECISION NOT NULL,
+        low DOUBLE PRECISION NOT NULL,
+        close DOUBLE PRECISION NOT NULL,
+        volume BIGINT NOT NULL
+    )
+"""
+
+MERGE_STAGING_SQL = """
+    INSERT INTO raw_market_data
+        (instrument, granularity, time, open, high, low, close, volume)
+    SELECT {p}, {p}, time, open, high, low, close, volume
+    FROM {staging}
+    ON CONFLICT (instrument, granularity, time) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume
+"""
+
+# Granularities split into monthly partitions by schema_partitioned.sql
+MONTHLY_PARTITIONED = ('M1', 'M5', 'M15', 'M30', 'H1', 'H4')
+
+IS_PARTITIONED_SQL = """
+    SELECT EXISTS (
+        SELECT 1 FROM pg_partitioned_table
+        WHERE partrelid = to_regclass('raw_market_data')
+    )
+"""
+
+ENSURE_PARTITIONS_SQL = """
+    SELECT ensure_market_data_partitions(%s, %s, ARRAY[%s])
+"""
+
+# Binary COPY framing: signature, flags, header extension, trailer
+PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('>ii', 0, 0)
+PGCOPY_TRAILER = struct.pack('>h', -1)
+
+# One tuple: field count, then (length, value) per column, big-endian
+PGCOPY_ROW = np.dtype([
+    ('fields', '>i2'),
+    ('time_len', '>i4'), ('time', '>i8'),
+    ('open_len', '>i4'), ('open', '>f8'),
+    ('high_len', '>i4'), ('high', '>f8'),
+    ('low_len', '>i4'), ('low', '>f8'),
+    ('close_len', '>i4'), ('close', '>f8'),
+    ('volume_len', '>i4'), ('volume', '>i8'),
+])
+
+# timestamptz is sent as microseconds since 2000-01-01 UTC
+PG_EPOCH_US = 946_684_800 * 1_000_000
+
+
+def _pgcopy_buffer(frame):
+    rows = np.empty(len(frame), dtype=PGCOPY_ROW)
+    rows['fields'] = 6
+    for name in ('time', 'open', 'high', 'low', 'close', 'volume'):
+        rows[f"{name}_len"] = 8
+
+    rows['time'] = frame['time'].dt.as_unit('us').astype('int64').to_numpy() \
+        - PG_EPOCH_US
+    for name in ('open', 'high', 'low', 'close', 'volume'):
+        rows[name] = frame[name].to_numpy()
+
+    return io.BytesIO(PGCOPY_HEADER + rows.tobytes() + PGCOPY_TRAILER)
+
+
+def _ensure_partitions(cursor, frame, granularity):
+    # Rows for a month without its partition would land in the DEFAULT
+    # partition, after which PostgreSQL refuses to create that month
+    if granularity not in MONTHLY_PARTITIONED or frame.empty:
+        return
+    cursor.execute(IS_PARTITIONED_SQL)
+    if not cursor.fetchone()[0]:
+        return
+
+    times = frame['time']
+    first = times.min().tz_convert('UTC')
+    last = times.max().tz_convert('UTC')
+    p_from = first.date().replace(day=1)
+    p_to = (last + pd.offsets.MonthBegin(1)).date().replace(day=1)
+    cursor.execute(ENSURE_PARTITIONS_SQL, (p_from, p_to, granularity))
+    created = cursor.fetchone()[0]
+    if created:
+        logger.info("Created %d %s partitions from %s to %s", created,
+                    granularity, p_from, p_to,
+                    extra={'granularity': granularity})
+
+
+def _candle_rows(conn, df, instrument, granularity):
+    for time, open_, high, low, close, volume in df[CANDLE_COLUMNS].itertuples(
+            index=False, name=None):
+        yield (instrument, granularity, to_db_time(conn, time),
+               float(open_), float(high), float(low), float(close),
+               int(volume))
+
+
+@timed('db_write_seconds', method='upsert')
+def upsert_candles(conn, df, instrument, granularity, batch_size=None):
+    """
+    Insert or update candles in raw_market_data.
+
+    Rows conflicting on the unique_candle constraint (instrument,
+    granularity, time) are updated in place, so re-loading a partially
+    formed candle refreshes it. The caller owns the transaction.
+
+    Returns:
+    --------
+    int
+        Number of rows written
+    """
+    batch_size = batch_size or DatabaseConfig.BATCH_SIZE
+    sql = UPSERT_SQL.format(p=placeholder(conn))
+
+    cursor = conn.cursor()
+    written = 0
+    batch = []
+    for row in _candle_rows(conn, df, instrument, granularity):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            cursor.executemany(sql, batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        cursor.executemany(sql, batch)
+        written += len(batch)
+    cursor.close()
+    count('db_rows_written_total', written, method='upsert')
+
+    logger.info("Upserted %d rows for %s (%s)", written, instrument,
+                granularity, extra={'instrument': instrument,
+                                    'granularity': granularity,
+                                    'rows': written})
+    return written
+
+
+@timed('db_write_seconds', method='copy')
+def copy_candles(conn, df, instrument, granularity, batch_size=None):
+    """
+    Bulk-load candles into raw_market_data through COPY (PostgreSQL only).
+
+    Rows are streamed in binary COPY batches of `batch_size`, encoded
+    straight from the DataFrame's arrays, into a temporary staging
+    table, then merged with a single INSERT ... ON CONFLICT against the
+    unique_candle constraint. Duplicate times within `df` keep the last
+    row, since one statement cannot update a row twice. The caller owns
+    the transaction; autocommit connections work too. The staging table
+    is emptied before and after each load.
+
+    On the partitioned schema (database/schema_partitioned.sql) the
+    monthly partitions covering `df` are created first.
+
+    Returns:
+    --------
+    int
+        Number of rows inserted or updated
+    """
+    batch_size = batch_size or DatabaseConfig.COPY_BATCH_SIZE
+    frame = df[CANDLE_COLUMNS].drop_duplicates('time', keep='last')
+
+    cursor = conn.cursor()
+    _ensure_partitions(cursor, frame, granularity)
+    cursor.execute(CREATE_STAGING_SQL)
+    cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+
+    for offset in range(0, len(frame), batch_size):
+        buffer = _pgcopy_buffer(frame.iloc[offset:offset + batch_size])
+        cursor.copy_expert(
+            f"COPY {STAGING_TABLE} FROM STDIN WITH (FORMAT binary)", buffer)
+
+    cursor.execute(MERGE_STAGING_SQL.format(p=placeholder(conn),
+                                            staging=STAGING_TABLE),
+                   (instrument, granularity))
+    written = cursor.rowcount
+    cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+    cursor.close()
+    count('db_rows_written_total', written, method='copy')
+
+    logger.info("Copied %d rows for %s (%s)", written, instrument,
+                granularity, extra={'instrument': instrument,
+                                    'granularity': granularity,
+                                    'rows': written})
+    return written
+
+
+def load_candles(conn, df, instrument, granularity, batch_size=None):
+    """
+    Load candles with the fastest path the connection supports.
+
+    PostgreSQL uses copy_candles; other backends (SQLite) fall back to
+    upsert_candles.
+    """
+    if is_sqlite(conn):
+        return upsert_candles(conn, df, instrument, granularity, batch_size)
+    return copy_candles(conn, df, instrument, granularity, batch_size)
@@ -0,0 +1,225 @@
+# src/db/pool.py
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from config import DatabaseConfig
+from src.db.connection import get_connection
+from src.utils.logger import setup_logger
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within POOL_TIMEOUT."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe database connection pool.
+
+    Keeps up to `pool_size` idle connections and opens up to
+    `max_overflow` extra ones under load, which are closed again when
+    returned. Checkouts block for at most `timeout` seconds. Connections
+    older than `recycle` seconds are replaced, and idle connections are
+    health-checked with a trivial query before being handed out.
+
+    Usage:
+        pool = ConnectionPool()
+        with pool.connection() as conn:
+            ...
+    """
+
+    def __init__(self, db_url=None, pool_size=None, max_overflow=None,
+                 timeout=None, recycle=None, pre_ping=True):
+        self.logger = setup_logger('ConnectionPool')
+        self.db_url = db_url
+        self.pool_size = pool_size or DatabaseConfig.POOL_SIZE
+        self.max_overflow = DatabaseConfig.MAX_OVERFLOW \
+            if max_overflow is None else max_overflow
+        self.timeout = timeout or DatabaseConfig.POOL_TIMEOUT
+        self.recycle = recycle or DatabaseConfig.POOL_RECYCLE
+        self.pre_ping = pre_ping
+
+        self._idle = deque()
+        self._created_at = {}
+        self._opened = 0
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._recycled = 0
+        self._failed_pings = 0
+
+    def _connect(self):
+        # Connections move between threads across checkouts
+        conn = get_connection(self.db_url, check_same_thread=False)
+        self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn):
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn):
+        if getattr(conn, 'closed', False):
+            return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _prepare(self, conn):
+        # Replace connections that have aged out or failed the ping
+        age = time.monotonic() - self._created_at.get(id(conn), 0.0)
+        if age > self.recycle:
+            self._recycled += 1
+            self._discard(conn)
+            return self._connect()
+
+        if self.pre_ping and not self._is_healthy(conn):
+            self._failed_pings += 1
+            self.logger.warning("⚠️  Stale connection replaced")
+            self._discard(conn)
+            return self._connect()
+
+        return conn
+
+    def getconn(self):
+        """
+        Check a connection out of the pool.
+
+        Raises:
+        -------
+        PoolTimeout
+            If the pool is exhausted for longer than `timeout` seconds
+        """
+        started = time.monotonic()
+        conn = None
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._opened < self.pool_size + self.max_overflow:
+                    self._opened += 1
+                    break
+
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"No connection available after {self.timeout}s "
+                        f"({self._in_use} in use)")
+                self._condition.wait(remaining)
+
+            self._in_use += 1
+
+        try:
+            conn = self._connect() if conn is None else self._prepare(conn)
+        except Exception:
+            with self._condition:
+                self._opened -= 1
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._condition:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return conn
+
+    def putconn(self, conn, discard=False):
+        """Return a connection; any open transaction is rolled back."""
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._condition:
+            self._in_use -= 1
+            if discard or len(self._idle) >= self.pool_size:
+                self._opened -= 1
+                self._discard(conn)
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of a with-block.
+
+        Commits when the block exits cleanly and rolls back otherwise.
+        """
+        conn = self.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                self.putconn(conn, discard=True)
+                raise
+            self.putconn(conn)
+            raise
+        else:
+            self.putconn(conn)
+
+    def stats(self):
+        """Snapshot of pool occupancy and checkout wait times."""
+        with self._condition:
+            return {
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'opened': self._opened,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'checkouts': self._checkouts,
+                'wait_mean': (self._wait_total / self._checkouts
+                              if self._checkouts else 0.0),
+                'wait_max': self._wait_max,
+                'timeouts': self._timeouts,
+                'recycled': self._recycled,
+                'failed_pings': self._failed_pings,
+            }
+
+    def closeall(self):
+        with self._condition:
+            while self._idle:
+                self._opened -= 1
+                self._discard(self._idle.pop())
+
+
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def get_pool(db_url=None):
+    """
+    Return the process-wide pool for `db_url` (DATABASE_URL by default),
+    creating it on first use.
+    """
+    db_url = db_url or os.getenv('DATABASE_URL')
+    with _pool_lock:
+        pool = _pools.get(db_url)
+        if pool is None:
+            pool = _pools[db_url] = ConnectionPool(db_url)
+        return pool
@@ -0,0 +1,107 @@
+# src/db/reader.py
+
+import uuid
+
+import pandas as pd
+
+from config import DatabaseConfig
+from src.db.connection import is_sqlite, placeholder, to_db_time
+
+READ_COLUMNS = ['instrument', 'granularity', 'time',
+                'open', 'high', 'low', 'close', 'volume']
+
+
+def _to_frame(rows, columns):
+    df = pd.DataFrame(rows, columns=columns)
+    df['time'] = pd.to_datetime(df['time'], utc=True)
+    # DECIMAL columns of the heap schema arrive as Decimal objects
+    for name in ('open', 'high', 'low', 'close'):
+        df[name] = df[name].astype('float64')
+    df['volume'] = df['volume'].astype('int64')
+    return df
+
+
+def iter_candles(conn, instrument=None, granularity=None, start=None,
+                 end=None, chunksize=None):
+    """
+    Stream raw_market_data as DataFrames of at most `chunksize` rows.
+
+    On PostgreSQL rows come through a named (server-side) cursor, so only
+    one chunk is ever held on the client. Rows are ordered by instrument,
+    granularity and time, ready for StreamingValidator.
+
+    Parameters:
+    -----------
+    instrument, granularity : str, optional
+    start, end : datetime-like, optional
+        Half-open time range [start, end)
+    chunksize : int, optional
+        Defaults to DatabaseConfig.COPY_BATCH_SIZE
+
+    Yields:
+    -------
+    pandas.DataFrame
+        Columns instrument, granularity, time (UTC), open, high, low,
+        close, volume
+    """
+    chunksize = chunksize or DatabaseConfig.COPY_BATCH_SIZE
+    p = placeholder(conn)
+
+    conditions, params = [], []
+    for column, value in (('instrument', instrument),
+                          ('granularity', granularity)):
+        if value is not None:
+            conditions.append(f"{column} = {p}")
+            params.append(value)
+    if start is not None:
+        conditions.append(f"time >= {p}")
+        params.append(to_db_time(conn, start))
+    if end is not None:
+        conditions.append(f"time < {p}")
+        params.append(to_db_time(conn, end))
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    sql = (f"SELECT {', '.join(READ_COLUMNS)} FROM raw_market_data {where} "
+           f"ORDER BY instrument, granularity, time")
+
+    if is_sqlite(conn):
+        cursor = conn.cursor()
+    else:
+        cursor = conn.cursor(name=f"iter_candles_{uuid.uuid4().hex[:8]}")
+        cursor.itersize = chunksize
+
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            if not rows:
+                break
+
+            yield _to_frame(rows, READ_COLUMNS)
+    finally:
+        cursor.close()
+
+
+def read_latest(conn, instrument, granularity, count):
+    """
+    The latest `count` candles of one series, oldest first.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Columns time (UTC), open, high, low, close, volume
+    """
+    p = placeholder(conn)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT {', '.join(READ_COLUMNS[2:])}
+            FROM raw_market_data
+            WHERE instrument = {p} AND granularity = {p}
+            ORDER BY time DESC
+            LIMIT {p}
+        """, (instrument, granularity, count))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    return _to_frame(rows[::-1], READ_COLUMNS[2:])
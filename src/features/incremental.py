@@ -0,0 +1,316 @@
+# src/features/incremental.py
+"""
+Incremental counterparts of src.features.indicators.
+
+Each indicator keeps O(window) state and folds in one candle per
+update() in O(1), returning its latest value; fed a series candle by
+candle it reproduces the vectorized functions (to floating-point
+rounding). Use these for live streams, and the vectorized functions for
+backfills.
+
+Usage:
+    state = IndicatorState()
+    state.warm_up(history_df)
+    for candle in new_candles:          # dicts or DataFrame rows
+        features = state.update(candle)
+"""
+
+import math
+from collections import deque
+
+import pandas as pd
+
+from config import FeatureConfig
+from src.utils.resampler import bucket_start
+from src.utils.timeframes import granularity_to_timedelta
+
+NAN = float('nan')
+
+
+class _RollingWindow:
+    # Last `window` values with running mean/M2 over the non-NaN ones;
+    # any NaN in the window makes the window statistics NaN, as in pandas
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.nan_count = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, value):
+        self.values.append(value)
+        self._add(value)
+        if len(self.values) > self.window:
+            self._remove(self.values.popleft())
+
+    def _add(self, value):
+        if value != value:
+            self.nan_count += 1
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def _remove(self, value):
+        if value != value:
+            self.nan_count -= 1
+            return
+        self.count -= 1
+        if self.count == 0:
+            self.mean = self.m2 = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (value - self.mean)
+
+    def ready(self):
+        return len(self.values) == self.window and self.nan_count == 0
+
+    def average(self):
+        return self.mean if self.ready() else NAN
+
+    def std(self, ddof):
+        if not self.ready() or self.count <= ddof:
+            return NAN
+        return math.sqrt(max(self.m2, 0.0) / (self.count - ddof))
+
+
+class _SeededEWM:
+    # Exponential average seeded with the mean of the first `window`
+    # non-NaN values; NaN inputs leave it unchanged
+
+    def __init__(self, alpha, window):
+        self.alpha = alpha
+        self.window = window
+        self.seed_values = []
+        self.value = NAN
+
+    def update(self, x):
+        if x != x:
+            return self.value
+        if self.seed_values is not None:
+            self.seed_values.append(x)
+            if len(self.seed_values) == self.window:
+                self.value = sum(self.seed_values) / self.window
+                self.seed_values = None
+            return self.value
+        self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class SMA:
+    def __init__(self, window=None):
+        self._window = _RollingWindow(window or FeatureConfig.SMA_WINDOW)
+
+    def update(self, value):
+        self._window.push(value)
+        return self._window.average()
+
+
+class EMA:
+    def __init__(self, window=None):
+        window = window or FeatureConfig.EMA_WINDOW
+        self._ewm = _SeededEWM(2.0 / (window + 1), window)
+
+    def update(self, value):
+        return self._ewm.update(value)
+
+
+class WMA:
+    """Weighted sum kept as WS' = WS - S + window * x, so O(1) per value."""
+
+    def __init__(self, window=None):
+        self.window = window or FeatureConfig.WMA_WINDOW
+        self.denominator = self.window * (self.window + 1) / 2
+        self.values = deque()
+        self.nan_count = 0
+        self.total = 0.0
+        self.weighted = 0.0
+
+    def update(self, value):
+        is_nan = value != value
+        x = 0.0 if is_nan else value
+        self.nan_count += is_nan
+
+        if len(self.values) < self.window:
+            # Filling up: the new value takes weight len + 1
+            self.weighted += (len(self.values) + 1) * x
+        else:
+            self.weighted += self.window * x - self.total
+            old = self.values.popleft()
+            self.nan_count -= old != old
+            self.total -= 0.0 if old != old else old
+        self.values.append(value)
+        self.total += x
+
+        if len(self.values) < self.window or self.nan_count:
+            return NAN
+        return self.weighted / self.denominator
+
+
+class RSI:
+    def __init__(self, window=None):
+        window = window or FeatureConfig.RSI_WINDOW
+        self._gain = _SeededEWM(1.0 / window, window)
+        self._loss = _SeededEWM(1.0 / window, window)
+        self.previous = NAN
+
+    def update(self, close):
+        delta = close - self.previous
+        self.previous = close
+        if delta != delta:
+            gain = loss = NAN
+        else:
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+
+        average_gain = self._gain.update(gain)
+        average_loss = self._loss.update(loss)
+        if average_gain != average_gain:
+            return NAN
+        if average_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + average_gain / average_loss)
+
+
+class ATR:
+    def __init__(self, window=None):
+        window = window or FeatureConfig.ATR_WINDOW
+        self._ewm = _SeededEWM(1.0 / window, window)
+        self.previous = NAN
+
+    def update(self, high, low, close):
+        # NaN terms are ignored, as np.fmax does
+        ranges = [r for r in (high - low, abs(high - self.previous),
+                              abs(low - self.previous)) if r == r]
+        self.previous = close
+        return self._ewm.update(max(ranges) if ranges else NAN)
+
+
+class Bollinger:
+    def __init__(self, window=None, num_std=None):
+        self.num_std = num_std or FeatureConfig.BOLLINGER_STD
+        self._window = _RollingWindow(window or FeatureConfig.BOLLINGER_WINDOW)
+
+    def update(self, close):
+        """Returns (middle, upper, lower)."""
+        self._window.push(close)
+        middle = self._window.average()
+        width = self.num_std * self._window.std(ddof=0)
+        return middle, middle + width, middle - width
+
+
+class MACD:
+    def __init__(self, fast=None, slow=None, signal=None):
+        fast = fast or FeatureConfig.MACD_FAST
+        slow = slow or FeatureConfig.MACD_SLOW
+        signal = signal or FeatureConfig.MACD_SIGNAL
+        self._fast = _SeededEWM(2.0 / (fast + 1), fast)
+        self._slow = _SeededEWM(2.0 / (slow + 1), slow)
+        self._signal = _SeededEWM(2.0 / (signal + 1), signal)
+
+    def update(self, close):
+        """Returns (macd, signal, histogram)."""
+        line = self._fast.update(close) - self._slow.update(close)
+        signal_line = self._signal.update(line)
+        return line, signal_line, line - signal_line
+
+
+class VWAP:
+    """Session VWAP; session bounds are recomputed only when a candle
+    falls outside the current one."""
+
+    def __init__(self, anchor=None):
+        self.anchor = FeatureConfig.VWAP_ANCHOR if anchor is None else anchor
+        self.session_start = None
+        self.session_end = None
+        self.weighted = 0.0
+        self.total = 0.0
+
+    def _in_session(self, time):
+        return self.session_start is not None and \
+            self.session_start <= time < self.session_end
+
+    def update(self, time, high, low, close, volume):
+        if self.anchor and not self._in_session(time):
+            self.session_start = bucket_start(time, self.anchor)
+            # One hour past the nominal length always lands in the next
+            # session, whatever DST or the month length does
+            self.session_end = bucket_start(
+                self.session_start + granularity_to_timedelta(self.anchor)
+                + pd.Timedelta(hours=1), self.anchor)
+            self.weighted = self.total = 0.0
+
+        typical = (high + low + close) / 3.0
+        if typical == typical:
+            self.weighted += typical * volume
+            self.total += volume
+        return self.weighted / self.total if self.total > 0 else NAN
+
+
+class Volatility:
+    def __init__(self, window=None, periods_per_year=None):
+        self._window = _RollingWindow(
+            window or FeatureConfig.VOLATILITY_WINDOW)
+        self.scale = math.sqrt(periods_per_year) if periods_per_year else 1.0
+        self.previous = NAN
+
+    def update(self, close):
+        value = math.log(close / self.previous) \
+            if close > 0 and self.previous > 0 else NAN
+        self.previous = close
+        self._window.push(value)
+        return self._window.std(ddof=1) * self.scale
+
+
+class IndicatorState:
+    """
+    Every indicator of compute_indicators, updated one candle at a time.
+
+    update() takes a mapping with time, high, low, close and volume
+    (a dict, or a DataFrame row) and returns a dict keyed like the
+    compute_indicators columns.
+    """
+
+    def __init__(self):
+        self.sma = SMA()
+        self.ema = EMA()
+        self.wma = WMA()
+        self.rsi = RSI()
+        self.atr = ATR()
+        self.bollinger = Bollinger()
+        self.macd = MACD()
+        self.vwap = VWAP()
+        self.volatility = Volatility()
+
+    def update(self, candle):
+        close = float(candle['close'])
+        high = float(candle['high'])
+        low = float(candle['low'])
+        middle, upper, lower = self.bollinger.update(close)
+        line, signal_line, histogram = self.macd.update(close)
+
+        return {
+            'time': candle['time'],
+            'sma': self.sma.update(close),
+            'ema': self.ema.update(close),
+            'wma': self.wma.update(close),
+            'rsi': self.rsi.update(close),
+            'atr': self.atr.update(high, low, close),
+            'bb_middle': middle,
+            'bb_upper': upper,
+            'bb_lower': lower,
+            'macd': line,
+            'macd_signal': signal_line,
+            'macd_hist': histogram,
+            'vwap': self.vwap.update(candle['time'], high, low, close,
+                                     float(candle['volume'])),
+            'volatility': self.volatility.update(close),
+        }
+
+    def warm_up(self, df):
+        """Feed historical candles (a DataFrame) without keeping output."""
+        for candle in df.to_dict('records'):
+            self.update(candle)
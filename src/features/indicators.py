@@ -0,0 +1,301 @@
+# src/features/indicators.py
+"""
+Vectorized technical indicators over parse_candles-style frames.
+
+Window-based indicators are NumPy/pandas array operations. The
+recursive ones (EMA, Wilder smoothing used by RSI and ATR) run through
+a compiled Numba kernel when numba is installed, and otherwise through
+pandas' ewm, which implements the same recursion in C.
+
+Conventions (shared with src.features.incremental, which reproduces
+these values one candle at a time):
+    * output is NaN until a window is full
+    * EMA and Wilder averages are seeded with the simple mean of their
+      first `window` values, as in TA-Lib
+    * NaN inputs are skipped by the recursive averages
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import FeatureConfig
+from src.utils.resampler import _bucket_keys
+
+try:
+    from numba import njit
+except ImportError:  # optional dependency
+    njit = None
+
+
+def _ewm_kernel(values, alpha, seed_index, seed):
+    # y[seed_index] = seed; y[t] = y[t-1] + alpha * (x[t] - y[t-1])
+    out = np.full(len(values), np.nan)
+    out[seed_index] = seed
+    previous = seed
+    for i in range(seed_index + 1, len(values)):
+        value = values[i]
+        if value == value:
+            previous += alpha * (value - previous)
+        out[i] = previous
+    return out
+
+
+if njit is not None:
+    _ewm_kernel = njit(cache=True)(_ewm_kernel)
+
+
+def _as_array(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _wrap(values, like):
+    # Keep the caller's index when given a Series
+    if isinstance(like, pd.Series):
+        return pd.Series(values, index=like.index)
+    return values
+
+
+def _seeded_ewm(values, alpha, window):
+    """
+    Exponential average seeded with the mean of the first `window`
+    non-NaN values; NaN before the seed.
+    """
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) < window:
+        return np.full(len(values), np.nan)
+
+    seed_index = valid[window - 1]
+    seed = values[valid[:window]].mean()
+    if njit is not None:
+        return _ewm_kernel(values, alpha, seed_index, seed)
+
+    # pandas fallback: the seed replaces the first `window` values, and
+    # ignore_na=True gives the same plain recursion over NaN gaps
+    seeded = values.copy()
+    seeded[:seed_index] = np.nan
+    seeded[seed_index] = seed
+    return pd.Series(seeded).ewm(alpha=alpha, adjust=False,
+                                 ignore_na=True).mean().to_numpy()
+
+
+# ----------------------------------------------------------------------
+# Moving averages
+# ----------------------------------------------------------------------
+
+def sma(values, window=None):
+    """Simple moving average."""
+    window = window or FeatureConfig.SMA_WINDOW
+    result = pd.Series(_as_array(values)).rolling(window).mean().to_numpy()
+    return _wrap(result, values)
+
+
+def ema(values, window=None):
+    """Exponential moving average, alpha = 2 / (window + 1)."""
+    window = window or FeatureConfig.EMA_WINDOW
+    result = _seeded_ewm(_as_array(values), 2.0 / (window + 1), window)
+    return _wrap(result, values)
+
+
+def wilder(values, window):
+    """Wilder's smoothing (RMA), alpha = 1 / window."""
+    return _wrap(_seeded_ewm(_as_array(values), 1.0 / window, window),
+                 values)
+
+
+def wma(values, window=None):
+    """Linearly weighted moving average, weights 1..window (newest)."""
+    window = window or FeatureConfig.WMA_WINDOW
+    array = _as_array(values)
+    result = np.full(len(array), np.nan)
+    if len(array) >= window:
+        weights = np.arange(1, window + 1, dtype=np.float64)
+        # One matrix-vector product over the strided window view
+        result[window - 1:] = sliding_window_view(array, window) @ \
+            (weights / weights.sum())
+    return _wrap(result, values)
+
+
+# ----------------------------------------------------------------------
+# Oscillators and bands
+# ----------------------------------------------------------------------
+
+def rsi(close, window=None):
+    """Relative Strength Index (Wilder), 0-100."""
+    window = window or FeatureConfig.RSI_WINDOW
+    array = _as_array(close)
+    delta = np.diff(array, prepend=np.nan)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    gains[np.isnan(delta)] = np.nan
+    losses[np.isnan(delta)] = np.nan
+
+    average_gain = _seeded_ewm(gains, 1.0 / window, window)
+    average_loss = _seeded_ewm(losses, 1.0 / window, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(average_loss == 0, 100.0,
+                          100.0 - 100.0 / (1.0 + average_gain / average_loss))
+    result[np.isnan(average_gain)] = np.nan
+    return _wrap(result, close)
+
+
+def true_range(high, low, close):
+    """max(high - low, |high - prev close|, |low - prev close|)."""
+    high, low = _as_array(high), _as_array(low)
+    previous = np.roll(_as_array(close), 1)
+    previous[0] = np.nan
+    # fmax ignores the NaN previous close on the first candle
+    return np.fmax(high - low, np.fmax(np.abs(high - previous),
+                                       np.abs(low - previous)))
+
+
+def atr(high, low, close, window=None):
+    """Average True Range (Wilder)."""
+    window = window or FeatureConfig.ATR_WINDOW
+    result = _seeded_ewm(true_range(high, low, close), 1.0 / window, window)
+    return _wrap(result, close)
+
+
+def bollinger(close, window=None, num_std=None):
+    """
+    Bollinger Bands.
+
+    Returns:
+    --------
+    tuple
+        (middle, upper, lower); the band uses the population standard
+        deviation of the window
+    """
+    window = window or FeatureConfig.BOLLINGER_WINDOW
+    num_std = num_std or FeatureConfig.BOLLINGER_STD
+    rolling = pd.Series(_as_array(close)).rolling(window)
+    middle = rolling.mean().to_numpy()
+    width = num_std * rolling.std(ddof=0).to_numpy()
+    return (_wrap(middle, close), _wrap(middle + width, close),
+            _wrap(middle - width, close))
+
+
+def macd(close, fast=None, slow=None, signal=None):
+    """
+    Moving Average Convergence Divergence.
+
+    Returns:
+    --------
+    tuple
+        (macd, signal, histogram); the signal EMA starts once the MACD
+        line has `signal` values
+    """
+    fast = fast or FeatureConfig.MACD_FAST
+    slow = slow or FeatureConfig.MACD_SLOW
+    signal = signal or FeatureConfig.MACD_SIGNAL
+    array = _as_array(close)
+    line = _seeded_ewm(array, 2.0 / (fast + 1), fast) - \
+        _seeded_ewm(array, 2.0 / (slow + 1), slow)
+    signal_line = _seeded_ewm(line, 2.0 / (signal + 1), signal)
+    return (_wrap(line, close), _wrap(signal_line, close),
+            _wrap(line - signal_line, close))
+
+
+def vwap(df, anchor=None):
+    """
+    Volume-weighted average of the typical price (high + low + close) / 3.
+
+    Candles with a NaN price are left out.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Candles with time, high, low, close, volume
+    anchor : str, optional
+        Granularity whose candles delimit sessions ('D' resets at each
+        OANDA trading day, 17:00 New York). Defaults to
+        FeatureConfig.VWAP_ANCHOR; pass False for a single running VWAP.
+    """
+    anchor = FeatureConfig.VWAP_ANCHOR if anchor is None else anchor
+    typical = (_as_array(df['high']) + _as_array(df['low']) +
+               _as_array(df['close'])) / 3.0
+    volume = _as_array(df['volume'])
+    # Candles with a NaN price carry no weight rather than poisoning
+    # every later cumulative sum
+    missing = np.isnan(typical)
+    typical[missing] = 0.0
+    volume = np.where(missing, 0.0, volume)
+
+    weighted = np.cumsum(typical * volume)
+    total = np.cumsum(volume)
+    if anchor and len(df):
+        # Subtract the running totals as they stood at each session start
+        keys = _bucket_keys(df['time'], anchor)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+        lengths = np.diff(np.append(starts, len(df)))
+        weighted_before = np.repeat(
+            np.concatenate(([0.0], weighted))[starts], lengths)
+        total_before = np.repeat(np.concatenate(([0.0], total))[starts],
+                                 lengths)
+        weighted = weighted - weighted_before
+        total = total - total_before
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(total > 0, weighted / total, np.nan)
+    return pd.Series(result, index=df.index)
+
+
+def volatility(close, window=None, periods_per_year=None):
+    """
+    Rolling standard deviation of log returns.
+
+    periods_per_year annualises it, e.g. 252 for daily candles.
+    """
+    window = window or FeatureConfig.VOLATILITY_WINDOW
+    returns = np.diff(np.log(_as_array(close)), prepend=np.nan)
+    result = pd.Series(returns).rolling(window).std().to_numpy()
+    if periods_per_year:
+        result = result * np.sqrt(periods_per_year)
+    return _wrap(result, close)
+
+
+# ----------------------------------------------------------------------
+# Feature frame
+# ----------------------------------------------------------------------
+
+# Columns of compute_indicators after time, in order
+FEATURE_COLUMNS = [
+    'sma', 'ema', 'wma', 'rsi', 'atr', 'bb_middle', 'bb_upper', 'bb_lower',
+    'macd', 'macd_signal', 'macd_hist', 'vwap', 'volatility',
+]
+
+
+def compute_indicators(df):
+    """
+    Every indicator with the FeatureConfig defaults, as new columns.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        parse_candles output for one series, in time order
+
+    Returns:
+    --------
+    pandas.DataFrame
+        time plus FEATURE_COLUMNS
+    """
+    close = df['close']
+    middle, upper, lower = bollinger(close)
+    line, signal_line, histogram = macd(close)
+
+    return pd.DataFrame({
+        'time': df['time'],
+        'sma': sma(close),
+        'ema': ema(close),
+        'wma': wma(close),
+        'rsi': rsi(close),
+        'atr': atr(df['high'], df['low'], close),
+        'bb_middle': middle,
+        'bb_upper': upper,
+        'bb_lower': lower,
+        'macd': line,
+        'macd_signal': signal_line,
+        'macd_hist': histogram,
+        'vwap': vwap(df),
+        'volatility': volatility(close),
+    }, index=df.index)
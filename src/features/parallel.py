@@ -0,0 +1,325 @@
+# src/features/parallel.py
+"""
+Parallel feature computation across (instrument, granularity) series.
+
+Each series is one task on a ProcessPoolExecutor. Candles are never
+pickled across the process boundary: a series already in the
+BinaryCandleCache is memory-mapped by the worker straight from its
+file, and any other series is copied once into a SharedMemory block of
+CANDLE_RECORD rows. Workers append the indicators to the FeatureStore
+themselves (each append writes its own part files) and send back only
+their timings. A `sink` that has to run in the parent, such as a
+database writer, gets the indicators through a second shared block
+instead.
+
+Tasks share nothing, so throughput grows with the number of cores until
+memory bandwidth, the disk or a parent-side sink saturates;
+benchmarks/bench_features.py measures the scaling on a given machine.
+
+Usage:
+    results = compute_features_parallel(
+        [('EUR_USD', 'H1'), ('USD_JPY', 'H4')], cache=BinaryCandleCache())
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from config import FeatureConfig
+from src.features import indicators
+from src.features.indicators import FEATURE_COLUMNS, compute_indicators
+from src.storage.binary_cache import (CANDLE_RECORD, HEADER_SIZE,
+                                      frame_to_records, records_to_frame)
+from src.utils.logger import setup_logger
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # optional dependency
+    threadpool_limits = None
+
+logger = setup_logger('ParallelFeatures')
+
+
+def _init_worker():
+    # One BLAS thread per process, so N workers use N cores rather than
+    # oversubscribing them
+    if threadpool_limits is not None:
+        threadpool_limits(1)
+    # Compile the numba kernels here rather than inside the first task
+    indicators.ema(np.linspace(1.0, 2.0, 64), 8)
+
+
+def _compute_task(source, rows, output_name=None, feature_store=None,
+                  key=None):
+    """
+    Worker: compute the indicators of one series, append them to
+    `feature_store` and/or copy them into shared memory.
+
+    Parameters:
+    -----------
+    source : tuple
+        ('file', path) for a BinaryCandleCache file or ('shm', name)
+        for a SharedMemory block; either holds `rows` CANDLE_RECORDs
+    output_name : str, optional
+        SharedMemory block of len(FEATURE_COLUMNS) x rows float64
+    feature_store : FeatureStore, optional
+    key : tuple
+        (instrument, granularity) to store the features under
+
+    Returns:
+    --------
+    dict
+        pid, load_seconds, compute_seconds, store_seconds
+    """
+    started = time.perf_counter()
+    kind, location = source
+    if kind == 'file':
+        records = np.memmap(location, dtype=CANDLE_RECORD, mode='r',
+                            offset=HEADER_SIZE, shape=(rows,))
+        df = records_to_frame(records)
+    else:
+        block = shared_memory.SharedMemory(name=location)
+        try:
+            # One memcpy out of the block, so no view outlives close()
+            records = np.array(np.ndarray(rows, dtype=CANDLE_RECORD,
+                                          buffer=block.buf))
+            df = records_to_frame(records)
+        finally:
+            block.close()
+    loaded = time.perf_counter()
+
+    features = compute_indicators(df)
+    computed = time.perf_counter()
+    if feature_store is not None:
+        feature_store.append(features, *key)
+    stored = time.perf_counter()
+
+    if output_name is not None:
+        output = shared_memory.SharedMemory(name=output_name)
+        try:
+            out = np.ndarray((len(FEATURE_COLUMNS), rows), dtype=np.float64,
+                             buffer=output.buf)
+            for i, name in enumerate(FEATURE_COLUMNS):
+                out[i] = features[name].to_numpy()
+            del out
+        finally:
+            output.close()
+
+    return {
+        'pid': os.getpid(),
+        'load_seconds': loaded - started,
+        'compute_seconds': computed - loaded,
+        'store_seconds': stored - computed,
+    }
+
+
+def _release(*blocks):
+    for block in blocks:
+        if block is not None:
+            block.close()
+            block.unlink()
+
+
+class _Task:
+    # Parent-side state of one submitted series
+
+    def __init__(self, instrument, granularity):
+        self.instrument = instrument
+        self.granularity = granularity
+        self.times = None
+        self.source = None
+        self.input = None
+        self.output = None
+        self.result = {
+            'instrument': instrument,
+            'granularity': granularity,
+            'status': 'FAILED',
+            'rows': 0,
+            'error': None,
+            'pid': None,
+            'load_seconds': 0.0,
+            'compute_seconds': 0.0,
+            'store_seconds': 0.0,
+            'sink_seconds': 0.0,
+        }
+
+    def prepare(self, cache, store, frames, output):
+        """
+        Locate the candles, and with `output` allocate the block the
+        worker copies the indicators into; returns False if the series
+        is empty.
+        """
+        key = (self.instrument, self.granularity)
+        if frames is not None and key in frames:
+            records = frame_to_records(frames[key])
+        else:
+            records = np.empty(0, dtype=CANDLE_RECORD)
+            if cache is not None:
+                records = cache.load(*key)
+            if len(records):
+                self.source = ('file', cache.path(*key))
+            elif store is not None:
+                records = frame_to_records(store.read(*key))
+
+        rows = len(records)
+        if rows == 0:
+            return False
+        self.result['rows'] = rows
+
+        if self.source is None:
+            self.input = shared_memory.SharedMemory(create=True,
+                                                    size=records.nbytes)
+            np.ndarray(rows, dtype=CANDLE_RECORD,
+                       buffer=self.input.buf)[:] = records
+            self.source = ('shm', self.input.name)
+        if output:
+            self.times = pd.to_datetime(np.array(records['time']), utc=True)
+            self.output = shared_memory.SharedMemory(
+                create=True, size=len(FEATURE_COLUMNS) * rows * 8)
+        return True
+
+    def collect(self):
+        """Copy the worker's output into a DataFrame."""
+        rows = self.result['rows']
+        out = np.ndarray((len(FEATURE_COLUMNS), rows), dtype=np.float64,
+                         buffer=self.output.buf)
+        # out.T is Fortran-ordered, pandas' own block layout
+        features = pd.DataFrame(out.T, columns=FEATURE_COLUMNS, copy=True)
+        del out
+        features.insert(0, 'time', self.times)
+        return features
+
+    def release(self):
+        _release(self.input, self.output)
+        self.input = self.output = None
+
+
+def compute_features_parallel(series, cache=None, store=None, frames=None,
+                              sink=None, feature_store=None,
+                              max_workers=None):
+    """
+    Compute compute_indicators for many series on a process pool.
+
+    Candles for each series come from `frames` if it has the series,
+    else from `cache` (memory-mapped in the worker), else from `store`.
+
+    Parameters:
+    -----------
+    series : iterable of (instrument, granularity)
+    cache : BinaryCandleCache, optional
+    store : CandleStore, optional
+    frames : dict, optional
+        (instrument, granularity) -> parse_candles DataFrame
+    sink : callable, optional
+        sink(features, instrument, granularity), called in the parent
+        for each finished series, e.g. a database writer. It runs
+        serially, so it bounds the scaling.
+    feature_store : FeatureStore, optional
+        Appended to by the workers themselves; defaults to
+        FeatureStore() when no sink is given
+    max_workers : int, optional
+        Defaults to FeatureConfig.MAX_WORKERS, i.e. one per CPU
+
+    Returns:
+    --------
+    list of dict
+        Per series: instrument, granularity, status, rows, error, pid
+        and load/compute/store/sink seconds, in submission order
+    """
+    if sink is None and feature_store is None:
+        from src.storage.feature_store import FeatureStore
+        feature_store = FeatureStore()
+    max_workers = max_workers or FeatureConfig.MAX_WORKERS or os.cpu_count()
+
+    tasks = [_Task(instrument, granularity)
+             for instrument, granularity in series]
+    queue = iter(tasks)
+    # Bound the shared memory in use to a couple of tasks per worker
+    max_pending = 2 * max_workers
+    pending = {}
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers, initializer=_init_worker) as pool:
+        try:
+            while True:
+                for task in queue:
+                    try:
+                        if not task.prepare(cache, store, frames,
+                                            output=sink is not None):
+                            task.result['error'] = "No candles"
+                            continue
+                    except Exception as e:
+                        task.release()
+                        task.result['error'] = str(e)
+                        logger.error("❌ Could not load %s (%s): %s",
+                                     task.instrument, task.granularity, e)
+                        continue
+                    try:
+                        future = pool.submit(
+                            _compute_task, task.source, task.result['rows'],
+                            task.output and task.output.name, feature_store,
+                            (task.instrument, task.granularity))
+                    except Exception as e:
+                        # Not in pending yet, so the finally below
+                        # would not free its shared memory
+                        task.release()
+                        task.result['error'] = str(e)
+                        raise
+                    pending[future] = task
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _finish(pending.pop(future), future, sink)
+        finally:
+            for task in pending.values():
+                task.release()
+
+    _log_summary(tasks, time.perf_counter() - started, max_workers)
+    return [task.result for task in tasks]
+
+
+def _finish(task, future, sink):
+    result = task.result
+    try:
+        result.update(future.result())
+        if sink is not None:
+            features = task.collect()
+            task.release()
+
+            sunk = time.perf_counter()
+            sink(features, task.instrument, task.granularity)
+            result['sink_seconds'] = time.perf_counter() - sunk
+        result['status'] = 'SUCCESS'
+        logger.info(
+            "✅ Features for %s (%s): %d rows, compute %.3fs in pid %s",
+            task.instrument, task.granularity, result['rows'],
+            result['compute_seconds'], result['pid'])
+
+    except Exception as e:
+        result['error'] = str(e)
+        logger.error("❌ Features failed for %s (%s): %s", task.instrument,
+                     task.granularity, e)
+    finally:
+        task.release()
+
+
+def _log_summary(tasks, elapsed, max_workers):
+    results = [task.result for task in tasks]
+    succeeded = [r for r in results if r['status'] == 'SUCCESS']
+    busy = sum(r['load_seconds'] + r['compute_seconds'] + r['store_seconds']
+               for r in succeeded)
+    # Busy worker time over wall time: max_workers means every worker
+    # was computing for the whole run
+    parallelism = busy / elapsed if elapsed > 0 else 0.0
+    logger.info(
+        "Computed features for %d/%d series, %d rows in %.2fs "
+        "(%.1f/%d workers busy)", len(succeeded), len(results),
+        sum(r['rows'] for r in succeeded), elapsed, parallelism, max_workers)
@@ -1,20 +1,36 @@
 # src/oanda_api.py
 
 import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
 import requests
 import pandas as pd
 from dotenv import load_dotenv
-from datetime import datetime
+from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
 
+from config import APIConfig
 from src.utils.logger import setup_logger
+from src.utils.metrics import count, observe, timed
 from src.utils.parsers import parse_candles
+from src.utils.timeframes import split_range, to_utc
 
 load_dotenv()
 
 
+def _format_time(value):
+    # OANDA expects RFC3339; naive timestamps are taken to be UTC
+    return to_utc(value).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
 class OandaAPI:
 
-    def __init__(self):
+    def __init__(self, pool_size=None, cache=None):
         self.logger = setup_logger('OandaAPI')
         self.logger.info('API initialisation...')
 
@@ -31,6 +47,29 @@ class OandaAPI:
         # Validate credentials on initialization
         self._validate_credentials()
 
+        # Streaming endpoints live on a separate host (stream-fxpractice
+        # / stream-fxtrade) unless OANDA_STREAM_URL says otherwise
+        self.stream_url = os.getenv('OANDA_STREAM_URL') or \
+            self.base_url.replace('://api-', '://stream-', 1)
+
+        # One pooled session so repeated calls reuse warm keep-alive
+        # connections instead of paying a TCP+TLS handshake each time
+        self.pool_size = pool_size or APIConfig.POOL_MAXSIZE
+        self.session = self._create_session()
+
+        # Per-request latency/retry records (oldest evicted first)
+        self.request_stats = deque(maxlen=1000)
+        self.total_requests = 0
+        self.total_retries = 0
+        self._stats_lock = threading.Lock()
+
+        # Optional on-disk ResponseCache for get_candles (True = default
+        # location and limits)
+        if cache is True:
+            from src.storage.response_cache import ResponseCache
+            cache = ResponseCache()
+        self.cache = cache
+
     def _validate_credentials(self):
         if not self.api_token:
             raise ValueError(
@@ -44,10 +83,156 @@ class OandaAPI:
 
         self.logger.info("Credentials validated successfully")
 
-    def get_candles(self, instrument, granularity='H1', count=100):
+    def _create_session(self):
+        session = requests.Session()
+        session.headers.update(self.headers)
+
+        # Retries are handled in _request so we can honour Retry-After
+        # and record them, so the adapter itself never retries
+        adapter = HTTPAdapter(pool_connections=APIConfig.POOL_CONNECTIONS,
+                              pool_maxsize=self.pool_size,
+                              max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self):
+        self.session.close()
+
+    def price_stream(self, instruments, **kwargs):
+        """
+        Open a PriceStream over this account's pricing stream.
+
+        Usage:
+            async with api.price_stream(['EUR_USD', 'USD_JPY']) as stream:
+                async for tick in stream:
+                    ...
+        """
+        from src.oanda_stream import PriceStream
+        return PriceStream(self, instruments, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _backoff_delay(self, attempt):
+        # Exponential backoff plus up to BACKOFF_FACTOR of additive jitter,
+        # so clients that failed together do not retry in lockstep
+        delay = APIConfig.BACKOFF_FACTOR * (2 ** attempt)
+        delay += random.uniform(0, APIConfig.BACKOFF_FACTOR)
+        return min(delay, APIConfig.BACKOFF_MAX)
+
+    def _retry_after(self, response):
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+
+        return min(max(delay, 0.0), APIConfig.BACKOFF_MAX)
+
+    def _record_request(self, url, status_code, latency, retries):
+        observe('oanda_request_seconds', latency,
+                status=status_code or 'error')
+        if retries:
+            count('oanda_retries_total', retries)
+        with self._stats_lock:
+            self.total_requests += 1
+            self.total_retries += retries
+            self.request_stats.append({
+                'url': url,
+                'status_code': status_code,
+                'latency': latency,
+                'retries': retries,
+            })
+
+    def _request(self, url, params=None):
+        """
+        GET a URL through the pooled session.
+
+        Retries on connection errors and on APIConfig.RETRY_STATUS_CODES
+        up to APIConfig.MAX_RETRIES times with exponential backoff and
+        jitter, honouring Retry-After when the server sends it. The last
+        response is returned even if it is still an error status.
+        """
+        retries = 0
+        start = time.perf_counter()
+
+        while True:
+            try:
+                response = self.session.get(url, params=params,
+                                            timeout=APIConfig.TIMEOUT)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if retries >= APIConfig.MAX_RETRIES:
+                    self._record_request(url, None,
+                                         time.perf_counter() - start, retries)
+                    raise
+                delay = self._backoff_delay(retries)
+                reason = str(e)
+            else:
+                if (response.status_code not in APIConfig.RETRY_STATUS_CODES
+                        or retries >= APIConfig.MAX_RETRIES):
+                    self._record_request(url, response.status_code,
+                                         time.perf_counter() - start, retries)
+                    return response
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff_delay(retries)
+                reason = f"HTTP {response.status_code}"
+
+            retries += 1
+            self.logger.warning(
+                "⚠️  %s - retry %d/%d in %.2fs", reason, retries,
+                APIConfig.MAX_RETRIES, delay,
+                extra={'url': url, 'retry': retries, 'delay': delay})
+            time.sleep(delay)
+
+    def get_request_stats(self):
+        """
+        Summarise latency and retries of the recorded requests.
+
+        Returns:
+        --------
+        dict
+            total_requests, total_retries and latency percentiles (seconds)
+            over the most recent requests
+        """
+        with self._stats_lock:
+            latencies = [r['latency'] for r in self.request_stats]
+            summary = {
+                'total_requests': self.total_requests,
+                'total_retries': self.total_retries,
+            }
+
+        if latencies:
+            series = pd.Series(latencies)
+            summary.update({
+                'latency_mean': float(series.mean()),
+                'latency_p50': float(series.quantile(0.5)),
+                'latency_p95': float(series.quantile(0.95)),
+                'latency_max': float(series.max()),
+            })
+        return summary
+
+    @timed('get_candles_seconds')
+    def get_candles(self, instrument, granularity='H1', count=100,
+                    start=None, end=None, include_complete=False):
         """
         Retrieve historical candlestick data for a given instrument.
 
+        With a ResponseCache, a fresh cached response is served without
+        a network call; a stale one has only its incomplete trailing
+        candles fetched again.
+
         Parameters:
         -----------
         instrument : str
@@ -55,7 +240,13 @@ class OandaAPI:
         granularity : str
             Timeframe (e.g., 'H1' = 1 hour, 'H4' = 4 hours, 'D' = daily)
         count : int
-            Number of candles to retrieve (max 5000)
+            Number of candles to retrieve (max 5000). Ignored when both
+            start and end are given.
+        start, end : datetime-like, optional
+            Sent as OANDA's 'from'/'to' parameters; a candle opening
+            exactly at `end` is included
+        include_complete : bool
+            Keep OANDA's per-candle 'complete' flag as a column
 
         Returns:
         --------
@@ -63,35 +254,231 @@ class OandaAPI:
             DataFrame with columns: time, open, high, low, close, volume
         """
         try:
-            # Construct API endpoint
-            url = f"{self.base_url}/v3/instruments/{instrument}/candles"
+            if self.cache is None:
+                df = self._fetch_candles(instrument, granularity, count,
+                                         start, end)
+            else:
+                df = self._cached_candles(instrument, granularity, count,
+                                          start, end)
+            if df is None or include_complete:
+                return df
+            return df.drop(columns='complete')
 
-            # Set query parameters
-            params = {
-                'granularity': granularity,
-                'count': count
-            }
+        except Exception as e:
+            self.logger.error("❌ Error fetching candles: %s", e,
+                              extra={'instrument': instrument,
+                                     'granularity': granularity})
+            return None
 
-            self.logger.info(
-                f"Fetching {count} candles for {instrument} ({granularity})")
+    def get_candles_payload(self, instrument, granularity='H1', count=100,
+                            start=None, end=None):
+        """
+        One /candles request, returned unparsed (parse_candles turns it
+        into a DataFrame). Takes the same arguments as get_candles.
 
-            # Make API request
-            response = requests.get(url, headers=self.headers, params=params)
+        Returns:
+        --------
+        list of dict
+            OANDA's 'candles' list
+
+        Raises:
+        -------
+        RuntimeError
+            If the request still fails after retries
+        """
+        url = f"{self.base_url}/v3/instruments/{instrument}/candles"
+
+        # Set query parameters
+        params = {'granularity': granularity}
+        if start is not None:
+            params['from'] = _format_time(start)
+        if end is not None:
+            params['to'] = _format_time(end)
+        if start is None or end is None:
+            params['count'] = count
+
+        self.logger.info("Fetching %s candles for %s (%s)",
+                         params.get('count', 'range of'), instrument,
+                         granularity)
+
+        # Make API request over the pooled session
+        response = self._request(url, params=params)
+
+        # Check if request was successful
+        if response.status_code != 200:
+            self.logger.error("❌ Failed to fetch data: %d",
+                              response.status_code,
+                              extra={'instrument': instrument,
+                                     'granularity': granularity,
+                                     'status': response.status_code})
+            raise RuntimeError(f"HTTP {response.status_code} fetching "
+                               f"{instrument} ({granularity})")
+        return response.json()['candles']
+
+    def _fetch_candles(self, instrument, granularity, count, start, end):
+        # One /candles request, parsed with the complete flag; None on
+        # an error status
+        try:
+            candles = self.get_candles_payload(instrument, granularity, count,
+                                               start, end)
+        except RuntimeError:
+            return None
+
+        df = parse_candles(candles, include_complete=True)
+        self.logger.info("✅ Successfully retrieved %d candles", len(df),
+                         extra={'instrument': instrument,
+                                'granularity': granularity,
+                                'rows': len(df)})
+        return df
 
-            # Check if request was successful
-            if response.status_code == 200:
-                data = response.json()
-                candles = data['candles']
+    def _cached_candles(self, instrument, granularity, count, start, end):
+        from src.storage.response_cache import is_final, request_key
 
-                # Convert to DataFrame
-                df = parse_candles(candles)
-                self.logger.info(f"✅ Successfully retrieved {len(df)} candles")
+        key = request_key(instrument, granularity, count, start, end)
+        entry = self.cache.get(key)
+        if entry is not None:
+            df, fresh = entry
+            if fresh or self.cache.offline:
                 return df
-            else:
-                self.logger.error(
-                    f"❌ Failed to fetch data: {response.status_code}")
-                return None
+            df = self._refresh_tail(df, instrument, granularity, count,
+                                    start, end)
+        elif self.cache.offline:
+            self.logger.error("❌ Offline and not cached: %s (%s)",
+                              instrument, granularity)
+            return None
+        else:
+            df = self._fetch_candles(instrument, granularity, count, start,
+                                     end)
+
+        if df is not None:
+            self.cache.put(key, df, is_final(df, granularity, count, start,
+                                             end))
+        return df
+
+    def _refresh_tail(self, df, instrument, granularity, count, start, end):
+        # Complete candles never change: for a request anchored at
+        # `start`, re-fetch only from the first incomplete candle on.
+        # "Latest count" requests shift with time and are fetched whole.
+        incomplete = ~df['complete'].to_numpy()
+        if start is None or not incomplete.any() or incomplete.all():
+            fresh = self._fetch_candles(instrument, granularity, count,
+                                        start, end)
+        else:
+            first = incomplete.argmax()
+            tail_start = df['time'].iat[first]
+            # OANDA ignores count when both ends are given (count may
+            # well be None then)
+            tail_count = count - first if end is None else None
+            tail = self._fetch_candles(instrument, granularity,
+                                       tail_count, tail_start, end)
+            fresh = None if tail is None else pd.concat(
+                [df.iloc[:first], tail[tail['time'] >= tail_start]],
+                ignore_index=True)
+
+        if fresh is None:
+            self.logger.warning(
+                "⚠️  Refresh failed, serving stale cached candles for %s (%s)",
+                instrument, granularity)
+            return df
+        return fresh
+
+    def iter_candles_range(self, instrument, granularity, start, end=None,
+                           include_complete=False):
+        """
+        Yield candles for [start, end) as one DataFrame per page.
+
+        The range is split into pages of at most 5000 candles aligned to
+        the granularity, no two sharing a candle (see split_range). Up
+        to `pool_size` pages are fetched in parallel, but pages are
+        yielded in time order and only that many are held in memory at
+        once. Candles at or before the last one yielded are still
+        dropped, should a page come back with more than it asked for.
+
+        Raises:
+        -------
+        RuntimeError
+            If a page cannot be fetched
+        """
+        end = min(to_utc(end), pd.Timestamp.now(tz='UTC')) \
+            if end is not None else pd.Timestamp.now(tz='UTC')
+        pages = split_range(granularity, start, end)
+
+        self.logger.info("Fetching %s (%s) up to %s in %d page(s)",
+                         instrument, granularity, end, len(pages))
+
+        last_time = None
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            in_flight = deque()
+            pages = iter(pages)
+
+            def submit_next():
+                page = next(pages, None)
+                if page is not None:
+                    in_flight.append((page, executor.submit(
+                        self.get_candles, instrument, granularity,
+                        start=page[0], end=page[1],
+                        include_complete=include_complete)))
+
+            for _ in range(self.pool_size):
+                submit_next()
+
+            while in_flight:
+                page, future = in_flight.popleft()
+                df = future.result()
+                submit_next()
+
+                if df is None:
+                    raise RuntimeError(
+                        f"Failed to fetch {instrument} ({granularity}) "
+                        f"page {page[0]} - {page[1]}")
+
+                df = df.sort_values('time', kind='stable')
+                if last_time is not None:
+                    df = df[df['time'] > last_time]
+                df = df.drop_duplicates('time', keep='last')
+                if df.empty:
+                    continue
+
+                last_time = df['time'].iloc[-1]
+                yield df.reset_index(drop=True)
+
+    def get_candles_range(self, instrument, granularity, start, end=None,
+                          include_complete=False):
+        """
+        Retrieve all candles for an arbitrary historical date range.
+
+        Parameters:
+        -----------
+        instrument : str
+            Currency pair (e.g., 'EUR_USD', 'USD_JPY')
+        granularity : str
+            Timeframe (e.g., 'M1', 'H1', 'D')
+        start, end : datetime-like
+            Range to fetch, [start, end). end defaults to now.
+        include_complete : bool
+            Keep OANDA's per-candle 'complete' flag as a column
+
+        Returns:
+        --------
+        pandas.DataFrame
+            One contiguous, de-duplicated frame (None if any page failed).
+            Use iter_candles_range to keep memory bounded.
+        """
+        try:
+            chunks = list(self.iter_candles_range(
+                instrument, granularity, start, end,
+                include_complete=include_complete))
+            if not chunks:
+                return parse_candles([], include_complete=include_complete)
+
+            df = pd.concat(chunks, ignore_index=True)
+            self.logger.info(
+                "✅ Retrieved %d candles for %s (%s) in %d page(s)", len(df),
+                instrument, granularity, len(chunks),
+                extra={'instrument': instrument, 'granularity': granularity,
+                       'rows': len(df), 'pages': len(chunks)})
+            return df
 
         except Exception as e:
-            self.logger.error(f"❌ Error fetching candles: {str(e)}")
+            self.logger.error("❌ Error fetching candle range: %s", e)
             return None
@@ -0,0 +1,149 @@
+# src/oanda_async.py
+
+import asyncio
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from config import APIConfig, DataConfig
+from src.oanda_api import OandaAPI
+from src.utils.logger import setup_logger
+
+# One unit of work: either the latest `count` candles or a start/end range
+FetchJob = namedtuple('FetchJob', ['instrument', 'granularity', 'count',
+                                   'start', 'end'],
+                      defaults=[None, None, None])
+
+# What the fetcher yields per job; df is None when the fetch failed
+FetchResult = namedtuple('FetchResult', ['job', 'df', 'elapsed'])
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`;
+    each acquire() takes one token, waiting until one is available.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class AsyncCandleFetcher:
+    """
+    Fetch many (instrument, granularity, range) jobs concurrently.
+
+    Requests run on a thread pool through one OandaAPI, so they share its
+    keep-alive session, retry/backoff handling and request stats. At most
+    `max_concurrency` requests are in flight and a token bucket keeps the
+    request rate under `rate` per second. Jobs without a count fetch
+    DataConfig.DEFAULT_COUNT candles.
+
+    The thread pool lives as long as the fetcher; close() it (or use it
+    as a context manager) when done. That also closes the OandaAPI
+    session when the fetcher created the OandaAPI itself.
+    """
+
+    def __init__(self, api=None, max_concurrency=None, rate=None,
+                 burst=None):
+        self.logger = setup_logger('AsyncCandleFetcher')
+        self.max_concurrency = max_concurrency or APIConfig.MAX_CONCURRENCY
+        # An API passed in belongs to the caller, who closes it
+        self._owns_api = api is None
+        self.api = api or OandaAPI(pool_size=self.max_concurrency)
+        self.rate = rate or APIConfig.RATE_LIMIT
+        self.burst = burst or APIConfig.RATE_BURST
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix='AsyncCandleFetcher')
+
+    def close(self):
+        # Queued requests are dropped; ones already running finish in the
+        # background instead of blocking the caller
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._owns_api:
+            self.api.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _fetch_job(self, job):
+        start = time.perf_counter()
+        df = self.api.get_candles(job.instrument, granularity=job.granularity,
+                                  count=job.count or DataConfig.DEFAULT_COUNT,
+                                  start=job.start, end=job.end)
+        return FetchResult(job, df, time.perf_counter() - start)
+
+    async def fetch(self, jobs):
+        """
+        Run the jobs concurrently, yielding each FetchResult as it lands.
+
+        Results arrive in completion order, not submission order. If the
+        consumer stops early, jobs not yet started are cancelled without
+        waiting for the ones in flight.
+        """
+        jobs = [FetchJob(*job) if not isinstance(job, FetchJob) else job
+                for job in jobs]
+        if not jobs:
+            return
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        bucket = TokenBucket(self.rate, self.burst)
+
+        async def run(job):
+            async with semaphore:
+                await bucket.acquire()
+                return await loop.run_in_executor(self._executor,
+                                                  self._fetch_job, job)
+
+        tasks = [asyncio.ensure_future(run(job)) for job in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Cancelling a task also cancels its executor future if that
+            # has not started yet
+            for task in tasks:
+                task.cancel()
+
+    def fetch_all(self, jobs):
+        """
+        Blocking convenience wrapper around fetch().
+
+        Returns:
+        --------
+        dict
+            FetchJob -> DataFrame (None for failed jobs)
+        """
+        async def collect():
+            return {result.job: result.df async for result in self.fetch(jobs)}
+
+        started = time.perf_counter()
+        results = asyncio.run(collect())
+        failed = sum(df is None for df in results.values())
+        self.logger.info("Fetched %d jobs in %.2fs (%d failed)",
+                         len(results), time.perf_counter() - started, failed)
+        return results
@@ -0,0 +1,266 @@
+# src/oanda_stream.py
+
+import asyncio
+import json
+import ssl
+import time
+from collections import namedtuple
+from urllib.parse import urlencode, urlparse
+
+import numpy as np
+
+from config import APIConfig
+from src.utils.logger import setup_logger
+
+# One price update. time is OANDA's timestamp and received the local
+# wall clock when the line was parsed, both in ns since the epoch.
+Tick = namedtuple('Tick', ['instrument', 'time', 'bid', 'ask', 'received'])
+
+
+class StreamError(Exception):
+    """The stream failed in a way reconnecting cannot fix."""
+
+
+def _parse_time(value):
+    # RFC3339 with up to nanosecond precision, always UTC ('Z')
+    return int(np.datetime64(value.rstrip('Z'), 'ns').astype(np.int64))
+
+
+def _best_price(levels):
+    return float(levels[0]['price']) if levels else float('nan')
+
+
+class PriceStream:
+    """
+    Async client for /v3/accounts/{account_id}/pricing/stream.
+
+    Speaks HTTP/1.1 directly over an asyncio connection and splits the
+    (usually chunked) body into newline-delimited JSON as bytes arrive,
+    so a message is handled as soon as its line is complete. Prices go
+    into a bounded asyncio.Queue as Ticks; heartbeats only prove the
+    connection is alive. If nothing at all arrives for
+    APIConfig.STREAM_TIMEOUT seconds, or the connection drops, the
+    stream reconnects with OandaAPI's exponential backoff and jitter.
+
+    When the queue is full the reader waits for the consumer, which
+    pushes back on the server through TCP; with drop_oldest=True it
+    discards the oldest tick instead and counts it in `dropped`.
+
+    Usage:
+        async with api.price_stream(['EUR_USD']) as stream:
+            async for tick in stream:
+                ...
+    """
+
+    def __init__(self, api, instruments, queue_size=None, timeout=None,
+                 drop_oldest=False, max_reconnects=None):
+        self.logger = setup_logger('PriceStream')
+        self.api = api
+        self.instruments = list(instruments)
+        self.timeout = timeout or APIConfig.STREAM_TIMEOUT
+        self.drop_oldest = drop_oldest
+        self.max_reconnects = max_reconnects
+        self.queue = asyncio.Queue(queue_size or APIConfig.STREAM_QUEUE_SIZE)
+
+        self.ticks = 0
+        self.heartbeats = 0
+        self.reconnects = 0
+        self.dropped = 0
+        self.last_heartbeat = None
+
+        self._running = False
+        self._writer = None
+        self._task = None
+
+    # Connection ----------------------------------------------------------
+
+    async def _read(self, awaitable):
+        return await asyncio.wait_for(awaitable, self.timeout)
+
+    async def _connect(self):
+        url = urlparse(self.api.stream_url)
+        secure = url.scheme == 'https'
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(
+            url.hostname, url.port or (443 if secure else 80),
+            ssl=ssl.create_default_context() if secure else None),
+            APIConfig.TIMEOUT)
+        self._writer = writer
+
+        path = (f"{url.path.rstrip('/')}/v3/accounts/{self.api.account_id}"
+                f"/pricing/stream?"
+                f"{urlencode({'instruments': ','.join(self.instruments)})}")
+        writer.write((
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {url.netloc}\r\n"
+            f"Authorization: Bearer {self.api.api_token}\r\n"
+            f"Accept: application/json\r\n"
+            f"Accept-Encoding: identity\r\n"
+            f"Connection: close\r\n\r\n").encode())
+        await writer.drain()
+
+        status_line = await self._read(reader.readline())
+        if not status_line:
+            raise ConnectionError("Connection closed before a response")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self._read(reader.readline())
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if status != 200:
+            body = b''
+            if 'content-length' in headers:
+                body = await self._read(
+                    reader.readexactly(int(headers['content-length'])))
+            message = f"HTTP {status}: {body.decode(errors='replace')}"
+            if status in APIConfig.RETRY_STATUS_CODES:
+                raise ConnectionError(message)
+            raise StreamError(message)
+        return reader, headers
+
+    async def _body(self, reader, headers):
+        # Raw body bytes, undoing chunked transfer encoding
+        if headers.get('transfer-encoding', '').lower() != 'chunked':
+            while True:
+                data = await self._read(reader.read(65536))
+                if not data:
+                    return
+                yield data
+
+        while True:
+            size_line = await self._read(reader.readline())
+            if not size_line:
+                raise ConnectionError("Stream closed mid-body")
+            size = int(size_line.split(b';')[0], 16)
+            if size == 0:
+                return
+            data = await self._read(reader.readexactly(size + 2))
+            yield data[:-2]
+
+    async def _lines(self, reader, headers):
+        # Complete lines only; a partial line waits for the next chunk
+        pending = b''
+        async for data in self._body(reader, headers):
+            lines = (pending + data).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield line
+
+    # Messages ------------------------------------------------------------
+
+    async def _handle(self, line):
+        message = json.loads(line)
+        kind = message.get('type')
+        if kind == 'PRICE':
+            tick = Tick(message['instrument'], _parse_time(message['time']),
+                        _best_price(message.get('bids')),
+                        _best_price(message.get('asks')), time.time_ns())
+            if self.drop_oldest and self.queue.full():
+                self.queue.get_nowait()
+                self.dropped += 1
+            await self.queue.put(tick)
+            self.ticks += 1
+        elif kind == 'HEARTBEAT':
+            self.heartbeats += 1
+            self.last_heartbeat = _parse_time(message['time'])
+
+    async def run(self):
+        """
+        Read the stream into the queue until stop() is called.
+
+        Raises:
+        -------
+        StreamError
+            On a non-retryable HTTP status, or once max_reconnects
+            consecutive reconnects have failed
+        """
+        self._running = True
+        attempt = 0
+        while self._running:
+            try:
+                reader, headers = await self._connect()
+                self.logger.info("✅ Price stream connected for %s",
+                                 ', '.join(self.instruments))
+                async for line in self._lines(reader, headers):
+                    attempt = 0
+                    await self._handle(line)
+                reason = "stream ended"
+            except StreamError:
+                self._running = False
+                raise
+            except (OSError, asyncio.TimeoutError,
+                    asyncio.IncompleteReadError, ValueError) as e:
+                reason = str(e) or type(e).__name__
+            finally:
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+
+            if not self._running:
+                break
+            if self.max_reconnects is not None and \
+                    attempt >= self.max_reconnects:
+                raise StreamError(
+                    f"Gave up after {attempt} reconnects: {reason}")
+            delay = self.api._backoff_delay(attempt)
+            attempt += 1
+            self.reconnects += 1
+            self.logger.warning(
+                "⚠️  Price stream %s - reconnect %d in %.2fs", reason,
+                attempt, delay)
+            await asyncio.sleep(delay)
+
+    def stop(self):
+        """Stop reading; run() returns once the connection is closed."""
+        self._running = False
+        if self._writer is not None:
+            self._writer.close()
+
+    def stats(self):
+        return {
+            'ticks': self.ticks,
+            'heartbeats': self.heartbeats,
+            'reconnects': self.reconnects,
+            'dropped': self.dropped,
+            'queued': self.queue.qsize(),
+        }
+
+    # Consumer side -------------------------------------------------------
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self.run())
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, StreamError):
+            pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """Next tick; ends (or raises) once run() has finished."""
+        if not self.queue.empty():
+            return self.queue.get_nowait()
+        if self._task is None:
+            # run() is being driven by the caller
+            return await self.queue.get()
+
+        getter = asyncio.ensure_future(self.queue.get())
+        await asyncio.wait({getter, self._task},
+                           return_when=asyncio.FIRST_COMPLETED)
+        if getter.done():
+            return getter.result()
+        getter.cancel()
+        if self._task.exception() is not None:
+            raise self._task.exception()
+        raise StopAsyncIteration
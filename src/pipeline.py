@@ -0,0 +1,430 @@
+# src/pipeline.py
+"""
+Declarative ingest pipeline over (instrument, granularity) partitions.
+
+A Pipeline is a DAG of Stages. Each partition flows through the graph
+on its own: a stage runs for a partition once all of the stages it
+depends on have finished for that partition, so independent partitions
+(and independent branches of the graph) run concurrently. Every stage
+has its own worker threads and a bounded input queue; when a stage falls
+behind, upstream workers block on put() instead of piling up
+DataFrames in memory.
+
+The standard ingest graph is
+
+    extract -> parse -> validate -> transform -> load
+
+and each partition's outcome is written to extraction_metadata as
+SUCCESS, FAILED or PARTIAL. A run logs a checkpoint (the last
+extraction_metadata id before it started); running again with
+--resume <checkpoint> skips the partitions that already succeeded
+since then.
+
+Run from the repository root:
+    python -m src.pipeline [--resume CHECKPOINT]
+"""
+
+import argparse
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+from config import DataConfig, PipelineConfig
+from src.db.connection import placeholder
+from src.db.loader import load_candles
+from src.sync import get_watermark, record_extraction
+from src.utils.logger import setup_logger
+from src.utils.metrics import count, timer
+from src.utils.parsers import parse_candles
+from src.utils.timeframes import split_range
+from src.utils.validators import validate_data
+
+logger = setup_logger('Pipeline')
+
+Partition = namedtuple('Partition', ['instrument', 'granularity'])
+
+# Declarative stage: func(ctx) returns the stage's output, which
+# downstream stages read from ctx.inputs[name]
+Stage = namedtuple('Stage', ['name', 'func', 'depends_on', 'workers',
+                             'queue_size'],
+                   defaults=[(), 1, None])
+
+_STOP = object()
+
+
+class PartitionContext:
+    """
+    What a stage sees of its partition: the outputs of the stages that
+    ran before it, plus the row count and watermark to record.
+    """
+
+    def __init__(self, partition, stages):
+        self.partition = partition
+        self.instrument, self.granularity = partition
+        self.inputs = {}
+        self.rows = 0
+        self.watermark = None
+        self.warnings = []
+        self.error = None
+        self.seconds = {}
+
+        # Bookkeeping for the runner, guarded by its lock
+        self._waiting = {stage.name: len(stage.depends_on)
+                         for stage in stages}
+        self._skipped = set()
+        self._remaining = len(stages)
+
+    def partial(self, message):
+        """Carry on, but record the partition as PARTIAL."""
+        logger.warning("⚠️  %s (%s): %s", self.instrument, self.granularity,
+                       message)
+        self.warnings.append(message)
+
+    @property
+    def status(self):
+        if self.error is not None:
+            # Rows already loaded make a failure partial
+            return 'PARTIAL' if self.rows else 'FAILED'
+        return 'PARTIAL' if self.warnings else 'SUCCESS'
+
+
+def _topological_order(stages):
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names in {names}")
+    for stage in stages:
+        unknown = set(stage.depends_on) - set(names)
+        if unknown:
+            raise ValueError(
+                f"Stage {stage.name} depends on unknown {sorted(unknown)}")
+
+    order = []
+    waiting = {stage.name: set(stage.depends_on) for stage in stages}
+    while waiting:
+        ready = [name for name, deps in waiting.items() if not deps]
+        if not ready:
+            raise ValueError(f"Stages form a cycle: {sorted(waiting)}")
+        for name in ready:
+            order.append(name)
+            del waiting[name]
+        for deps in waiting.values():
+            deps.difference_update(ready)
+    return order
+
+
+class Pipeline:
+    """
+    Run Stages over partitions, each stage on its own worker threads.
+
+    A stage that raises fails its partition: the stages downstream of it
+    are skipped for that partition only. With a ConnectionPool as `db`,
+    each finished partition is recorded in extraction_metadata (stage
+    timings go in the metrics column) and runs can be resumed.
+
+    Usage:
+        pipeline = Pipeline([
+            Stage('extract', extract, workers=4),
+            Stage('parse', parse, depends_on=('extract',)),
+            ...
+        ], db=get_pool())
+        results = pipeline.run([('EUR_USD', 'H1'), ('USD_JPY', 'H4')])
+    """
+
+    def __init__(self, stages, db=None, queue_size=None):
+        self.order = _topological_order(stages)
+        self.stages = {stage.name: stage for stage in stages}
+        self.children = {name: [stage.name for stage in stages
+                                if name in stage.depends_on]
+                         for name in self.order}
+        self.sources = [stage.name for stage in stages
+                        if not stage.depends_on]
+        self.db = db
+        self.queue_size = queue_size or PipelineConfig.QUEUE_SIZE
+        self.last_checkpoint = None
+        self._lock = threading.Lock()
+
+    # Resuming ------------------------------------------------------------
+
+    def checkpoint(self):
+        """Last extraction_metadata id; rows after it belong to later runs."""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(id) FROM extraction_metadata")
+            row = cursor.fetchone()
+            cursor.close()
+        return row[0] or 0
+
+    def completed_since(self, checkpoint):
+        """Partitions recorded as SUCCESS after `checkpoint`."""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT DISTINCT instrument, granularity
+                FROM extraction_metadata
+                WHERE id > {placeholder(conn)} AND status = 'SUCCESS'
+            """, (checkpoint,))
+            rows = cursor.fetchall()
+            cursor.close()
+        return {Partition(*row) for row in rows}
+
+    # Running -------------------------------------------------------------
+
+    def run(self, partitions, resume=None):
+        """
+        Push every partition through the graph and wait for all of them.
+
+        Parameters:
+        -----------
+        partitions : iterable of (instrument, granularity)
+        resume : int, optional
+            Checkpoint of an earlier run (its last_checkpoint, also
+            logged): partitions that succeeded since then are skipped
+
+        Returns:
+        --------
+        list of dict
+            Per partition: instrument, granularity, status,
+            rows_extracted, watermark, error, warnings and per-stage
+            seconds, in the order given
+        """
+        partitions = [Partition(*p) for p in partitions]
+        if resume is not None and self.db is None:
+            raise ValueError("Resuming needs a database")
+        if self.db is not None:
+            # Resumed runs keep the original checkpoint
+            self.last_checkpoint = self.checkpoint() if resume is None \
+                else resume
+            logger.info("Run checkpoint %d (resume with --resume %d)",
+                        self.last_checkpoint, self.last_checkpoint)
+        if resume is not None:
+            done = self.completed_since(resume)
+            logger.info("Resuming from checkpoint %d: skipping %d "
+                        "completed partition(s)", resume,
+                        sum(p in done for p in partitions))
+            partitions = [p for p in partitions if p not in done]
+
+        stages = [self.stages[name] for name in self.order]
+        contexts = [PartitionContext(p, stages) for p in partitions]
+        if not contexts:
+            return []
+
+        queues = {name: queue.Queue(stage.queue_size or self.queue_size)
+                  for name, stage in self.stages.items()}
+        self._finished = 0
+        self._all_done = threading.Event()
+        self._total = len(contexts)
+        started = time.perf_counter()
+
+        threads = [threading.Thread(target=self._worker,
+                                    args=(stage, queues),
+                                    name=f"{stage.name}-{i}", daemon=True)
+                   for stage in stages for i in range(stage.workers)]
+        for thread in threads:
+            thread.start()
+
+        # Feeding blocks once the source queues are full
+        for ctx in contexts:
+            for name in self.sources:
+                queues[name].put(ctx)
+
+        self._all_done.wait()
+        for stage in stages:
+            for _ in range(stage.workers):
+                queues[stage.name].put(_STOP)
+        for thread in threads:
+            thread.join()
+
+        results = [self._result(ctx) for ctx in contexts]
+        statuses = [r['status'] for r in results]
+        logger.info(
+            "Pipeline finished %d partition(s) in %.2fs: %d succeeded, "
+            "%d partial, %d failed", len(results),
+            time.perf_counter() - started, statuses.count('SUCCESS'),
+            statuses.count('PARTIAL'), statuses.count('FAILED'))
+        return results
+
+    def _worker(self, stage, queues):
+        while True:
+            ctx = queues[stage.name].get()
+            if ctx is _STOP:
+                return
+
+            ready = []
+            try:
+                stage_started = time.perf_counter()
+                with timer('pipeline_stage_seconds', stage=stage.name):
+                    output = stage.func(ctx)
+                ctx.seconds[stage.name] = time.perf_counter() - stage_started
+            except Exception as e:
+                logger.error("❌ %s failed for %s (%s): %s", stage.name,
+                             ctx.instrument, ctx.granularity, e)
+                with self._lock:
+                    ctx.error = f"{stage.name}: {e}"
+                    ctx._remaining -= 1 + self._skip_descendants(ctx,
+                                                                 stage.name)
+                    finished = ctx._remaining == 0
+            else:
+                with self._lock:
+                    ctx.inputs[stage.name] = output
+                    for child in self.children[stage.name]:
+                        ctx._waiting[child] -= 1
+                        if ctx._waiting[child] == 0 and \
+                                child not in ctx._skipped:
+                            ready.append(child)
+                    ctx._remaining -= 1
+                    finished = ctx._remaining == 0
+
+            # Outside the lock: a full queue blocks this worker only
+            for child in ready:
+                queues[child].put(ctx)
+            if finished:
+                self._finish(ctx)
+
+    def _skip_descendants(self, ctx, name):
+        # Caller holds the lock; returns how many stages were newly
+        # skipped (none of them can have started)
+        skipped = 0
+        for child in self.children[name]:
+            if child not in ctx._skipped:
+                ctx._skipped.add(child)
+                skipped += 1 + self._skip_descendants(ctx, child)
+        return skipped
+
+    def _finish(self, ctx):
+        # Frees the stage outputs; only the summary is kept
+        ctx.inputs = {}
+        count('pipeline_partitions_total', status=ctx.status)
+        if self.db is not None:
+            try:
+                with self.db.connection() as conn:
+                    record_extraction(
+                        conn, ctx.instrument, ctx.granularity, ctx.rows,
+                        ctx.status,
+                        error_message=ctx.error or '; '.join(ctx.warnings)
+                        or None,
+                        last_candle_time=ctx.watermark
+                        if ctx.status != 'FAILED' else None,
+                        metrics={'stage_seconds': {
+                            name: round(seconds, 6)
+                            for name, seconds in ctx.seconds.items()}})
+            except Exception as e:
+                logger.error("❌ Could not record %s (%s): %s",
+                             ctx.instrument, ctx.granularity, e)
+
+        with self._lock:
+            self._finished += 1
+            if self._finished == self._total:
+                self._all_done.set()
+
+    @staticmethod
+    def _result(ctx):
+        return {
+            'instrument': ctx.instrument,
+            'granularity': ctx.granularity,
+            'status': ctx.status,
+            'rows_extracted': ctx.rows,
+            'watermark': ctx.watermark,
+            'error': ctx.error,
+            'warnings': ctx.warnings,
+            'seconds': ctx.seconds,
+        }
+
+
+# Ingest stages -----------------------------------------------------------
+
+def build_ingest_pipeline(api, pool, initial_count=None, queue_size=None,
+                          cache=None):
+    """
+    extract -> parse -> validate -> transform -> load into
+    raw_market_data, resuming each partition from its watermark like
+    sync_series.
+
+    With a SharedCandleCache as `cache`, every loaded batch is also
+    pushed to it, so readers of the latest candles see new ones without
+    going to the database.
+    """
+    initial_count = initial_count or DataConfig.DEFAULT_COUNT
+
+    def extract(ctx):
+        with pool.connection() as conn:
+            ctx.watermark = get_watermark(conn, ctx.instrument,
+                                          ctx.granularity)
+        if ctx.watermark is None:
+            return api.get_candles_payload(ctx.instrument, ctx.granularity,
+                                           count=initial_count)
+        # The watermark candle is fetched again, in case it was still
+        # forming last time
+        payload = []
+        for start, end in split_range(ctx.granularity, ctx.watermark,
+                                      pd.Timestamp.now(tz='UTC')):
+            payload.extend(api.get_candles_payload(
+                ctx.instrument, ctx.granularity, start=start, end=end))
+        return payload
+
+    def parse(ctx):
+        return parse_candles(ctx.inputs['extract'])
+
+    def validate(ctx):
+        df = ctx.inputs['parse']
+        report = validate_data(df, ctx.granularity)
+        if report['passed'] or df.empty:
+            return df
+        # Rows that cannot be loaded are dropped; ordering and duplicate
+        # problems are for transform to fix
+        bad = df[['open', 'high', 'low', 'close']].isna().any(axis=1) | \
+            (df['high'] < df[['open', 'close']].max(axis=1)) | \
+            (df['low'] > df[['open', 'close']].min(axis=1))
+        if bad.any():
+            ctx.partial(f"dropped {int(bad.sum())} invalid candle(s)")
+        return df[~bad]
+
+    def transform(ctx):
+        return ctx.inputs['validate'] \
+            .sort_values('time', kind='stable') \
+            .drop_duplicates('time', keep='last') \
+            .reset_index(drop=True)
+
+    def load(ctx):
+        df = ctx.inputs['transform']
+        with pool.connection() as conn:
+            ctx.rows = load_candles(conn, df, ctx.instrument,
+                                    ctx.granularity)
+        if ctx.rows:
+            ctx.watermark = df['time'].iat[-1]
+        if cache is not None:
+            cache.update(df, ctx.instrument, ctx.granularity)
+        return ctx.rows
+
+    return Pipeline([
+        Stage('extract', extract, workers=PipelineConfig.EXTRACT_WORKERS),
+        Stage('parse', parse, ('extract',), PipelineConfig.PROCESS_WORKERS),
+        Stage('validate', validate, ('parse',),
+              PipelineConfig.PROCESS_WORKERS),
+        Stage('transform', transform, ('validate',),
+              PipelineConfig.PROCESS_WORKERS),
+        Stage('load', load, ('transform',), PipelineConfig.LOAD_WORKERS),
+    ], db=pool, queue_size=queue_size)
+
+
+if __name__ == "__main__":
+    from src.db.pool import get_pool
+    from src.oanda_api import OandaAPI
+
+    parser = argparse.ArgumentParser(description="Run the ingest pipeline")
+    parser.add_argument('--resume', type=int, metavar='CHECKPOINT',
+                        help="skip partitions that succeeded since then")
+    args = parser.parse_args()
+
+    pipeline = build_ingest_pipeline(OandaAPI(), get_pool())
+    results = pipeline.run(
+        [(instrument, granularity)
+         for instrument in DataConfig.SUPPORTED_INSTRUMENTS
+         for granularity in [DataConfig.DEFAULT_GRANULARITY]],
+        resume=args.resume)
+
+    failed = [r for r in results if r['status'] != 'SUCCESS']
+    print(f"Loaded {len(results) - len(failed)}/{len(results)} partitions, "
+          f"{sum(r['rows_extracted'] for r in results)} rows")
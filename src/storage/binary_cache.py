@@ -0,0 +1,216 @@
+# src/storage/binary_cache.py
+
+import fcntl
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+
+from config import PathConfig
+from src.utils.logger import setup_logger
+from src.utils.timeframes import to_utc
+
+# Fixed 48-byte record: int64 ns timestamp, four float64 prices, volume
+CANDLE_RECORD = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<i8'),
+])
+
+# File layout: 64-byte header, then records back to back. The header holds
+# a magic string, the record size and the committed record count; only
+# records below the committed count are ever visible to readers.
+MAGIC = b'CNDLv001'
+HEADER_SIZE = 64
+COUNT_OFFSET = 16
+HEADER = struct.Struct('<8sqq')
+
+
+def frame_to_records(df):
+    """Pack a parse_candles-style DataFrame into CANDLE_RECORD rows."""
+    records = np.empty(len(df), dtype=CANDLE_RECORD)
+    records['time'] = df['time'].dt.as_unit('ns').astype('int64').to_numpy()
+    for name in ('open', 'high', 'low', 'close', 'volume'):
+        records[name] = df[name].to_numpy()
+    return records
+
+
+def records_to_frame(records):
+    """Unpack CANDLE_RECORD rows into a parse_candles-style DataFrame."""
+    data = {'time': pd.to_datetime(records['time'], utc=True)}
+    for name in ('open', 'high', 'low', 'close', 'volume'):
+        data[name] = records[name]
+    return pd.DataFrame(data)
+
+
+class BinaryCandleCache:
+    """
+    One fixed-width binary file of candles per instrument/granularity,
+    read through numpy.memmap.
+
+    Appends are atomic for readers: records are written past the
+    committed count first, then the count in the header is bumped with a
+    single aligned 8-byte write. A reader that loads the count only maps
+    records that were fully written before it, so it can never observe a
+    torn record. Writers serialise on an flock.
+
+    Only candles newer than the last stored one are appended, so the file
+    stays sorted by time and lookups are a binary search on the time
+    column of a zero-copy view.
+
+    Usage:
+        cache = BinaryCandleCache()
+        cache.append('EUR_USD', 'M1', df)
+        view = cache.view('EUR_USD', 'M1', start, end)   # structured memmap
+    """
+
+    def __init__(self, root=None):
+        self.logger = setup_logger('BinaryCandleCache')
+        self.root = os.path.abspath(
+            root or os.path.join(PathConfig.DATA_DIR, 'cache'))
+        os.makedirs(self.root, exist_ok=True)
+
+        # Reader state per file: open fd for header reads, plus the last
+        # mapping and the committed count it covers
+        self._readers = {}
+
+    def path(self, instrument, granularity):
+        return os.path.join(self.root, f"{instrument}_{granularity}.bin")
+
+    def _open_for_append(self, path):
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        if os.fstat(fd).st_size < HEADER_SIZE:
+            header = HEADER.pack(MAGIC, CANDLE_RECORD.itemsize, 0)
+            os.pwrite(fd, header.ljust(HEADER_SIZE, b'\0'), 0)
+            os.fsync(fd)
+        return fd
+
+    @staticmethod
+    def _read_count(fd):
+        magic, record_size, count = HEADER.unpack(
+            os.pread(fd, HEADER.size, 0))
+        if magic != MAGIC or record_size != CANDLE_RECORD.itemsize:
+            raise ValueError("Not a candle cache file")
+        return count
+
+    def append(self, instrument, granularity, df, durable=True):
+        """
+        Append candles newer than the last cached one.
+
+        Only pass complete candles: a stored candle is never rewritten.
+
+        Parameters:
+        -----------
+        df : pandas.DataFrame or numpy structured array
+            parse_candles output, or CANDLE_RECORD rows
+        durable : bool
+            fsync the records before publishing them, so a crash cannot
+            leave the header pointing at unwritten data
+
+        Returns:
+        --------
+        int
+            Number of records appended
+        """
+        records = df if isinstance(df, np.ndarray) else frame_to_records(df)
+        records = np.sort(records, order='time')
+
+        fd = self._open_for_append(self.path(instrument, granularity))
+        try:
+            count = self._read_count(fd)
+            if count:
+                last = np.frombuffer(os.pread(
+                    fd, CANDLE_RECORD.itemsize,
+                    HEADER_SIZE + (count - 1) * CANDLE_RECORD.itemsize),
+                    dtype=CANDLE_RECORD)[0]['time']
+                records = records[records['time'] > last]
+
+            if len(records) > 1:
+                keep = np.concatenate(
+                    (np.diff(records['time']) != 0, [True]))
+                records = records[keep]
+            if len(records) == 0:
+                return 0
+
+            # 1. records beyond the committed count (invisible to readers)
+            os.pwrite(fd, records.tobytes(),
+                      HEADER_SIZE + count * CANDLE_RECORD.itemsize)
+            if durable:
+                os.fsync(fd)
+
+            # 2. publish them with one aligned 8-byte header write
+            os.pwrite(fd, struct.pack('<q', count + len(records)),
+                      COUNT_OFFSET)
+            if durable:
+                os.fsync(fd)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+        self.logger.debug("Cached %d candles for %s (%s)", len(records),
+                          instrument, granularity)
+        return len(records)
+
+    def load(self, instrument, granularity):
+        """
+        Map every committed record of a series.
+
+        Returns:
+        --------
+        numpy.memmap
+            Read-only structured view (CANDLE_RECORD); empty if the
+            series is not cached
+        """
+        path = self.path(instrument, granularity)
+        reader = self._readers.get(path)
+        if reader is None:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                return np.empty(0, dtype=CANDLE_RECORD)
+            reader = self._readers[path] = [fd, 0, None]
+
+        # Re-map only when a writer has published more records
+        count = self._read_count(reader[0])
+        if count == 0:
+            return np.empty(0, dtype=CANDLE_RECORD)
+        if count != reader[1]:
+            reader[1] = count
+            reader[2] = np.memmap(path, dtype=CANDLE_RECORD, mode='r',
+                                  offset=HEADER_SIZE, shape=(count,))
+        return reader[2]
+
+    def close(self):
+        for fd, _, _ in self._readers.values():
+            os.close(fd)
+        self._readers.clear()
+
+    def view(self, instrument, granularity, start=None, end=None):
+        """
+        Zero-copy slice of the candles in [start, end).
+
+        Both bounds are located by binary search on the time column.
+        """
+        records = self.load(instrument, granularity)
+        times = records['time']
+        lo = 0 if start is None else \
+            np.searchsorted(times, to_utc(start).value, side='left')
+        hi = len(records) if end is None else \
+            np.searchsorted(times, to_utc(end).value, side='left')
+        return records[lo:hi]
+
+    def read(self, instrument, granularity, start=None, end=None):
+        """Candles in [start, end) as a parse_candles-style DataFrame."""
+        return records_to_frame(self.view(instrument, granularity,
+                                          start, end))
+
+    def last_time(self, instrument, granularity):
+        records = self.load(instrument, granularity)
+        if len(records) == 0:
+            return None
+        return pd.Timestamp(int(records['time'][-1]), tz='UTC')
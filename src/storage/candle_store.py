@@ -0,0 +1,287 @@
+# src/storage/candle_store.py
+
+import os
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+from config import PathConfig
+from src.utils.logger import setup_logger
+from src.utils.timeframes import to_utc
+
+CANDLE_SCHEMA = pa.schema([
+    ('time', pa.timestamp('ns', tz='UTC')),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('volume', pa.int64()),
+])
+
+# Directory levels: instrument=EUR_USD/granularity=H1/year_month=2026-01
+PARTITION_SCHEMA = pa.schema([
+    ('instrument', pa.string()),
+    ('granularity', pa.string()),
+    ('year_month', pa.string()),
+])
+
+
+class CandleStore:
+    """
+    Append-only Parquet store of candles, partitioned by instrument,
+    granularity and month.
+
+    Each append writes new part files rather than rewriting existing
+    ones; reads de-duplicate on time, keeping the most recently appended
+    candle, so re-ingesting an updated candle simply supersedes it.
+    compact() folds a partition's parts back into a single file.
+
+    Usage:
+        store = CandleStore()
+        store.append(df, 'EUR_USD', 'H1')
+        df = store.read('EUR_USD', 'H1', start='2026-01-01',
+                        columns=['time', 'close'])
+    """
+
+    schema = CANDLE_SCHEMA
+
+    def __init__(self, root=None, compression='zstd'):
+        self.logger = setup_logger('CandleStore')
+        self.root = os.path.abspath(root or PathConfig.RAW_DATA_DIR)
+        self.compression = compression
+
+    def _partition_dir(self, instrument, granularity, year_month):
+        return os.path.join(self.root, f"instrument={instrument}",
+                            f"granularity={granularity}",
+                            f"year_month={year_month}")
+
+    def append(self, df, instrument, granularity):
+        """
+        Append candles (as produced by parse_candles) to the store.
+
+        Returns:
+        --------
+        list of str
+            Paths of the part files written, one per month touched
+        """
+        if df is None or df.empty:
+            return []
+
+        table = pa.Table.from_pandas(
+            df[self.schema.names], schema=self.schema,
+            preserve_index=False)
+        times = table['time'].to_numpy()
+        if len(times) > 1 and not (times[1:] >= times[:-1]).all():
+            order = np.argsort(times, kind='stable')
+            table, times = table.take(order), times[order]
+        # Months since 1970-01 by integer calendar arithmetic; strftime
+        # would format a string per row. Sorted, each month is a slice.
+        months = times.astype('datetime64[M]').view(np.int64)
+        bounds = np.flatnonzero(np.diff(months)) + 1
+        # Time-ordered file names keep appends in order on read
+        prefix = f"part-{time.time_ns():020d}"
+
+        written = []
+        for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(months)]):
+            month = int(months[start])
+            year_month = f"{1970 + month // 12:04d}-{month % 12 + 1:02d}"
+            part = table.slice(start, stop - start)
+            directory = self._partition_dir(instrument, granularity,
+                                            year_month)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory,
+                                f"{prefix}-{uuid.uuid4().hex[:8]}.parquet")
+
+            # Write then rename, so readers never see a half-written file
+            tmp_path = f"{path}.tmp"
+            pq.write_table(part, tmp_path, compression=self.compression)
+            os.replace(tmp_path, path)
+            written.append(path)
+
+        self.logger.info("Stored %d candles for %s (%s) in %d part file(s)",
+                         len(df), instrument, granularity, len(written))
+        return written
+
+    def _files(self, instrument=None, granularity=None):
+        base = self.root
+        if instrument is not None:
+            base = os.path.join(base, f"instrument={instrument}")
+            if granularity is not None:
+                base = os.path.join(base, f"granularity={granularity}")
+
+        files = []
+        for directory, _, names in os.walk(base):
+            files.extend(os.path.join(directory, name) for name in names
+                         if name.endswith('.parquet'))
+        return sorted(files, key=os.path.basename)
+
+    def read_table(self, instrument=None, granularity=None, start=None,
+                   end=None, columns=None, memory_map=True):
+        """
+        Read candles as a pyarrow.Table.
+
+        Instrument, granularity and month filters prune whole
+        directories; the time filter is pushed down to Parquet row-group
+        statistics; only the requested columns are decoded. Files are
+        memory-mapped rather than read into buffers when memory_map is
+        True.
+
+        Parameters:
+        -----------
+        instrument, granularity : str, optional
+        start, end : datetime-like, optional
+            Half-open time range [start, end)
+        columns : list of str, optional
+            Subset of columns to load (time is always included)
+
+        Returns:
+        --------
+        pyarrow.Table
+            Sorted by instrument, granularity, time with duplicate times
+            resolved to the latest append
+        """
+        files = self._files(instrument, granularity)
+        if not files:
+            return self.schema.empty_table()
+
+        dataset = ds.dataset(
+            files, format='parquet',
+            filesystem=fs.LocalFileSystem(use_mmap=memory_map),
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+            partition_base_dir=self.root)
+
+        expression = None
+
+        def add(condition):
+            nonlocal expression
+            expression = condition if expression is None \
+                else expression & condition
+
+        if instrument is not None:
+            add(ds.field('instrument') == instrument)
+        if granularity is not None:
+            add(ds.field('granularity') == granularity)
+        if start is not None:
+            start = to_utc(start)
+            add(ds.field('year_month') >= start.strftime('%Y-%m'))
+            add(ds.field('time') >= pa.scalar(start.value,
+                                              self.schema.field('time').type))
+        if end is not None:
+            end = to_utc(end)
+            add(ds.field('year_month') <= end.strftime('%Y-%m'))
+            add(ds.field('time') < pa.scalar(end.value,
+                                             self.schema.field('time').type))
+
+        columns = list(columns) if columns else self.schema.names
+        if 'time' not in columns:
+            columns = ['time'] + columns
+        keys = [name for name, value in (('instrument', instrument),
+                                         ('granularity', granularity))
+                if value is None]
+
+        table = dataset.to_table(columns=keys + columns, filter=expression)
+        return self._deduplicate(table, keys)
+
+    @staticmethod
+    def _deduplicate(table, keys):
+        # Rows come back in file order, i.e. append order, so the last
+        # occurrence of a (keys, time) pair is the newest
+        if table.num_rows == 0:
+            return table
+
+        table = table.append_column(
+            '_order', pa.array(range(table.num_rows), pa.int64()))
+        group_keys = keys + ['time']
+        latest = table.group_by(group_keys, use_threads=False) \
+            .aggregate([('_order', 'max')])['_order_max']
+        table = table.take(latest)
+        table = table.sort_by([(key, 'ascending') for key in group_keys])
+        return table.drop_columns(['_order'])
+
+    def read(self, instrument=None, granularity=None, start=None, end=None,
+             columns=None, memory_map=True):
+        """Read candles as a pandas DataFrame; see read_table."""
+        return self.read_table(instrument, granularity, start, end, columns,
+                               memory_map).to_pandas()
+
+    def iter_batches(self, instrument, granularity, start=None, end=None,
+                     columns=None, batch_size=100_000):
+        """
+        Stream one series as DataFrames of at most `batch_size` rows.
+
+        Part files are read one at a time in append order, so memory
+        stays bounded, but duplicates across parts are not resolved and
+        parts of a month may overlap in time: compact() the series first
+        to get de-duplicated, time-ordered batches.
+        """
+        columns = list(columns) if columns else self.schema.names
+        if 'time' not in columns:
+            columns = ['time'] + columns
+
+        expression = None
+        if start is not None:
+            expression = ds.field('time') >= pa.scalar(
+                to_utc(start).value, self.schema.field('time').type)
+        if end is not None:
+            condition = ds.field('time') < pa.scalar(
+                to_utc(end).value, self.schema.field('time').type)
+            expression = condition if expression is None \
+                else expression & condition
+
+        dataset = ds.dataset(self._files(instrument, granularity),
+                             schema=self.schema, format='parquet')
+        for batch in dataset.to_batches(columns=columns, filter=expression,
+                                        batch_size=batch_size):
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+    def compact(self, instrument, granularity):
+        """
+        Rewrite each month of a series as a single de-duplicated file.
+
+        Returns:
+        --------
+        int
+            Number of month partitions rewritten
+        """
+        rewritten = 0
+        series_dir = os.path.join(self.root, f"instrument={instrument}",
+                                  f"granularity={granularity}")
+        if not os.path.isdir(series_dir):
+            return 0
+
+        for month_dir in sorted(os.listdir(series_dir)):
+            directory = os.path.join(series_dir, month_dir)
+            parts = sorted(name for name in os.listdir(directory)
+                           if name.endswith('.parquet'))
+            if len(parts) < 2:
+                continue
+
+            paths = [os.path.join(directory, name) for name in parts]
+            table = pa.concat_tables(
+                pq.read_table(path, schema=self.schema) for path in paths)
+            table = self._deduplicate(table, [])
+
+            path = os.path.join(directory, parts[-1])
+            tmp_path = f"{path}.tmp"
+            pq.write_table(table, tmp_path, compression=self.compression)
+            os.replace(tmp_path, path)
+            for old in paths[:-1]:
+                os.remove(old)
+            rewritten += 1
+
+        self.logger.info("Compacted %d month(s) of %s (%s)", rewritten,
+                         instrument, granularity)
+        return rewritten
+
+    def import_csv(self, path, instrument, granularity):
+        """Load a CSV dump written by the old to_csv path into the store."""
+        df = pd.read_csv(path)
+        df['time'] = pd.to_datetime(df['time'], utc=True)
+        return self.append(df, instrument, granularity)
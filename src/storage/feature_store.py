@@ -0,0 +1,35 @@
+# src/storage/feature_store.py
+
+import os
+
+import pyarrow as pa
+
+from config import PathConfig
+from src.features.indicators import FEATURE_COLUMNS
+from src.storage.candle_store import CandleStore
+from src.utils.logger import setup_logger
+
+FEATURE_SCHEMA = pa.schema(
+    [('time', pa.timestamp('ns', tz='UTC'))] +
+    [(name, pa.float64()) for name in FEATURE_COLUMNS])
+
+
+class FeatureStore(CandleStore):
+    """
+    Parquet store of compute_indicators output, laid out and read like
+    CandleStore (instrument/granularity/month partitions, newest append
+    wins on duplicate times).
+
+    Usage:
+        store = FeatureStore()
+        store.append(features, 'EUR_USD', 'H1')
+        df = store.read('EUR_USD', 'H1', columns=['rsi', 'atr'])
+    """
+
+    schema = FEATURE_SCHEMA
+
+    def __init__(self, root=None, compression='zstd'):
+        super().__init__(
+            root or os.path.join(PathConfig.PROCESSED_DATA_DIR, 'features'),
+            compression)
+        self.logger = setup_logger('FeatureStore')
@@ -0,0 +1,200 @@
+# src/storage/response_cache.py
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+
+from config import APIConfig, PathConfig
+from src.utils.logger import setup_logger
+from src.utils.timeframes import granularity_to_timedelta, to_utc
+
+# Schema metadata of each entry
+KEY_FIELD = b'request'
+EXPIRES_FIELD = b'expires_at'  # ns since epoch, empty if final
+
+
+def request_key(instrument, granularity, count=None, start=None, end=None):
+    """
+    Normalised get_candles request: times in UTC at ns precision, and
+    count dropped when both ends are given (OANDA ignores it then).
+    """
+    parts = [instrument, granularity, 'M']
+    if start is not None:
+        parts.append(f"from={to_utc(start).value}")
+    if end is not None:
+        parts.append(f"to={to_utc(end).value}")
+    if start is None or end is None:
+        parts.append(f"count={count}")
+    return '|'.join(parts)
+
+
+def is_final(df, granularity, count=None, start=None, end=None, now=None):
+    """
+    Whether a response can never change: every candle is complete and
+    the request pins a stretch of history. "Latest `count`" requests
+    move with time, and so does a range still open at its end.
+    """
+    if start is None or not df['complete'].all():
+        return False
+    now = to_utc(now) if now is not None else pd.Timestamp.now(tz='UTC')
+    if end is not None:
+        return to_utc(end) <= now
+    # from + count: final once all `count` candles exist
+    return len(df) >= count and \
+        df['time'].iat[-1] + granularity_to_timedelta(granularity) <= now
+
+
+class ResponseCache:
+    """
+    On-disk cache of get_candles responses, one compressed Arrow IPC
+    file per normalised request.
+
+    Final responses (see is_final) are kept until evicted; any other
+    entry is fresh for `ttl` seconds, after which OandaAPI refreshes
+    just its trailing incomplete candles when it can. The cache is an
+    LRU bounded by `max_bytes`: recency is the file mtime, bumped on
+    every hit, so it survives restarts. With offline=True OandaAPI
+    serves entries whatever their age and never calls the API.
+
+    Usage:
+        api = OandaAPI(cache=ResponseCache())
+        api.get_candles('EUR_USD', 'H1', start=a, end=b)   # network
+        api.get_candles('EUR_USD', 'H1', start=a, end=b)   # disk
+        api.cache.stats()
+    """
+
+    def __init__(self, root=None, ttl=None, max_bytes=None, offline=False,
+                 compression='zstd'):
+        self.logger = setup_logger('ResponseCache')
+        self.root = os.path.abspath(
+            root or os.path.join(PathConfig.DATA_DIR, 'http_cache'))
+        os.makedirs(self.root, exist_ok=True)
+        self.ttl = APIConfig.CACHE_TTL if ttl is None else ttl
+        self.max_bytes = max_bytes or APIConfig.CACHE_MAX_BYTES
+        self.offline = offline
+        self.options = pa.ipc.IpcWriteOptions(compression=compression)
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        # path -> size, least recently used first
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith('.arrow'):
+                stat = os.stat(os.path.join(self.root, name))
+                entries.append((stat.st_mtime_ns, name, stat.st_size))
+        self._entries = OrderedDict(
+            (os.path.join(self.root, name), size)
+            for _, name, size in sorted(entries))
+        self._bytes = sum(self._entries.values())
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return os.path.join(self.root, f"{digest}.arrow")
+
+    def get(self, key):
+        """
+        Look a request up.
+
+        Returns:
+        --------
+        tuple or None
+            (DataFrame with a 'complete' column, fresh) or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with pa.memory_map(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+                metadata = table.schema.metadata or {}
+                # A hash collision reads as a miss; put() overwrites it
+                df = table.to_pandas() \
+                    if metadata.get(KEY_FIELD) == key.encode() else None
+        except (FileNotFoundError, pa.ArrowInvalid):
+            df = None
+        if df is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        expires = metadata.get(EXPIRES_FIELD, b'')
+        fresh = not expires or time.time_ns() < int(expires)
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            if path in self._entries:
+                self._entries.move_to_end(path)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return df, fresh
+
+    def put(self, key, df, final):
+        """Store a response; non-final entries expire after ttl."""
+        expires = b'' if final else \
+            str(time.time_ns() + int(self.ttl * 1e9)).encode()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            KEY_FIELD: key.encode(),
+            EXPIRES_FIELD: expires,
+        })
+
+        path = self._path(key)
+        # Write then rename, so readers never see a half-written entry
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema,
+                                 options=self.options) as writer:
+                writer.write_table(table)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._bytes += size - self._entries.pop(path, 0)
+            self._entries[path] = size
+            self._evict()
+
+    def _evict(self):
+        # Caller holds the lock; the newest entry is never evicted
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            path, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            for path in self._entries:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
@@ -0,0 +1,395 @@
+# src/storage/shared_cache.py
+
+import fcntl
+import inspect
+import os
+import tempfile
+from multiprocessing import resource_tracker, shared_memory
+
+try:
+    import _posixshmem
+except ImportError:  # Windows
+    _posixshmem = None
+
+import numpy as np
+
+from config import DataConfig
+from src.db.reader import read_latest
+from src.storage.binary_cache import CANDLE_RECORD, frame_to_records, \
+    records_to_frame
+from src.utils.logger import setup_logger
+from src.utils.metrics import count, timer
+
+# Block layout: a 64-byte header of int64 fields, then a ring of
+# 2 * capacity CANDLE_RECORDs. Record i is written to slot i % capacity
+# and again to slot i % capacity + capacity, so the latest n <= capacity
+# records are always one contiguous slice.
+MAGIC = int.from_bytes(b'CNDLring', 'little')
+HEADER_SIZE = 64
+MAGIC_FIELD, CAPACITY_FIELD, SEQ_FIELD, HEAD_FIELD, COUNT_FIELD = range(5)
+
+# Seqlock retries before a reader falls back to the writer lock
+READ_SPINS = 1000
+
+# SharedMemory(track=...) is new in Python 3.13
+_HAS_TRACK = 'track' in inspect.signature(
+    shared_memory.SharedMemory).parameters
+
+
+def _open_block(name, size=0):
+    # Blocks outlive the process that made them, so keep them away from
+    # the resource tracker (it would unlink them when any attached
+    # process exits)
+    if _HAS_TRACK:
+        return shared_memory.SharedMemory(name=name, create=size > 0,
+                                          size=size, track=False)
+    block = shared_memory.SharedMemory(name=name, create=size > 0, size=size)
+    resource_tracker.unregister(block._name, 'shared_memory')
+    return block
+
+
+def _unlink_block(block):
+    # Before 3.13, SharedMemory.unlink() also unregisters the name from
+    # the resource tracker, which _open_block already did; the tracker
+    # then logs a KeyError traceback
+    if _HAS_TRACK or _posixshmem is None:
+        block.unlink()
+    else:
+        _posixshmem.shm_unlink(block._name)
+
+
+class _Ring:
+    # One attached series block
+
+    def __init__(self, block, check=True):
+        self.block = block
+        self.header = np.ndarray(8, dtype=np.int64, buffer=block.buf)
+        if check and self.header[MAGIC_FIELD] != MAGIC:
+            self.header = None
+            raise ValueError(f"{block.name} is not a candle ring")
+        self.capacity = int(self.header[CAPACITY_FIELD])
+        self.records = np.ndarray(2 * self.capacity, dtype=CANDLE_RECORD,
+                                  buffer=block.buf, offset=HEADER_SIZE)
+
+    def window(self, n=None):
+        # Caller holds the lock or checks the sequence number
+        head = int(self.header[HEAD_FIELD])
+        count = int(self.header[COUNT_FIELD])
+        n = count if n is None else min(n, count)
+        start = (head - n) % self.capacity
+        return self.records[start:start + n]
+
+    def write(self, records):
+        # Caller holds the writer lock; records are sorted and unique
+        capacity = self.capacity
+        header = self.header
+        current = self.window()
+        last = current['time'][-1] if len(current) else np.iinfo(np.int64).min
+
+        # Candles already held are updated in place (e.g. one that was
+        # still forming); older ones, or gaps inside the window, are not
+        old = records[records['time'] <= last]
+        positions = np.searchsorted(current['time'], old['time'])
+        found = positions < len(current)
+        found[found] = current['time'][positions[found]] == \
+            old['time'][found]
+        new = records[records['time'] > last][-capacity:]
+
+        header[SEQ_FIELD] += 1  # odd: write in progress
+        try:
+            if found.any():
+                head = int(header[HEAD_FIELD])
+                slots = (head - len(current) + positions[found]) % capacity
+                self.records[slots] = old[found]
+                self.records[slots + capacity] = old[found]
+            if len(new):
+                head = int(header[HEAD_FIELD])
+                slots = (head + np.arange(len(new))) % capacity
+                self.records[slots] = new
+                self.records[slots + capacity] = new
+                header[HEAD_FIELD] = head + len(new)
+                header[COUNT_FIELD] = min(int(header[COUNT_FIELD]) +
+                                          len(new), capacity)
+        finally:
+            header[SEQ_FIELD] += 1  # even: consistent again
+        return int(found.sum()) + len(new)
+
+
+class SharedCandleCache:
+    """
+    The latest candles of each (instrument, granularity) in shared
+    memory, for any number of processes on one host.
+
+    Each series is a named SharedMemory ring of CANDLE_RECORDs holding
+    the most recent `capacity` candles. latest() returns a zero-copy
+    numpy view of the newest n, with no system call once the block is
+    attached. Readers take no lock. A sequence number, odd while a
+    writer is busy, tells them to retry a window they read mid-update.
+    Writers of one series serialise on an flock.
+
+    On a miss the series is filled from raw_market_data through `db` (a
+    ConnectionPool) and published for every other process. The ingest
+    side keeps it current with update(df, instrument, granularity), which
+    has the CandleStore.append signature. It fits the
+    build_ingest_pipeline cache hook and TickAggregator sinks.
+
+    Blocks persist until clear() or unlink(), so readers can come and go.
+    unlink() marks the block as retired before removing its name, so
+    other processes still attached to it drop it on their next latest()
+    or update() and attach to (or create) the current one. Removing the
+    block behind the cache's back, e.g. from /dev/shm, is not detected.
+
+    Usage:
+        cache = SharedCandleCache(db=get_pool())
+        records = cache.latest('EUR_USD', 'M1', 500)   # CANDLE_RECORD view
+        df = cache.latest_frame('EUR_USD', 'M1', 500)
+    """
+
+    def __init__(self, db=None, capacity=None, prefix=None):
+        self.logger = setup_logger('SharedCandleCache')
+        self.db = db
+        self.capacity = capacity or DataConfig.SHARED_CACHE_CANDLES
+        self.prefix = prefix or DataConfig.SHARED_CACHE_PREFIX
+        self._rings = {}
+        # Detached rings whose memory is still viewed by arrays from
+        # latest(); kept mapped until close()
+        self._retired = []
+
+        self.hits = 0
+        self.misses = 0
+        self.retries = 0
+
+    def _name(self, instrument, granularity):
+        return f"{self.prefix}_{instrument}_{granularity}"
+
+    def _lock(self, name):
+        fd = os.open(os.path.join(tempfile.gettempdir(), f"{name}.lock"),
+                     os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return fd
+
+    @staticmethod
+    def _unlock(fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    def _release(self, ring):
+        ring.records = ring.header = None
+        try:
+            ring.block.close()
+        except BufferError:
+            self._retired.append(ring)
+
+    def _attach(self, instrument, granularity):
+        # None if the block does not exist or is not published yet
+        key = (instrument, granularity)
+        ring = self._rings.get(key)
+        if ring is not None and ring.header[MAGIC_FIELD] != MAGIC:
+            # Retired by unlink() in some process; the name may now
+            # belong to a new block
+            del self._rings[key]
+            self._release(ring)
+            ring = None
+        if ring is None:
+            try:
+                block = _open_block(self._name(instrument, granularity))
+            except FileNotFoundError:
+                return None
+            try:
+                ring = _Ring(block)
+            except ValueError:
+                block.close()
+                return None
+            self._rings[key] = ring
+        return ring
+
+    def _attach_or_create(self, instrument, granularity):
+        # Caller holds the series lock, so an unpublished block can only
+        # be left over from a writer that died
+        ring = self._attach(instrument, granularity)
+        if ring is None:
+            self._discard(instrument, granularity)
+            ring = self._create(instrument, granularity)
+        return ring
+
+    def _create(self, instrument, granularity):
+        size = HEADER_SIZE + 2 * self.capacity * CANDLE_RECORD.itemsize
+        block = _open_block(self._name(instrument, granularity), size)
+        header = np.ndarray(8, dtype=np.int64, buffer=block.buf)
+        header[:] = 0
+        header[CAPACITY_FIELD] = self.capacity
+        del header
+        ring = _Ring(block, check=False)
+        try:
+            if self.db is not None:
+                self._fill(ring, instrument, granularity)
+        except BaseException:
+            ring.records = ring.header = None
+            block.close()
+            _unlink_block(block)
+            raise
+        # Published last: until then readers see a miss
+        ring.header[MAGIC_FIELD] = MAGIC
+        self._rings[(instrument, granularity)] = ring
+        return ring
+
+    def _fill(self, ring, instrument, granularity):
+        with timer('shared_cache_fill_seconds'):
+            with self.db.connection() as conn:
+                df = read_latest(conn, instrument, granularity,
+                                 self.capacity)
+            if len(df):
+                ring.write(self._records(df))
+        count('shared_cache_fills_total')
+        self.logger.info("Filled %s (%s) from the database: %d candles",
+                         instrument, granularity, len(df))
+
+    def _get_or_fill(self, instrument, granularity):
+        ring = self._attach(instrument, granularity)
+        if ring is not None or self.db is None:
+            return ring
+
+        fd = self._lock(self._name(instrument, granularity))
+        try:
+            # Another process may have filled it while we waited
+            return self._attach_or_create(instrument, granularity)
+        finally:
+            self._unlock(fd)
+
+    @staticmethod
+    def _records(df):
+        records = df if isinstance(df, np.ndarray) else frame_to_records(df)
+        records = records[np.argsort(records['time'], kind='stable')]
+        if len(records) > 1:
+            # Last one wins for duplicate times
+            keep = np.concatenate((np.diff(records['time']) != 0, [True]))
+            records = records[keep]
+        return records
+
+    # Reading -------------------------------------------------------------
+
+    def latest(self, instrument, granularity, n=None, copy=False):
+        """
+        The newest `n` candles (all held if None), oldest first.
+
+        The view is consistent when returned. It stays valid while
+        fewer than capacity - n newer candles arrive, but the writer may
+        update its last candle in place; pass copy=True for a private
+        snapshot.
+
+        Returns:
+        --------
+        numpy.ndarray
+            CANDLE_RECORD rows; empty if the series is unknown and
+            cannot be filled
+        """
+        ring = self._get_or_fill(instrument, granularity)
+        if ring is None:
+            self.misses += 1
+            return np.empty(0, dtype=CANDLE_RECORD)
+
+        header = ring.header
+        for _ in range(READ_SPINS):
+            seq = header[SEQ_FIELD]
+            if seq & 1:
+                self.retries += 1
+                continue
+            window = ring.window(n)
+            if copy:
+                window = window.copy()
+            if header[SEQ_FIELD] == seq:
+                self.hits += 1
+                return window
+            self.retries += 1
+
+        # A writer kept us out: read under its lock instead
+        fd = self._lock(self._name(instrument, granularity))
+        try:
+            self.hits += 1
+            return ring.window(n).copy()
+        finally:
+            self._unlock(fd)
+
+    def latest_frame(self, instrument, granularity, n=None):
+        """latest() as a parse_candles-style DataFrame (one copy)."""
+        return records_to_frame(self.latest(instrument, granularity, n))
+
+    # Writing -------------------------------------------------------------
+
+    def update(self, df, instrument, granularity):
+        """
+        Add new candles and refresh ones already held.
+
+        A series not cached yet is first filled from the database, so
+        the ring never starts from a partial history.
+
+        Returns:
+        --------
+        int
+            Number of candles written
+        """
+        if df is None or len(df) == 0:
+            return 0
+        records = self._records(df)
+
+        fd = self._lock(self._name(instrument, granularity))
+        try:
+            ring = self._attach_or_create(instrument, granularity)
+            return ring.write(records)
+        finally:
+            self._unlock(fd)
+
+    # Lifecycle -----------------------------------------------------------
+
+    def _discard(self, instrument, granularity):
+        # Caller holds the series lock
+        ring = self._rings.pop((instrument, granularity), None)
+        if ring is not None:
+            self._release(ring)
+        try:
+            block = _open_block(self._name(instrument, granularity))
+        except FileNotFoundError:
+            return
+        if block.size >= HEADER_SIZE:
+            # Retire it for processes still attached
+            header = np.ndarray(8, dtype=np.int64, buffer=block.buf)
+            header[MAGIC_FIELD] = 0
+            del header
+        block.close()
+        _unlink_block(block)
+
+    def unlink(self, instrument, granularity):
+        """
+        Remove one series for every process. Arrays already returned by
+        latest() stay readable but no longer change.
+        """
+        fd = self._lock(self._name(instrument, granularity))
+        try:
+            self._discard(instrument, granularity)
+        finally:
+            self._unlock(fd)
+
+    def clear(self, series):
+        """Remove the given (instrument, granularity) series."""
+        for instrument, granularity in series:
+            self.unlink(instrument, granularity)
+
+    def close(self):
+        """
+        Detach from every block. Views handed out by latest() must be
+        released first.
+        """
+        rings = list(self._rings.values()) + self._retired
+        self._rings.clear()
+        self._retired = []
+        for ring in rings:
+            ring.records = ring.header = None
+            ring.block.close()
+
+    def stats(self):
+        return {
+            'series': len(self._rings),
+            'hits': self.hits,
+            'misses': self.misses,
+            'retries': self.retries,
+        }
@@ -0,0 +1,282 @@
+# src/sync.py
+"""
+Incremental sync of raw_market_data.
+
+Each (instrument, granularity) series resumes from its watermark - the
+last candle time recorded in extraction_metadata, or failing that the
+latest stored candle - so a scheduled run costs one small request per
+series instead of re-downloading a fixed count of candles.
+
+With `derive_from`, only that granularity (e.g. M1) is fetched from the
+API; the other granularities are resampled from it in the database.
+
+Run from the repository root (e.g. from cron):
+    python -m src.sync
+"""
+
+import json
+
+from config import DataConfig
+from src.db.connection import has_column, placeholder, to_db_time
+from src.db.loader import load_candles
+from src.db.reader import iter_candles
+from src.utils.logger import setup_logger
+from src.utils.metrics import REGISTRY
+from src.utils.resampler import CandleResampler, check_resample
+from src.utils.timeframes import complete_candles, to_utc
+
+logger = setup_logger('Sync')
+
+# Warn once if extraction_metadata predates the metrics column
+_metrics_column_warned = False
+
+
+def get_watermark(conn, instrument, granularity):
+    """
+    Return the time of the last stored candle for a series, or None.
+
+    Prefers the watermark of the latest successful extraction and falls
+    back to MAX(time) on raw_market_data.
+    """
+    p = placeholder(conn)
+    cursor = conn.cursor()
+
+    cursor.execute(f"""
+        SELECT last_candle_time
+        FROM extraction_metadata
+        WHERE instrument = {p} AND granularity = {p}
+          AND status = 'SUCCESS' AND last_candle_time IS NOT NULL
+        ORDER BY extraction_time DESC, id DESC
+        LIMIT 1
+    """, (instrument, granularity))
+    row = cursor.fetchone()
+
+    if row is None:
+        cursor.execute(f"""
+            SELECT MAX(time)
+            FROM raw_market_data
+            WHERE instrument = {p} AND granularity = {p}
+        """, (instrument, granularity))
+        row = cursor.fetchone()
+
+    cursor.close()
+    if row is None or row[0] is None:
+        return None
+    return to_utc(row[0])
+
+
+def record_extraction(conn, instrument, granularity, rows_extracted, status,
+                      error_message=None, last_candle_time=None,
+                      metrics=None):
+    """
+    Insert one extraction_metadata row for a sync run.
+
+    `metrics` (a MetricsRegistry.summary()) is stored as JSON in the
+    metrics column. Without it, or on a database created before that
+    column existed (see database/migrate_metrics.py), the column is left
+    out of the INSERT.
+    """
+    global _metrics_column_warned
+    p = placeholder(conn)
+    if last_candle_time is not None:
+        last_candle_time = to_db_time(conn, last_candle_time)
+
+    columns = ['instrument', 'granularity', 'rows_extracted', 'status',
+               'error_message', 'last_candle_time']
+    values = [instrument, granularity, rows_extracted, status, error_message,
+              last_candle_time]
+    if metrics is not None:
+        if has_column(conn, 'extraction_metadata', 'metrics'):
+            columns.append('metrics')
+            values.append(json.dumps(metrics, sort_keys=True))
+        elif not _metrics_column_warned:
+            _metrics_column_warned = True
+            logger.warning(
+                "⚠️  extraction_metadata has no metrics column; run "
+                "database/migrate_metrics.py to store run metrics")
+
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        INSERT INTO extraction_metadata ({', '.join(columns)})
+        VALUES ({', '.join([p] * len(values))})
+    """, values)
+    cursor.close()
+
+
+def _run_metrics(before):
+    # Timers and counters of this run alone, or None with metrics off
+    return REGISTRY.summary(since=before) if REGISTRY.enabled else None
+
+
+def sync_series(api, conn, instrument, granularity, initial_count=None,
+                cache=None):
+    """
+    Fetch and upsert candles newer than the series watermark.
+
+    The watermark candle itself is fetched again, so a candle that was
+    still forming on the previous run gets its final values. A series
+    with no history gets the latest `initial_count` candles. If a
+    BinaryCandleCache is given, the candles OANDA marks complete are
+    appended to it too.
+
+    Returns:
+    --------
+    dict
+        instrument, granularity, status, rows_extracted, watermark
+    """
+    initial_count = initial_count or DataConfig.DEFAULT_COUNT
+    result = {
+        'instrument': instrument,
+        'granularity': granularity,
+        'status': 'FAILED',
+        'rows_extracted': 0,
+        'watermark': None,
+    }
+    before = REGISTRY.snapshot()
+
+    try:
+        watermark = get_watermark(conn, instrument, granularity)
+        result['watermark'] = watermark
+
+        if watermark is None:
+            logger.info(
+                "No history for %s (%s), fetching latest %d candles",
+                instrument, granularity, initial_count)
+            df = api.get_candles(instrument, granularity=granularity,
+                                 count=initial_count, include_complete=True)
+        else:
+            df = api.get_candles_range(instrument, granularity, watermark,
+                                       include_complete=True)
+
+        if df is None:
+            raise RuntimeError("API returned no data")
+
+        rows = load_candles(conn, df, instrument, granularity)
+        if cache is not None:
+            cache.append(instrument, granularity, complete_candles(df))
+        last_candle_time = df['time'].max() if rows else watermark
+        record_extraction(conn, instrument, granularity, rows, 'SUCCESS',
+                          last_candle_time=last_candle_time,
+                          metrics=_run_metrics(before))
+        conn.commit()
+
+        result.update(status='SUCCESS', rows_extracted=rows,
+                      watermark=last_candle_time)
+        logger.info("✅ Synced %s (%s): %d rows, watermark %s", instrument,
+                    granularity, rows, last_candle_time)
+
+    except Exception as e:
+        conn.rollback()
+        logger.error("❌ Sync failed for %s (%s): %s", instrument,
+                     granularity, e)
+        record_extraction(conn, instrument, granularity, 0, 'FAILED',
+                          error_message=str(e),
+                          metrics=_run_metrics(before))
+        conn.commit()
+
+    return result
+
+
+def derive_series(conn, instrument, granularity, source_granularity='M1'):
+    """
+    Build a series from stored lower-granularity candles.
+
+    Resumes at the series watermark: the last derived bucket (which may
+    have been incomplete) and everything after it are rebuilt from the
+    source candles, streamed from the database in chunks.
+
+    Returns:
+    --------
+    dict
+        instrument, granularity, status, rows_extracted, watermark
+    """
+    result = {
+        'instrument': instrument,
+        'granularity': granularity,
+        'status': 'FAILED',
+        'rows_extracted': 0,
+        'watermark': None,
+    }
+    before = REGISTRY.snapshot()
+
+    try:
+        check_resample(source_granularity, granularity)
+        watermark = get_watermark(conn, instrument, granularity)
+        result['watermark'] = watermark
+
+        resampler = CandleResampler(granularity, source_granularity)
+        rows = 0
+        last_candle_time = watermark
+        for chunk in iter_candles(conn, instrument, source_granularity,
+                                  start=watermark):
+            df = resampler.update(chunk)
+            if df.empty:
+                continue
+            rows += load_candles(conn, df, instrument, granularity)
+            last_candle_time = df['time'].iat[-1]
+
+        record_extraction(conn, instrument, granularity, rows, 'SUCCESS',
+                          last_candle_time=last_candle_time,
+                          metrics=_run_metrics(before))
+        conn.commit()
+
+        result.update(status='SUCCESS', rows_extracted=rows,
+                      watermark=last_candle_time)
+        logger.info("✅ Derived %s (%s) from %s: %d rows, watermark %s",
+                    instrument, granularity, source_granularity, rows,
+                    last_candle_time)
+
+    except Exception as e:
+        conn.rollback()
+        logger.error("❌ Derive failed for %s (%s): %s", instrument,
+                     granularity, e)
+        record_extraction(conn, instrument, granularity, 0, 'FAILED',
+                          error_message=str(e),
+                          metrics=_run_metrics(before))
+        conn.commit()
+
+    return result
+
+
+def sync_all(api, conn, instruments=None, granularities=None, cache=None,
+             derive_from=None):
+    """
+    Incrementally sync every instrument x granularity series.
+
+    If `derive_from` is given (e.g. 'M1'), only that granularity is
+    fetched from the API and the others are derived from it with
+    derive_series, which cuts API usage to one series per instrument.
+    """
+    instruments = instruments or DataConfig.SUPPORTED_INSTRUMENTS
+    granularities = granularities or [DataConfig.DEFAULT_GRANULARITY]
+
+    if derive_from is None:
+        return [sync_series(api, conn, instrument, granularity, cache=cache)
+                for instrument in instruments
+                for granularity in granularities]
+
+    results = []
+    for instrument in instruments:
+        source = sync_series(api, conn, instrument, derive_from, cache=cache)
+        results.append(source)
+        if source['status'] != 'SUCCESS':
+            continue
+        results.extend(derive_series(conn, instrument, granularity,
+                                     derive_from)
+                       for granularity in granularities
+                       if granularity != derive_from)
+    return results
+
+
+if __name__ == "__main__":
+    from src.db.pool import get_pool
+    from src.oanda_api import OandaAPI
+
+    with get_pool().connection() as conn:
+        results = sync_all(OandaAPI(), conn)
+
+    failed = [r for r in results if r['status'] != 'SUCCESS']
+    print(f"Synced {len(results) - len(failed)}/{len(results)} series, "
+          f"{sum(r['rows_extracted'] for r in results)} rows")
+    if REGISTRY.enabled:
+        print(f"Metrics written to {REGISTRY.write_prometheus()}")
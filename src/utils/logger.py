@@ -1,22 +1,233 @@
 # src/utils/logger.py
 
+import atexit
+import json
 import logging
-from config import LogConfig, PathConfig
+import logging.handlers
+import multiprocessing
+import multiprocessing.util
 import os
+import queue
+import threading
+from datetime import datetime, timezone
+
+from config import LogConfig, PathConfig
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_lock = threading.Lock()
+_queue = None
+_handler = None
+_listener = None
+# Records from forked children, written out by the parent
+_fork_queue = None
+_fork_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time (UTC, ISO 8601), level, logger,
+    message, any fields passed as `extra`, and the traceback if any.
+    """
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    # The stock prepare() formats the whole record on the caller's
+    # thread. The queue never leaves the process, so only the message is
+    # rendered here (args may be mutated later); timestamps, JSON and
+    # tracebacks are formatted by the listener.
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _build_handlers(json_lines):
+    formatter = JsonFormatter() if json_lines else \
+        logging.Formatter(LogConfig.LOG_FORMAT, LogConfig.DATE_FORMAT)
+    handlers = []
+    if LogConfig.LOG_TO_FILE:
+        os.makedirs(os.path.dirname(LogConfig.LOG_FILE) or PathConfig.LOG_DIR,
+                    exist_ok=True)
+        handlers.append(logging.handlers.RotatingFileHandler(
+            LogConfig.LOG_FILE, maxBytes=LogConfig.MAX_LOG_FILE_SIZE,
+            backupCount=LogConfig.BACKUP_COUNT, encoding='utf-8'))
+    if LogConfig.LOG_TO_CONSOLE:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+class _ForwardHandler(logging.handlers.QueueHandler):
+    # Sends a forked child's records to the parent's writer over a pipe.
+    # Runs on the child's listener thread, so pickling stays off the
+    # callers' path. Tracebacks and odd `extra` values may not pickle:
+    # they cross as text.
+
+    def prepare(self, record):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info)
+            record.exc_info = None
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and \
+                    not isinstance(value, (str, int, float, bool, type(None))):
+                setattr(record, key, str(value))
+        return record
+
+    def enqueue(self, record):
+        self.queue.put(record)
+
+
+class _PipeListener(logging.handlers.QueueListener):
+    # multiprocessing.SimpleQueue has no timeout or *_nowait methods
+
+    def dequeue(self, block):
+        return self.queue.get()
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def _start_listener(handlers):
+    global _queue, _handler, _listener
+    _queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        _queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    if _handler is None:
+        _handler = _QueueHandler(_queue)
+    else:
+        _handler.queue = _queue
+
+
+def _start_fork_listener():
+    # Write children's records through this process's handlers
+    global _fork_listener
+    _fork_listener = _PipeListener(
+        _fork_queue, *_listener.handlers, respect_handler_level=True)
+    _fork_listener.start()
+
+
+def _before_fork():
+    global _fork_queue
+    _lock.acquire()
+    if _listener is not None and _fork_queue is None:
+        _fork_queue = multiprocessing.SimpleQueue()
+        _start_fork_listener()
+
+
+def _after_fork_in_parent():
+    _lock.release()
+
+
+def _after_fork():
+    # Forked workers (ProcessPoolExecutor) inherit the queue but not the
+    # writer thread. Their records are forwarded to the parent, the only
+    # process that writes, and rotates, the log file.
+    global _listener, _fork_queue, _fork_listener
+    _lock.release()
+    forward_to = _fork_queue
+    _fork_queue = _fork_listener = None
+    if _listener is not None:
+        _listener = None
+        _start_listener([_ForwardHandler(forward_to)])
+
+
+os.register_at_fork(before=_before_fork,
+                    after_in_parent=_after_fork_in_parent,
+                    after_in_child=_after_fork)
+
+
+def configure_logging(level=None, json_lines=None):
+    """
+    Route all logging through a background writer.
+
+    Callers only put records on an in-memory queue; a QueueListener
+    thread formats them and writes to a RotatingFileHandler
+    (LogConfig.LOG_FILE, MAX_LOG_FILE_SIZE, BACKUP_COUNT) and/or the
+    console, per LogConfig. Calling it again replaces the handlers.
+    Handlers that others added to the root logger are left alone.
+
+    Forked child processes send their records back to this process, so
+    only one process ever writes and rotates the log file.
+
+    Parameters:
+    -----------
+    level : str or int, optional
+        Root level (default LogConfig.LOG_LEVEL)
+    json_lines : bool, optional
+        JSON-lines output instead of LogConfig.LOG_FORMAT (default
+        LogConfig.LOG_JSON)
+    """
+    with _lock:
+        _configure(level, json_lines)
+
+
+def _configure(level, json_lines):
+    # Caller holds _lock
+    level = LogConfig.LOG_LEVEL if level is None else level
+    json_lines = LogConfig.LOG_JSON if json_lines is None else json_lines
+
+    shutdown_logging()
+    _start_listener(_build_handlers(json_lines))
+    if _fork_queue is not None:
+        _start_fork_listener()
+    root = logging.getLogger()
+    root.addHandler(_handler)  # no-op when already installed
+    root.setLevel(level)
+
+
+def shutdown_logging():
+    """Write out everything queued and stop the writer threads."""
+    global _listener, _fork_listener
+    if _fork_listener is not None:
+        _fork_listener.stop()
+        _fork_listener = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+# multiprocessing children leave through os._exit, skipping atexit
+multiprocessing.util.register_after_fork(
+    shutdown_logging, lambda shutdown: multiprocessing.util.Finalize(
+        None, shutdown, exitpriority=10))
 
 
 def setup_logger(name):
-    # Create log directory if it doesn't exist
-    os.makedirs(PathConfig.LOG_DIR, exist_ok=True)
-
-    # Same as before - just using config values
-    logging.basicConfig(
-        level=logging.INFO,
-        format=LogConfig.LOG_FORMAT,
-        handlers=[
-            logging.FileHandler(LogConfig.LOG_FILE),
-            logging.StreamHandler()
-        ]
-    )
+    """
+    Logger for a component; configures logging on first use.
 
+    Prefer lazy arguments on hot paths,
+        logger.info("Fetched %d candles", n, extra={'rows': n})
+    so messages below the level are never formatted.
+    """
+    if _listener is None:
+        with _lock:
+            if _listener is None:
+                _configure(None, None)
     return logging.getLogger(name)
@@ -0,0 +1,327 @@
+# src/utils/metrics.py
+"""
+In-process counters and histograms, exported in the Prometheus text
+format.
+
+Code is instrumented through the module-level helpers:
+
+    @timed('parse_candles_seconds')
+    def parse_candles(...): ...
+
+    with timer('db_write_seconds', method='copy'):
+        ...
+    count('db_rows_written_total', len(df), method='copy')
+
+With metrics disabled (MetricsConfig.ENABLED, or disable()) each helper
+returns after one flag check: timer() hands back a shared no-op context
+manager and timed() calls straight through.
+
+Metrics are per process; worker processes keep their own.
+"""
+
+import bisect
+import os
+import threading
+import time
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import MetricsConfig
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    body = ','.join('{}="{}"'.format(
+        name, str(value).replace('\\', r'\\').replace('"', r'\"')
+        .replace('\n', r'\n')) for name, value in pairs)
+    return '{' + body + '}'
+
+
+class Counter:
+    """Monotonic total per label set."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help=''):
+        self.name = name
+        self.help = help
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return {key: {'value': value}
+                    for key, value in self._values.items()}
+
+    def exposition(self):
+        return [f"{self.name}{_format_labels(key)} {sample['value']}"
+                for key, sample in self.samples().items()]
+
+
+class Histogram:
+    """
+    Observations per label set in cumulative buckets, with their count,
+    sum and max.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, help='', buckets=None):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets or MetricsConfig.BUCKETS))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [bucket counts..., +Inf], count, sum, max
+                state = self._values[key] = [
+                    [0] * (len(self.buckets) + 1), 0, 0.0, value]
+            state[0][index] += 1
+            state[1] += 1
+            state[2] += value
+            if value > state[3]:
+                state[3] = value
+
+    def samples(self):
+        with self._lock:
+            return {key: {'buckets': list(state[0]), 'count': state[1],
+                          'sum': state[2], 'max': state[3]}
+                    for key, state in self._values.items()}
+
+    def exposition(self):
+        lines = []
+        for key, sample in self.samples().items():
+            cumulative = 0
+            bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+            for bound, n in zip(bounds, sample['buckets']):
+                cumulative += n
+                lines.append(f"{self.name}_bucket"
+                             f"{_format_labels(key, [('le', bound)])} "
+                             f"{cumulative}")
+            labels = _format_labels(key)
+            lines.append(f"{self.name}_count{labels} {sample['count']}")
+            lines.append(f"{self.name}_sum{labels} {sample['sum']}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.histogram.observe(time.perf_counter() - self.start,
+                               **self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """Named metrics of one process, created on first use."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help, **kwargs)
+        if not isinstance(metric, cls):
+            raise ValueError(f"{name} is already a {metric.kind}")
+        return metric
+
+    def counter(self, name, help=''):
+        return self._get(Counter, name, help)
+
+    def histogram(self, name, help='', buckets=None):
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    def clear(self):
+        with self._lock:
+            self._metrics.clear()
+
+    def _items(self):
+        # Metrics can be created by other threads while exporting
+        with self._lock:
+            return sorted(self._metrics.items())
+
+    # Export --------------------------------------------------------------
+
+    def to_prometheus(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, metric in self._items():
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.exposition())
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path=None):
+        """
+        Write to a file, e.g. for node_exporter's textfile collector.
+        The file is replaced atomically.
+        """
+        path = path or MetricsConfig.EXPORT_FILE
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+        return path
+
+    def serve_prometheus(self, port=None, host='0.0.0.0'):
+        """
+        Serve GET /metrics from a daemon thread.
+
+        Returns:
+        --------
+        ThreadingHTTPServer
+            Call shutdown() on it to stop
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                payload = registry.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type',
+                                 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        port = MetricsConfig.HTTP_PORT if port is None else port
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    # Run summaries -------------------------------------------------------
+
+    def snapshot(self):
+        """Current samples, keyed by (metric name, label key)."""
+        return {(name, key): sample
+                for name, metric in self._items()
+                for key, sample in metric.samples().items()}
+
+    def summary(self, since=None):
+        """
+        Compact totals, optionally the change since an earlier
+        snapshot(): counters as their value, histograms as count, sum
+        and mean (max only without `since`). Keys are
+        name{label="value"}.
+        """
+        since = since or {}
+        summary = {}
+        for (name, key), sample in self.snapshot().items():
+            before = since.get((name, key))
+            label = name + _format_labels(key)
+            if 'value' in sample:
+                value = sample['value'] - (before['value'] if before else 0)
+                if value:
+                    summary[label] = value
+                continue
+
+            n = sample['count'] - (before['count'] if before else 0)
+            if not n:
+                continue
+            total = sample['sum'] - (before['sum'] if before else 0.0)
+            entry = {'count': n, 'sum': round(total, 6),
+                     'mean': round(total / n, 6)}
+            if before is None:
+                entry['max'] = round(sample['max'], 6)
+            summary[label] = entry
+        return summary
+
+
+REGISTRY = MetricsRegistry(enabled=MetricsConfig.ENABLED)
+
+
+def enable():
+    REGISTRY.enabled = True
+
+
+def disable():
+    REGISTRY.enabled = False
+
+
+def count(name, amount=1, **labels):
+    """Add to a counter."""
+    if REGISTRY.enabled:
+        REGISTRY.counter(name).inc(amount, **labels)
+
+
+def observe(name, value, **labels):
+    """Record one value in a histogram."""
+    if REGISTRY.enabled:
+        REGISTRY.histogram(name).observe(value, **labels)
+
+
+def timer(name, **labels):
+    """Context manager timing its block into a histogram, in seconds."""
+    if not REGISTRY.enabled:
+        return _NULL_TIMER
+    return _Timer(REGISTRY.histogram(name), labels)
+
+
+def timed(name, **labels):
+    """Decorator timing every call into a histogram, in seconds."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.histogram(name).observe(
+                    time.perf_counter() - start, **labels)
+        return wrapper
+    return decorator
@@ -0,0 +1,267 @@
+# src/utils/outliers.py
+
+import math
+from bisect import bisect_left, insort
+from collections import deque, namedtuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import DataConfig
+
+# Scale that makes the MAD a consistent estimator of the standard
+# deviation for normal data (Iglewicz & Hoaglin modified z-score)
+MAD_SCALE = 0.6745
+
+OutlierScore = namedtuple(
+    'OutlierScore', ['log_return', 'zscore', 'robust_zscore', 'is_outlier'])
+
+
+def _kth_smallest(left, n_left, right, n_right, k):
+    # k-th (0-based) smallest of two ascending sequences given as
+    # index -> value functions, by binary search on how many come from left
+    lo, hi = max(0, k + 1 - n_right), min(k + 1, n_left)
+    while lo < hi:
+        i = (lo + hi) // 2
+        if left(i) < right(k - i):
+            lo = i + 1
+        else:
+            hi = i
+    candidates = []
+    if lo > 0:
+        candidates.append(left(lo - 1))
+    if k + 1 - lo > 0:
+        candidates.append(right(k - lo))
+    return max(candidates)
+
+
+def _is_outlier(zscore, robust_zscore, z_threshold, mad_threshold):
+    # NaN scores (too little history, zero spread) never flag
+    return bool(abs(zscore) > z_threshold or
+                abs(robust_zscore) > mad_threshold)
+
+
+class RollingOutlierDetector:
+    """
+    Incremental outlier detector over the log returns of close prices.
+
+    Each new return is scored against the previous `window` returns
+    before joining them, with two scores:
+
+    - a rolling z-score, (r - mean) / std, where mean and variance are
+      kept by adding and removing values (Welford), O(1) per candle
+    - a robust z-score, 0.6745 * (r - median) / MAD, from a sorted copy
+      of the window; the median is an index lookup and the MAD a binary
+      search over the deviations on either side of it, so the cost per
+      candle is a bisect insert/remove plus O(log window)
+
+    Scoring returns rather than price levels keeps the detector
+    meaningful across trends and regime changes.
+
+    Usage:
+        detector = RollingOutlierDetector()
+        for close in closes:
+            score = detector.update(close)
+            if score.is_outlier:
+                ...
+    """
+
+    def __init__(self, window=None, z_threshold=None, mad_threshold=None,
+                 min_periods=None):
+        self.window = window or DataConfig.OUTLIER_WINDOW
+        self.z_threshold = z_threshold or DataConfig.OUTLIER_ZSCORE
+        self.mad_threshold = mad_threshold or DataConfig.OUTLIER_MAD
+        self.min_periods = max(
+            2, min(min_periods or DataConfig.OUTLIER_MIN_PERIODS,
+                   self.window))
+
+        self.last_close = None
+        self._returns = deque()
+        self._sorted = []
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self):
+        return len(self._returns)
+
+    def _push(self, value):
+        self._returns.append(value)
+        insort(self._sorted, value)
+        n = len(self._returns)
+        delta = value - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (value - self._mean)
+
+        if n > self.window:
+            old = self._returns.popleft()
+            del self._sorted[bisect_left(self._sorted, old)]
+            n -= 1
+            delta = old - self._mean
+            self._mean -= delta / n
+            self._m2 -= delta * (old - self._mean)
+
+    def _median(self):
+        values, n = self._sorted, len(self._sorted)
+        if n % 2:
+            return values[n // 2]
+        return (values[n // 2 - 1] + values[n // 2]) / 2
+
+    def _mad(self, median):
+        # Deviations below the median, nearest first, and above it are
+        # both ascending; the MAD is the median of their union
+        values, n = self._sorted, len(self._sorted)
+        split = bisect_left(values, median)
+
+        def below(i):
+            return median - values[split - 1 - i]
+
+        def above(i):
+            return values[split + i] - median
+
+        k = n // 2
+        mad = _kth_smallest(below, split, above, n - split, k)
+        if n % 2 == 0:
+            mad = (mad + _kth_smallest(below, split, above, n - split,
+                                       k - 1)) / 2
+        return mad
+
+    def stats(self):
+        """Current window (mean, std, median, mad); NaN below min_periods."""
+        n = len(self._returns)
+        if n < self.min_periods:
+            return (math.nan,) * 4
+        # Removing values leaves rounding residue in M2, so a window of
+        # identical returns is special-cased to an exact zero spread
+        std = 0.0 if self._sorted[0] == self._sorted[-1] \
+            else math.sqrt(max(self._m2, 0.0) / (n - 1))
+        median = self._median()
+        return self._mean, std, median, self._mad(median)
+
+    def update(self, close):
+        """
+        Score one close and add its return to the window.
+
+        Returns:
+        --------
+        OutlierScore
+            log_return, zscore, robust_zscore and is_outlier. Scores are
+            NaN for the first candle, for NaN closes (which are skipped)
+            and until min_periods returns have been seen.
+        """
+        close = float(close)
+        if math.isnan(close) or close <= 0:
+            return OutlierScore(math.nan, math.nan, math.nan, False)
+        if self.last_close is None:
+            self.last_close = close
+            return OutlierScore(math.nan, math.nan, math.nan, False)
+
+        value = math.log(close / self.last_close)
+        self.last_close = close
+
+        zscore = robust_zscore = math.nan
+        mean, std, median, mad = self.stats()
+        if std > 0:
+            zscore = (value - mean) / std
+        if mad > 0:
+            robust_zscore = MAD_SCALE * (value - median) / mad
+
+        self._push(value)
+        return OutlierScore(value, zscore, robust_zscore,
+                            _is_outlier(zscore, robust_zscore,
+                                        self.z_threshold, self.mad_threshold))
+
+    def warm_up(self, closes):
+        """Feed historical closes without scoring them (e.g. after restart)."""
+        for close in closes:
+            close = float(close)
+            if math.isnan(close) or close <= 0:
+                continue
+            if self.last_close is not None:
+                self._push(math.log(close / self.last_close))
+            self.last_close = close
+
+
+def _rolling_mad(values, median, window, min_periods, block=65_536):
+    # MAD of values[max(0, i - window + 1):i + 1] about median[i]
+    n = len(values)
+    mad = np.full(n, np.nan)
+
+    # Partial windows at the start
+    for i in range(min_periods - 1, min(window - 1, n)):
+        mad[i] = np.median(np.abs(values[:i + 1] - median[i]))
+
+    # Full windows in blocks, bounding the (block, window) temporaries;
+    # a partial sort puts the middle deviations in place
+    if n >= window:
+        middle = [(window - 1) // 2, window // 2]
+        windows = sliding_window_view(values, window)
+        for start in range(0, len(windows), block):
+            stop = min(start + block, len(windows))
+            deviations = np.abs(windows[start:stop] - median[
+                window - 1 + start:window - 1 + stop, None])
+            deviations.partition(middle, axis=1)
+            mad[window - 1 + start:window - 1 + stop] = \
+                deviations[:, middle].mean(axis=1)
+
+    return mad
+
+
+def rolling_outliers(close, window=None, z_threshold=None, mad_threshold=None,
+                     min_periods=None):
+    """
+    Vectorized equivalent of RollingOutlierDetector for backfills.
+
+    Parameters:
+    -----------
+    close : pandas.Series or array-like
+        Close prices in time order
+    window, z_threshold, mad_threshold, min_periods
+        As for RollingOutlierDetector (DataConfig defaults)
+
+    Returns:
+    --------
+    pandas.DataFrame
+        log_return, zscore, robust_zscore and is_outlier, aligned with
+        `close`; the same values update() would produce candle by candle
+    """
+    window = window or DataConfig.OUTLIER_WINDOW
+    z_threshold = z_threshold or DataConfig.OUTLIER_ZSCORE
+    mad_threshold = mad_threshold or DataConfig.OUTLIER_MAD
+    min_periods = max(2, min(min_periods or DataConfig.OUTLIER_MIN_PERIODS,
+                             window))
+
+    close = pd.Series(close, dtype='float64')
+    result = pd.DataFrame(np.nan, index=close.index,
+                          columns=['log_return', 'zscore', 'robust_zscore'])
+    result['is_outlier'] = False
+
+    valid = close[close > 0]
+    if len(valid) < 2:
+        return result
+
+    values = np.diff(np.log(valid.to_numpy()))
+    returns = pd.Series(values)
+
+    # Window stats over returns up to and including i score return i + 1
+    rolling = returns.rolling(window, min_periods=min_periods)
+    mean = rolling.mean().shift(1).to_numpy()
+    std = rolling.std().where(rolling.max() > rolling.min(), 0.0) \
+        .shift(1).to_numpy()
+    median = rolling.median().to_numpy()
+    mad = _rolling_mad(values, median, window, min_periods)
+    median = np.concatenate(([np.nan], median[:-1]))
+    mad = np.concatenate(([np.nan], mad[:-1]))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zscore = np.where(std > 0, (values - mean) / std, np.nan)
+        robust_zscore = np.where(mad > 0,
+                                 MAD_SCALE * (values - median) / mad, np.nan)
+
+    index = valid.index[1:]
+    result.loc[index, 'log_return'] = values
+    result.loc[index, 'zscore'] = zscore
+    result.loc[index, 'robust_zscore'] = robust_zscore
+    result.loc[index, 'is_outlier'] = (np.abs(zscore) > z_threshold) | \
+        (np.abs(robust_zscore) > mad_threshold)
+    return result
@@ -0,0 +1,248 @@
+# src/utils/resampler.py
+
+import numpy as np
+import pandas as pd
+
+from config import DataConfig
+from src.utils.logger import setup_logger
+from src.utils.parsers import parse_candles
+from src.utils.timeframes import GRANULARITY_SECONDS, to_utc
+
+logger = setup_logger('Resampler')
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+            'Saturday', 'Sunday']
+
+# Granularities whose candles start on the trading day boundary
+# (DataConfig.DAILY_ALIGNMENT) rather than on a UTC multiple
+ALIGNED_GRANULARITIES = ('H4', 'D', 'W', 'M')
+
+HOUR_NS = 3600 * 10**9
+DAY_NS = 24 * HOUR_NS
+
+
+def _day_shift_ns():
+    # Shifting wall-clock time forward by this much moves the trading day
+    # boundary (17:00) to midnight, so trading days floor like calendar days
+    return (24 - DataConfig.DAILY_ALIGNMENT) % 24 * HOUR_NS
+
+
+def _week_start_day():
+    # Weekday, in shifted wall-clock time, on which a trading week starts:
+    # the week opening Friday 17:00 starts on shifted Saturday 00:00
+    weekday = WEEKDAYS.index(DataConfig.WEEKLY_ALIGNMENT)
+    return (weekday + 1) % 7 if _day_shift_ns() else weekday
+
+
+def check_resample(source_granularity, granularity):
+    """
+    Raise ValueError unless `granularity` candles can be built exactly
+    from `source_granularity` candles.
+    """
+    for name in (source_granularity, granularity):
+        if name not in GRANULARITY_SECONDS:
+            raise ValueError(f"Unsupported granularity: {name}")
+
+    source = GRANULARITY_SECONDS[source_granularity]
+    target = GRANULARITY_SECONDS[granularity]
+    if source_granularity in ('W', 'M') or source >= target:
+        raise ValueError(
+            f"Cannot build {granularity} from {source_granularity} candles")
+    # Trading-day buckets need sources that nest inside an hour grid
+    # aligned to DAILY_ALIGNMENT; shorter buckets must be multiples
+    if granularity in ALIGNED_GRANULARITIES:
+        limit = GRANULARITY_SECONDS['H4'] if granularity == 'H4' \
+            else GRANULARITY_SECONDS['D']
+        if limit % source:
+            raise ValueError(
+                f"Cannot build {granularity} from {source_granularity} "
+                f"candles")
+    elif target % source:
+        raise ValueError(
+            f"Cannot build {granularity} from {source_granularity} candles")
+
+
+def _trading_clock(times):
+    """
+    Wall-clock nanoseconds in DataConfig.ALIGNMENT_TIMEZONE (naive
+    times are UTC), shifted so the trading day starts at midnight.
+    Trading days are then whole days, Monday to Friday, whatever DST
+    does; the weekly FX closure (Friday to Sunday at DAILY_ALIGNMENT)
+    is the shifted Saturday and Sunday.
+    """
+    index = pd.DatetimeIndex(times).as_unit('ns')
+    if index.tz is None:
+        index = index.tz_localize('UTC')
+    return index.tz_convert(DataConfig.ALIGNMENT_TIMEZONE) \
+        .tz_localize(None).asi8 + _day_shift_ns()
+
+
+def _bucket_keys(times, granularity):
+    """
+    One int64 key per candle identifying its bucket; keys are
+    non-decreasing for time-ordered input.
+
+    Intraday buckets up to H1 floor UTC nanoseconds. H4/D/W/M floor the
+    trading clock (see _trading_clock), which follows DST the way
+    OANDA's alignment does.
+    """
+    index = pd.DatetimeIndex(times).as_unit('ns')
+    if granularity not in ALIGNED_GRANULARITIES:
+        step = GRANULARITY_SECONDS[granularity] * 10**9
+        return index.asi8 // step * step
+
+    wall = _trading_clock(index)
+    if granularity == 'H4':
+        return wall // (4 * HOUR_NS) * (4 * HOUR_NS)
+
+    days = wall // DAY_NS
+    if granularity == 'D':
+        return days * DAY_NS
+    if granularity == 'W':
+        # 1970-01-01 was a Thursday (weekday 3)
+        days -= (days + 3 - _week_start_day()) % 7
+        return days * DAY_NS
+    months = wall.astype('datetime64[ns]').astype('datetime64[M]')
+    return months.astype('datetime64[ns]').view('int64')
+
+
+def _bucket_times(keys, granularity):
+    # Bucket keys (one per bucket) back to UTC start times
+    if granularity not in ALIGNED_GRANULARITIES:
+        return pd.DatetimeIndex(keys, tz='UTC')
+
+    wall = pd.DatetimeIndex(keys - _day_shift_ns())
+    # An H4 start can fall in the repeated hour when clocks go back;
+    # the bucket opens at its first occurrence (still on DST)
+    return wall.tz_localize(DataConfig.ALIGNMENT_TIMEZONE,
+                            ambiguous=np.ones(len(wall), dtype=bool),
+                            nonexistent='shift_forward').tz_convert('UTC')
+
+
+def bucket_start(time, granularity):
+    """Start time (UTC) of the `granularity` candle containing `time`."""
+    key = _bucket_keys(pd.DatetimeIndex([to_utc(time)]), granularity)
+    return _bucket_times(key, granularity)[0]
+
+
+def resample_candles(df, granularity, source_granularity=None):
+    """
+    Build `granularity` candles from lower-granularity candles.
+
+    Buckets are found with integer arithmetic on the time column and
+    aggregated in a single pass with ufunc.reduceat: open = first,
+    high = max, low = min, close = last, volume = sum. H4, D, W and M
+    candles follow OANDA's alignment (DataConfig.DAILY_ALIGNMENT in
+    ALIGNMENT_TIMEZONE, weeks from WEEKLY_ALIGNMENT), e.g. daily candles
+    open at 21:00 UTC in summer and 22:00 UTC in winter.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Candles with time, open, high, low, close, volume
+    granularity : str
+        Target granularity (e.g. 'H1', 'D')
+    source_granularity : str, optional
+        Granularity of `df`, checked against the target when given
+
+    Returns:
+    --------
+    pandas.DataFrame
+        time, open, high, low, close, volume; the last candle may still
+        be forming if the source data stops mid-bucket
+    """
+    if source_granularity is not None:
+        check_resample(source_granularity, granularity)
+    if granularity not in GRANULARITY_SECONDS:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    if df is None or df.empty:
+        return parse_candles([])
+    return pd.DataFrame(_aggregate(df, granularity))
+
+
+def _aggregate(df, granularity):
+    # Column arrays of the resampled candles, oldest first
+    if not df['time'].is_monotonic_increasing:
+        df = df.sort_values('time', kind='stable')
+
+    keys = _bucket_keys(df['time'], granularity)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    ends = np.concatenate((starts[1:], [len(keys)])) - 1
+
+    # fmax/fmin skip NaN prices instead of propagating them
+    return {
+        'time': _bucket_times(keys[starts], granularity),
+        'open': df['open'].to_numpy(dtype=np.float64)[starts],
+        'high': np.fmax.reduceat(df['high'].to_numpy(dtype=np.float64),
+                                 starts),
+        'low': np.fmin.reduceat(df['low'].to_numpy(dtype=np.float64),
+                                starts),
+        'close': df['close'].to_numpy(dtype=np.float64)[ends],
+        'volume': np.add.reduceat(df['volume'].to_numpy(dtype=np.int64),
+                                  starts),
+    }
+
+
+class CandleResampler:
+    """
+    Incremental resampler for one target granularity.
+
+    Keeps only the last (possibly still forming) bucket between calls.
+    Each update() aggregates just the new source candles and folds the
+    first resulting bucket into the kept one when they share a start,
+    so the cost is proportional to the new data, not the history.
+
+    Usage:
+        resampler = CandleResampler('H1', source_granularity='M1')
+        for chunk in m1_chunks:
+            changed = resampler.update(chunk)   # upsert these rows
+    """
+
+    def __init__(self, granularity, source_granularity=None):
+        if source_granularity is not None:
+            check_resample(source_granularity, granularity)
+        self.granularity = granularity
+        self.source_granularity = source_granularity
+        self.last_time = None
+        self.current = None
+
+    def update(self, df):
+        """
+        Fold new source candles in.
+
+        Source candles at or before the last one seen are dropped: a
+        revised candle inside an earlier bucket needs that bucket rebuilt
+        with resample_candles from its bucket_start().
+
+        Returns:
+        --------
+        pandas.DataFrame
+            Buckets that changed, oldest first: the previously open
+            bucket (if it received candles) and any new ones
+        """
+        if df is None or df.empty:
+            return parse_candles([])
+
+        if self.last_time is not None:
+            late = df['time'] <= self.last_time
+            if late.any():
+                logger.warning(
+                    "⚠️  Dropping %d %s source candle(s) at or before %s",
+                    int(late.sum()), self.granularity, self.last_time)
+                df = df[~late]
+                if df.empty:
+                    return parse_candles([])
+
+        out = _aggregate(df, self.granularity)
+        self.last_time = df['time'].iat[-1] \
+            if df['time'].is_monotonic_increasing else df['time'].max()
+
+        current = self.current
+        if current is not None and out['time'][0] == current['time']:
+            out['open'][0] = current['open']
+            out['high'][0] = np.fmax(out['high'][0], current['high'])
+            out['low'][0] = np.fmin(out['low'][0], current['low'])
+            out['volume'][0] += current['volume']
+
+        self.current = {name: values[-1] for name, values in out.items()}
+        return pd.DataFrame(out)
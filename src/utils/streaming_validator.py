@@ -0,0 +1,273 @@
+# src/utils/streaming_validator.py
+
+import numpy as np
+import pandas as pd
+
+from src.utils.validators import (
+    _classify_gaps, _count_outliers, _gap_step, _has_ohlc, _infer_granularity,
+    build_report, collect_counts)
+
+SERIES_KEYS = ('instrument', 'granularity')
+
+
+def _prepare(chunk):
+    # CSV and DB readers hand back times as strings or datetime objects
+    if 'time' in chunk and chunk['time'].dtype.kind != 'M':
+        chunk = chunk.assign(time=pd.to_datetime(chunk['time'], utc=True))
+    return chunk
+
+
+class StreamingValidator:
+    """
+    validate_data over a sequence of chunks in constant memory.
+
+    Each chunk is checked on its own with collect_counts; what crosses a
+    chunk boundary is handled from a small amount of state per series:
+
+    - null, duplicate, ordering, gap and OHLC counts are summed
+    - close mean/variance are kept as running (count, mean, M2) and
+      combined with Chan's parallel form of Welford's update
+    - the first and last time of every (instrument, granularity) series
+      is kept, and the step from one chunk's last bar to the next chunk's
+      first bar goes through the same duplicate/ordering/gap checks as
+      the steps within a chunk
+
+    Validators fed by parallel workers combine with merge(), in any
+    order: each keeps its stretch of a series as a (first, last) segment,
+    and report() stitches the segments of a series in time order, so
+    each worker should cover a contiguous stretch of time (e.g. one
+    month each).
+
+    Close outliers need the final mean/std, so they take a second pass
+    over the data through update_outliers(); without it the report has
+    outlier_count None. For chunks that are sorted by series and time
+    the report equals validate_data on the concatenated frame.
+
+    Usage:
+        validator = StreamingValidator('M1')
+        for chunk in api.iter_candles_range('EUR_USD', 'M1', start):
+            validator.update(chunk)
+        report = validator.report()
+    """
+
+    def __init__(self, granularity=None, outlier_threshold=3):
+        self.granularity = granularity
+        self.outlier_threshold = outlier_threshold
+
+        self.counts = {
+            'rows': 0,
+            'cells': 0,
+            'null_count': 0,
+            'duplicate_count': 0,
+            'non_monotonic': 0,
+            'gap_count': 0,
+            'missing_bars': 0,
+            'weekend_gaps': 0,
+        }
+        self.invalid_high = None
+        self.invalid_low = None
+        self.duplicate_key = None
+        self.outlier_count = None
+
+        # Running close statistics
+        self.close_count = 0
+        self.close_mean = 0.0
+        self.close_m2 = 0.0
+
+        # series key -> [first_time, last_time] segments (int64 ns), sorted
+        # by first_time; update() extends the last one
+        self.series = {}
+
+    # ------------------------------------------------------------------
+    # Accumulation
+    # ------------------------------------------------------------------
+
+    def update(self, chunk):
+        """
+        Fold one chunk of candles into the running state.
+
+        Parameters:
+        -----------
+        chunk : pandas.DataFrame
+            Candles with the same columns validate_data accepts
+        """
+        chunk = _prepare(chunk)
+        if self.granularity is None:
+            self.granularity = _infer_granularity(chunk)
+        if self.duplicate_key is None:
+            self.duplicate_key = [name for name in SERIES_KEYS
+                                  if name in chunk] + ['time']
+
+        counts = collect_counts(chunk, self.granularity)
+        for name in self.counts:
+            self.counts[name] += counts[name]
+        if _has_ohlc(chunk):
+            self.invalid_high = (self.invalid_high or 0) + \
+                counts['invalid_high']
+            self.invalid_low = (self.invalid_low or 0) + counts['invalid_low']
+
+        if 'close' in chunk:
+            close = chunk['close'].to_numpy(dtype=np.float64)
+            close = close[~np.isnan(close)]
+            if len(close):
+                self._merge_moments(len(close), close.mean(),
+                                    float(((close - close.mean()) ** 2).sum()))
+
+        if 'time' in chunk and len(chunk):
+            for key, first, last in self._chunk_bounds(chunk):
+                self._join_series(key, first, last)
+
+    def _chunk_bounds(self, chunk):
+        # First/last bar time of every series in the chunk, in row order
+        keys = [name for name in SERIES_KEYS if name in chunk]
+        times = chunk['time'].to_numpy(dtype='datetime64[ns]').view('int64')
+        valid = times != np.iinfo(np.int64).min
+        if not keys:
+            if valid.any():
+                times = times[valid]
+                yield (), int(times[0]), int(times[-1])
+            return
+
+        frame = chunk.loc[valid, keys].assign(_time=times[valid])
+        bounds = frame.groupby(keys, sort=False)['_time'].agg(['first',
+                                                              'last'])
+        for key, first, last in zip(bounds.index, bounds['first'],
+                                    bounds['last']):
+            yield (key if isinstance(key, tuple) else (key,),
+                   int(first), int(last))
+
+    def _join_series(self, key, first, last):
+        segments = self.series.get(key)
+        if segments is None:
+            self.series[key] = [[first, last]]
+            return
+        self._check_boundary(self.counts, segments[-1][1], first)
+        segments[-1][1] = last
+
+    def _check_boundary(self, counts, before, after):
+        # The step between two chunks, checked like a step within one
+        diff = after - before
+        if diff == 0:
+            counts['duplicate_count'] += 1
+        elif diff < 0:
+            counts['non_monotonic'] += 1
+        else:
+            step = _gap_step(self.granularity)
+            if step is not None and diff > step:
+                gap_count, missing_bars, weekend_gaps = _classify_gaps(
+                    np.array([before]), np.array([after]), step)
+                counts['gap_count'] += gap_count
+                counts['missing_bars'] += missing_bars
+                counts['weekend_gaps'] += weekend_gaps
+
+    def _merge_moments(self, count, mean, m2):
+        # Chan et al. pairwise combination of (count, mean, M2)
+        total = self.close_count + count
+        delta = mean - self.close_mean
+        self.close_m2 += m2 + delta * delta * self.close_count * count / total
+        self.close_mean += delta * count / total
+        self.close_count = total
+
+    def merge(self, other):
+        """
+        Fold another validator's state into this one.
+
+        Returns:
+        --------
+        StreamingValidator
+            self, so results from several workers can be reduced
+        """
+        self.granularity = self.granularity or other.granularity
+        self.duplicate_key = self.duplicate_key or other.duplicate_key
+
+        for name in self.counts:
+            self.counts[name] += other.counts[name]
+        if other.invalid_high is not None:
+            self.invalid_high = (self.invalid_high or 0) + other.invalid_high
+            self.invalid_low = (self.invalid_low or 0) + other.invalid_low
+        if other.close_count:
+            self._merge_moments(other.close_count, other.close_mean,
+                                other.close_m2)
+
+        for key, segments in other.series.items():
+            merged = self.series.setdefault(key, [])
+            merged.extend([first, last] for first, last in segments)
+            merged.sort()
+
+        # Outlier counts only add up once both sides used the same
+        # final statistics, so a merge resets them
+        self.outlier_count = None
+        return self
+
+    # ------------------------------------------------------------------
+    # Second pass and report
+    # ------------------------------------------------------------------
+
+    def close_stats(self):
+        """Running close (mean, sample std); std is NaN below two values."""
+        if self.close_count < 2:
+            return self.close_mean, float('nan')
+        return self.close_mean, (self.close_m2 / (self.close_count - 1)) ** 0.5
+
+    def update_outliers(self, chunk):
+        """
+        Count close outliers in a chunk against the final statistics.
+
+        Call only after every chunk has gone through update()/merge().
+        """
+        if self.outlier_count is None:
+            self.outlier_count = 0
+        if 'close' not in chunk or self.close_count < 2:
+            return
+        close = chunk['close'].to_numpy(dtype=np.float64)
+        mean, std = self.close_stats()
+        self.outlier_count += _count_outliers(close[~np.isnan(close)], mean,
+                                              std, self.outlier_threshold)
+
+    def report(self):
+        """Same structure as validate_data's result."""
+        counts = dict(self.counts)
+        for segments in self.series.values():
+            for before, after in zip(segments[:-1], segments[1:]):
+                self._check_boundary(counts, before[1], after[0])
+
+        counts.update(duplicate_key=self.duplicate_key or ['time'],
+                      granularity=self.granularity,
+                      invalid_high=self.invalid_high,
+                      invalid_low=self.invalid_low)
+        if self.close_count:
+            counts['outlier_count'] = 0 if self.close_count < 2 \
+                else self.outlier_count
+        return build_report(counts)
+
+
+def validate_stream(chunks, granularity=None, outlier_threshold=3):
+    """
+    Validate an iterable of candle chunks in constant memory.
+
+    Parameters:
+    -----------
+    chunks : iterable of pandas.DataFrame, or callable
+        The chunks, e.g. iter_candles_range(), pd.read_csv(chunksize=...),
+        CandleStore.iter_batches() or db.reader.iter_candles(). Pass a
+        zero-argument callable returning a fresh iterator to get exact
+        close outliers from a second pass.
+    granularity : str, optional
+        As for validate_data
+    outlier_threshold : float
+        Z-score beyond which a close is counted as an outlier
+
+    Returns:
+    --------
+    dict
+        Same structure as validate_data
+    """
+    validator = StreamingValidator(granularity, outlier_threshold)
+    for chunk in (chunks() if callable(chunks) else chunks):
+        validator.update(chunk)
+
+    if callable(chunks):
+        for chunk in chunks():
+            validator.update_outliers(chunk)
+
+    return validator.report()
@@ -0,0 +1,320 @@
+# src/utils/tick_aggregator.py
+
+import math
+import time
+
+import pandas as pd
+
+from config import DataConfig
+from src.utils.logger import setup_logger
+from src.utils.resampler import ALIGNED_GRANULARITIES, bucket_start, \
+    check_resample
+from src.utils.streaming_validator import StreamingValidator
+from src.utils.timeframes import GRANULARITY_SECONDS, \
+    granularity_to_timedelta
+
+logger = setup_logger('TickAggregator')
+
+MINUTE_NS = 60 * 10**9
+BATCH_COLUMNS = ['instrument', 'granularity', 'time', 'open', 'high', 'low',
+                 'close', 'volume']
+CANDLE_COLUMNS = BATCH_COLUMNS[2:]
+
+
+class _Candle:
+    # One open candle; first/last are the times of the earliest and
+    # latest tick, so reordered ticks still land in open and close
+    __slots__ = ('start', 'end', 'open', 'high', 'low', 'close', 'first',
+                 'last', 'volume')
+
+    def __init__(self):
+        self.start = -1  # -1 = free slot
+
+
+class _Series:
+    # Per-instrument state: a ring of M1 slots covering the lateness
+    # window, and one accumulator per higher granularity
+    __slots__ = ('instrument', 'slots', 'higher', 'watermark', 'horizon',
+                 'next_check')
+
+    def __init__(self, instrument, ring_size, higher_count):
+        self.instrument = instrument
+        self.slots = [_Candle() for _ in range(ring_size)]
+        self.higher = [_Candle() for _ in range(higher_count)]
+        self.watermark = -1
+        self.horizon = -1
+        self.next_check = -1
+
+
+def bucket_bounds(start_ns, granularity):
+    """[start, end) of the `granularity` bucket containing start_ns, in ns."""
+    if granularity not in ALIGNED_GRANULARITIES:
+        step = GRANULARITY_SECONDS[granularity] * 10**9
+        start = start_ns // step * step
+        return start, start + step
+
+    start = bucket_start(pd.Timestamp(start_ns, tz='UTC'), granularity)
+    # One hour past the nominal length always lands in the next bucket,
+    # whatever DST or the month length does
+    end = bucket_start(start + granularity_to_timedelta(granularity) +
+                       pd.Timedelta(hours=1), granularity)
+    return start.value, end.value
+
+
+class TickAggregator:
+    """
+    Real-time candles for many instruments and granularities from ticks.
+
+    Each tick touches a single M1 candle: a few comparisons on a
+    preallocated __slots__ object from a per-instrument ring, with no
+    allocation. Higher granularities (aligned like resample_candles)
+    are built by folding in each M1 candle once it is final, which
+    happens at most once a minute per instrument.
+
+    Out-of-order ticks: a candle stays open until the instrument's
+    newest tick is `lateness` seconds past the candle's end, and ticks
+    within that window update it, including open/close when they are
+    earlier/later than what it holds. Ticks for candles already closed
+    are dropped and counted in `late`.
+
+    Completed candles are buffered and handed over in micro-batches,
+    one DataFrame per series, to each sink(df, instrument, granularity)
+    (CandleStore.append fits) and to a StreamingValidator per
+    granularity when validate=True. A batch goes out when it holds
+    batch_size candles, when its oldest candle has waited max_delay
+    seconds (checked as candles close and in poll()), or on flush().
+
+    Usage:
+        aggregator = TickAggregator(sinks=[store.append], validate=True)
+        async with api.price_stream(instruments) as stream:
+            await aggregator.consume(stream)
+    """
+
+    def __init__(self, granularities=None, lateness=None, sinks=(),
+                 validate=False, batch_size=None, max_delay=None):
+        granularities = list(granularities or DataConfig.SUPPORTED_TIMEFRAMES)
+        for granularity in granularities:
+            if granularity != 'M1':
+                check_resample('M1', granularity)
+        self.granularities = granularities
+        self.emit_m1 = 'M1' in granularities
+        self.higher = [g for g in granularities if g != 'M1']
+
+        lateness = DataConfig.TICK_LATENESS if lateness is None else lateness
+        self.lateness = int(lateness * 1e9)
+        self.ring_size = math.ceil(self.lateness / MINUTE_NS) + 2
+
+        self.sinks = list(sinks)
+        self.validators = {g: StreamingValidator(g) for g in granularities} \
+            if validate else {}
+        self.batch_size = batch_size or DataConfig.CANDLE_BATCH_SIZE
+        self.max_delay = DataConfig.CANDLE_BATCH_DELAY \
+            if max_delay is None else max_delay
+
+        self._series = {}
+        self._batch = []
+        self._batch_started = None
+
+        self.ticks = 0
+        self.late = 0
+        self.candles = 0
+
+    # Ticks ---------------------------------------------------------------
+
+    def update(self, instrument, time_ns, price):
+        """
+        Fold one tick in.
+
+        Returns:
+        --------
+        bool
+            False if the tick was too late and dropped
+        """
+        series = self._series.get(instrument)
+        if series is None:
+            series = self._series[instrument] = _Series(
+                instrument, self.ring_size, len(self.higher))
+
+        if time_ns > series.watermark:
+            series.watermark = time_ns
+            series.horizon = time_ns - self.lateness
+            if series.horizon >= series.next_check:
+                self._finalize(series, series.horizon)
+
+        minute = time_ns // MINUTE_NS
+        if (minute + 1) * MINUTE_NS <= series.horizon:
+            self.late += 1
+            return False
+        self.ticks += 1
+
+        candle = series.slots[minute % self.ring_size]
+        if candle.start != minute:
+            candle.start = minute
+            candle.open = candle.high = candle.low = candle.close = price
+            candle.first = candle.last = time_ns
+            candle.volume = 1
+            return True
+
+        candle.volume += 1
+        if price > candle.high:
+            candle.high = price
+        if price < candle.low:
+            candle.low = price
+        if time_ns >= candle.last:
+            candle.close = price
+            candle.last = time_ns
+        elif time_ns < candle.first:
+            candle.open = price
+            candle.first = time_ns
+        return True
+
+    def update_tick(self, tick):
+        """Fold in a PriceStream Tick at its mid price."""
+        return self.update(tick.instrument, tick.time,
+                           (tick.bid + tick.ask) * 0.5)
+
+    async def consume(self, stream, poll_every=1000):
+        """Aggregate ticks from a PriceStream until it ends."""
+        count = 0
+        async for tick in stream:
+            self.update_tick(tick)
+            count += 1
+            if count % poll_every == 0:
+                self.poll()
+        self.flush()
+
+    # Closing candles -----------------------------------------------------
+
+    def _finalize(self, series, horizon):
+        # M1 candles ending by the horizon, oldest first (the ring holds
+        # only a handful)
+        done = sorted((candle for candle in series.slots
+                       if candle.start >= 0 and
+                       (candle.start + 1) * MINUTE_NS <= horizon),
+                      key=lambda candle: candle.start)
+        for candle in done:
+            start = candle.start * MINUTE_NS
+            if self.emit_m1:
+                self._emit(series.instrument, 'M1', start, candle)
+            for granularity, bucket in zip(self.higher, series.higher):
+                self._fold(series.instrument, granularity, bucket, start,
+                           candle)
+            candle.start = -1
+
+        for granularity, bucket in zip(self.higher, series.higher):
+            if bucket.start >= 0 and bucket.end <= horizon:
+                self._emit(series.instrument, granularity, bucket.start,
+                           bucket)
+                bucket.start = -1
+
+        series.next_check = (horizon // MINUTE_NS + 1) * MINUTE_NS
+        if self._batch and (time.monotonic() - self._batch_started
+                            >= self.max_delay):
+            self.flush()
+
+    def _fold(self, instrument, granularity, bucket, start, candle):
+        if bucket.start >= 0 and start >= bucket.end:
+            self._emit(instrument, granularity, bucket.start, bucket)
+            bucket.start = -1
+
+        if bucket.start < 0:
+            bucket.start, bucket.end = bucket_bounds(start, granularity)
+            bucket.open = candle.open
+            bucket.high = candle.high
+            bucket.low = candle.low
+            bucket.volume = candle.volume
+        else:
+            if candle.high > bucket.high:
+                bucket.high = candle.high
+            if candle.low < bucket.low:
+                bucket.low = candle.low
+            bucket.volume += candle.volume
+        bucket.close = candle.close
+
+    def _emit(self, instrument, granularity, start, candle):
+        if not self._batch:
+            self._batch_started = time.monotonic()
+        self._batch.append((instrument, granularity, start, candle.open,
+                            candle.high, candle.low, candle.close,
+                            candle.volume))
+        self.candles += 1
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def advance(self, time_ns):
+        """
+        Move every instrument's clock to at least time_ns (e.g. the wall
+        clock), closing candles of instruments that have gone quiet.
+        """
+        for series in self._series.values():
+            if time_ns > series.watermark:
+                series.watermark = time_ns
+                series.horizon = time_ns - self.lateness
+                if series.horizon >= series.next_check:
+                    self._finalize(series, series.horizon)
+
+    def poll(self, now_ns=None):
+        """
+        Periodic housekeeping: advance to now_ns if given, then hand
+        over a batch that has waited max_delay.
+        """
+        if now_ns is not None:
+            self.advance(now_ns)
+        if self._batch and (time.monotonic() - self._batch_started
+                            >= self.max_delay):
+            self.flush()
+
+    def close(self):
+        """Close every open candle, however recent, and flush."""
+        for series in self._series.values():
+            self._finalize(series, 2**62)
+            series.next_check = -1
+        self.flush()
+
+    def open_candles(self, instrument):
+        """
+        Snapshot of the forming M1 candles of an instrument.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            CANDLE_COLUMNS, oldest first
+        """
+        series = self._series.get(instrument)
+        rows = sorted(
+            (pd.Timestamp(c.start * MINUTE_NS, tz='UTC'), c.open, c.high,
+             c.low, c.close, c.volume)
+            for c in (series.slots if series else []) if c.start >= 0)
+        return pd.DataFrame(rows, columns=CANDLE_COLUMNS)
+
+    # Hand-off ------------------------------------------------------------
+
+    def flush(self):
+        """Hand buffered candles to the sinks and validators."""
+        if not self._batch:
+            return
+        batch = pd.DataFrame(self._batch, columns=BATCH_COLUMNS)
+        self._batch = []
+        batch['time'] = pd.to_datetime(batch['time'], utc=True)
+
+        for (instrument, granularity), group in batch.groupby(
+                ['instrument', 'granularity'], sort=False):
+            group = group.sort_values('time', kind='stable')
+            if granularity in self.validators:
+                self.validators[granularity].update(group)
+
+            df = group[CANDLE_COLUMNS].reset_index(drop=True)
+            for sink in self.sinks:
+                try:
+                    sink(df, instrument, granularity)
+                except Exception as e:
+                    logger.error("❌ Sink failed for %s (%s), %d candles: %s",
+                                 instrument, granularity, len(df), e)
+
+    def stats(self):
+        return {
+            'ticks': self.ticks,
+            'late': self.late,
+            'candles': self.candles,
+            'buffered': len(self._batch),
+        }
@@ -0,0 +1,83 @@
+# src/utils/timeframes.py
+
+import pandas as pd
+
+# Nominal length of each OANDA granularity. 'M' (monthly) has no fixed
+# length; 31 days is its upper bound, which is what paging needs.
+GRANULARITY_SECONDS = {
+    'M1': 60,
+    'M5': 5 * 60,
+    'M15': 15 * 60,
+    'M30': 30 * 60,
+    'H1': 60 * 60,
+    'H4': 4 * 60 * 60,
+    'D': 24 * 60 * 60,
+    'W': 7 * 24 * 60 * 60,
+    'M': 31 * 24 * 60 * 60,
+}
+
+# Most candles OANDA returns for a single request
+MAX_CANDLES_PER_REQUEST = 5000
+
+
+def granularity_to_timedelta(granularity):
+    try:
+        return pd.Timedelta(seconds=GRANULARITY_SECONDS[granularity])
+    except KeyError:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+
+
+def to_utc(value):
+    """Coerce a datetime-like to a UTC Timestamp (naive means UTC)."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        return ts.tz_localize('UTC')
+    return ts.tz_convert('UTC')
+
+
+def complete_candles(df):
+    """
+    Keep only the candles OANDA marked complete, dropping the 'complete'
+    column (see get_candles(include_complete=True)). OANDA's flag, not
+    the clock, decides: a candle can still be forming after its nominal
+    period has ended.
+    """
+    return df[df['complete'].to_numpy()].drop(columns='complete')
+
+
+def split_range(granularity, start, end,
+                max_candles=MAX_CANDLES_PER_REQUEST):
+    """
+    Split [start, end) into pages for OANDA's from/to, none sharing a
+    candle.
+
+    Page starts are candle boundaries (resampler.bucket_start, so H4,
+    D, W and M follow OANDA's alignment rather than the UTC epoch); the
+    first is the boundary at or before `start`. OANDA's `to` is
+    inclusive, so each page's `to` is the open time of the candle just
+    before the next page's `from`, and the last page's `to` that of the
+    candle containing the instant before `end`. A page covers at most
+    `max_candles` candle periods.
+
+    Returns:
+    --------
+    list of (pandas.Timestamp, pandas.Timestamp)
+    """
+    # Local import: the resampler imports this module
+    from src.utils.resampler import bucket_start
+
+    step = granularity_to_timedelta(granularity)
+    start, end = to_utc(start), to_utc(end)
+    if end <= start:
+        return []
+
+    instant = pd.Timedelta(1, 'ns')
+    span = step * max(max_candles, 1)
+    pages = []
+    page_start = bucket_start(start, granularity)
+    while page_start < end:
+        next_start = bucket_start(page_start + span, granularity)
+        last_open = bucket_start(min(next_start, end) - instant, granularity)
+        pages.append((page_start, last_open))
+        page_start = next_start
+    return pages
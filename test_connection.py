@@ -1,7 +1,7 @@
 # test_connection.py
 
 from src.oanda_api import OandaAPI
-import os
+from src.storage.candle_store import CandleStore
 
 
 def main():
@@ -15,8 +15,8 @@ def main():
     print("\n1. Initializing OANDA API...")
     api = OandaAPI()
 
-    # Create data directory if it doesn't exist
-    os.makedirs('data', exist_ok=True)
+    # Partitioned Parquet store under PathConfig.RAW_DATA_DIR
+    store = CandleStore()
 
     # Step 3: Fetch and save EUR/USD data
     print("\n3. Fetching EUR/USD data (1H, 500 candles)...")
@@ -24,9 +24,9 @@ def main():
 
     if df_eur is not None:
         print(f"✅ Retrieved {len(df_eur)} candles")
-        # Save to CSV
-        df_eur.to_csv('data/eur_usd_1h.csv', index=False)
-        print(f"💾 Saved to data/eur_usd_1h.csv")
+        # Save to the candle store
+        store.append(df_eur, 'EUR_USD', 'H1')
+        print(f"💾 Saved to {store.root}/instrument=EUR_USD/granularity=H1")
         print("\nFirst 5 rows:")
         print(df_eur.head())
         print("\nLast 5 rows:")
@@ -41,9 +41,9 @@ def main():
 
     if df_jpy is not None:
         print(f"✅ Retrieved {len(df_jpy)} candles")
-        # Save to CSV
-        df_jpy.to_csv('data/usd_jpy_4h.csv', index=False)
-        print(f"💾 Saved to data/usd_jpy_4h.csv")
+        # Save to the candle store
+        store.append(df_jpy, 'USD_JPY', 'H4')
+        print(f"💾 Saved to {store.root}/instrument=USD_JPY/granularity=H4")
         print("\nFirst 5 rows:")
         print(df_jpy.head())
     else:
@@ -55,9 +55,9 @@ def main():
 
     if df_btc is not None:
         print(f"✅ Retrieved {len(df_btc)} candles")
-        # Save to CSV
-        df_btc.to_csv('data/btc_usd_daily.csv', index=False)
-        print(f"💾 Saved to data/btc_usd_daily.csv")
+        # Save to the candle store
+        store.append(df_btc, 'BTC_USD', 'D')
+        print(f"💾 Saved to {store.root}/instrument=BTC_USD/granularity=D")
         print("\nFirst 5 rows:")
         print(df_btc.head())
         print("\nBasic statistics:")
@@ -0,0 +1,70 @@
+# tests/conftest.py
+"""
+Shared fixtures: the local mock OANDA server, OandaAPI clients pointed at
+it, and temporary SQLite databases with database/schema_sqlite.sql.
+"""
+
+import pytest
+
+from benchmarks.mock_oanda import MockOandaServer
+from config import APIConfig
+from src.db.connection import SQLITE_PREFIX, create_sqlite_schema, \
+    get_connection
+
+
+@pytest.fixture
+def oanda_server():
+    """Start MockOandaServer(**kwargs); every server is stopped after."""
+    servers = []
+
+    def start(**kwargs):
+        server = MockOandaServer(**kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def make_api(monkeypatch):
+    """OandaAPI(**kwargs) talking to the given mock server."""
+    from src.oanda_api import OandaAPI
+
+    apis = []
+    monkeypatch.setenv('OANDA_API_TOKEN', 'test-token')
+    monkeypatch.setenv('OANDA_ACCOUNT_ID', 'test-account')
+
+    def make(server, **kwargs):
+        monkeypatch.setenv('OANDA_BASE_URL', server.url)
+        api = OandaAPI(**kwargs)
+        apis.append(api)
+        return api
+
+    yield make
+    for api in apis:
+        api.close()
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    """Retry backoff in milliseconds instead of seconds."""
+    monkeypatch.setattr(APIConfig, 'BACKOFF_FACTOR', 0.01)
+
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    """URL of a temporary SQLite database with the schema applied."""
+    url = f"{SQLITE_PREFIX}{tmp_path / 'test.db'}"
+    conn = get_connection(url)
+    create_sqlite_schema(conn)
+    conn.close()
+    return url
+
+
+@pytest.fixture
+def sqlite_conn(sqlite_url):
+    conn = get_connection(sqlite_url)
+    yield conn
+    conn.close()
@@ -0,0 +1,83 @@
+# tests/test_backtest.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.engine import Strategy, fill_cost, run_events, \
+    run_vectorized
+
+CAPITAL = 10_000.0
+# Half of a 2 bps spread plus 1 bp of slippage
+COST = 2e-4
+
+
+@pytest.fixture
+def bars():
+    return pd.DataFrame({
+        'time': pd.date_range('2024-01-01', periods=4, freq='h', tz='UTC'),
+        'open': [100.0, 110.0, 121.0, 100.0],
+        'high': [106.0, 121.0, 131.0, 101.0],
+        'low': [99.0, 109.0, 120.0, 89.0],
+        'close': [105.0, 120.0, 130.0, 90.0],
+        'volume': [1, 1, 1, 1],
+    })
+
+
+class LongOneBar(Strategy):
+    # Long after the first close, flat after the second
+    def on_bar(self, bar, broker):
+        if bar.index == 0:
+            broker.order_target_percent(1.0)
+        elif bar.index == 1:
+            broker.order_target_percent(0.0)
+
+
+def test_fill_cost_is_half_spread_plus_slippage():
+    assert fill_cost(spread_bps=2, slippage_bps=1) == pytest.approx(COST)
+
+
+def test_vectorized_signal_at_close_fills_next_open(bars):
+    result = run_vectorized(bars, [1.0, 0.0, 0.0, 0.0], spread_bps=2,
+                            slippage_bps=1, initial_capital=CAPITAL)
+
+    # Bar 0's signal is held from bar 1's open to bar 2's open: bar 0's
+    # own move (100 -> 105) and bar 2's (121 -> 130) are not earned
+    assert result['position'].tolist() == [0.0, 1.0, 0.0, 0.0]
+    entered = CAPITAL * (1 - COST) * 120 / 110
+    exited = entered * 121 / 120 * (1 - COST)
+    np.testing.assert_allclose(result['equity'].to_numpy(),
+                               [CAPITAL, entered, exited, exited])
+    assert result['stats']['trades'] == 2
+
+
+def test_events_fill_at_next_open_with_costs(bars):
+    result = run_events(bars, LongOneBar(), spread_bps=2, slippage_bps=1,
+                        initial_capital=CAPITAL)
+
+    trades = result['trades']
+    assert trades['time'].tolist() == bars['time'].iloc[1:3].tolist()
+    units = CAPITAL / 110
+    assert trades['units'].tolist() == pytest.approx([units, -units])
+    assert trades['price'].tolist() == pytest.approx(
+        [110 * (1 + COST), 121 * (1 - COST)])
+    assert trades['cost'].tolist() == pytest.approx(
+        [units * 110 * COST, units * 121 * COST])
+
+    cash = CAPITAL - units * 110 * (1 + COST)
+    np.testing.assert_allclose(
+        result['equity'].to_numpy(),
+        [CAPITAL, cash + units * 120] +
+        [cash + units * 121 * (1 - COST)] * 2)
+    assert result['position'].tolist()[0] == 0.0
+    assert result['position'].tolist()[2:] == [0.0, 0.0]
+
+
+def test_costless_modes_agree(bars):
+    signal = [1.0, 0.0, 0.0, 0.0]
+    vectorized = run_vectorized(bars, signal, spread_bps=0, slippage_bps=0,
+                                initial_capital=CAPITAL)
+    events = run_events(bars, LongOneBar(), spread_bps=0, slippage_bps=0,
+                        initial_capital=CAPITAL)
+    np.testing.assert_allclose(vectorized['equity'].to_numpy(),
+                               events['equity'].to_numpy())
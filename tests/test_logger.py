@@ -0,0 +1,68 @@
+# tests/test_logger.py
+
+import logging
+import multiprocessing
+
+import pytest
+
+from config import LogConfig
+from src.utils import logger as logger_module
+from src.utils.logger import configure_logging, setup_logger, \
+    shutdown_logging
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    """Log to a temporary file only; the default setup is restored after."""
+    path = tmp_path / 'pipeline.log'
+    monkeypatch.setattr(LogConfig, 'LOG_FILE', str(path))
+    monkeypatch.setattr(LogConfig, 'LOG_TO_CONSOLE', False)
+    configure_logging()
+    yield path
+    monkeypatch.undo()
+    configure_logging()
+
+
+def _child_logs(n):
+    log = setup_logger('child')
+    # The child has no file handler of its own
+    handlers = logger_module._listener.handlers
+    assert [type(h) for h in handlers] == [logger_module._ForwardHandler]
+    for i in range(n):
+        log.info("child record %d", i, extra={'handlers': handlers})
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        log.exception("child failure")
+
+
+def test_forked_children_log_through_the_parent(log_file):
+    setup_logger('parent').info("parent record")
+
+    ctx = multiprocessing.get_context('fork')
+    children = [ctx.Process(target=_child_logs, args=(50,))
+                for _ in range(2)]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join(10)
+    assert [child.exitcode for child in children] == [0, 0]
+    shutdown_logging()
+
+    text = log_file.read_text()
+    assert "parent record" in text
+    assert text.count("child record") == 100
+    assert text.count("ValueError: boom") == 2
+
+
+def test_configure_keeps_foreign_handlers(log_file):
+    root = logging.getLogger()
+    foreign = logging.NullHandler()
+    root.addHandler(foreign)
+    try:
+        configure_logging()
+        configure_logging()
+        assert foreign in root.handlers
+        assert root.handlers.count(logger_module._handler) == 1
+    finally:
+        root.removeHandler(foreign)
@@ -0,0 +1,111 @@
+# tests/test_oanda_api.py
+
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+from config import APIConfig
+
+
+def test_429_honours_retry_after(oanda_server, make_api, monkeypatch):
+    # Backoff alone would wait seconds; Retry-After says 0.2
+    monkeypatch.setattr(APIConfig, 'BACKOFF_FACTOR', 5)
+    server = oanda_server(fail_first=1, error_status=429, retry_after=0.2)
+    api = make_api(server)
+
+    start = time.perf_counter()
+    df = api.get_candles('EUR_USD', 'H1', count=10)
+    elapsed = time.perf_counter() - start
+
+    assert df is not None and len(df) == 10
+    assert 0.2 <= elapsed < 2
+    assert server.requests_served == 2
+    assert api.get_request_stats()['total_retries'] == 1
+
+
+def test_5xx_is_retried_until_success(oanda_server, make_api, fast_backoff):
+    server = oanda_server(fail_first=2, error_status=503)
+    api = make_api(server)
+
+    df = api.get_candles('EUR_USD', 'H1', count=10)
+
+    assert df is not None and len(df) == 10
+    assert server.requests_served == 3
+    stats = api.get_request_stats()
+    assert (stats['total_requests'], stats['total_retries']) == (1, 2)
+
+
+def test_retries_exhausted_returns_last_error(oanda_server, make_api,
+                                              fast_backoff):
+    server = oanda_server(error_rate=1.0, error_status=503)
+    api = make_api(server)
+
+    with pytest.raises(RuntimeError, match='HTTP 503'):
+        api.get_candles_payload('EUR_USD', 'H1', count=10)
+    assert api.get_candles('EUR_USD', 'H1', count=10) is None
+
+    assert server.requests_served == 2 * (APIConfig.MAX_RETRIES + 1)
+    assert api.get_request_stats()['total_retries'] == \
+        2 * APIConfig.MAX_RETRIES
+
+
+def test_connection_errors_exhaust_retries_and_raise(oanda_server, make_api,
+                                                     fast_backoff):
+    server = oanda_server()
+    api = make_api(server)
+    server.stop()
+
+    with pytest.raises(requests.ConnectionError):
+        api._request(f"{server.url}/v3/instruments/EUR_USD/candles")
+
+    stats = api.get_request_stats()
+    assert (stats['total_requests'], stats['total_retries']) == \
+        (1, APIConfig.MAX_RETRIES)
+    assert api.request_stats[-1]['status_code'] is None
+
+
+def test_session_reuses_one_connection(oanda_server, make_api):
+    server = oanda_server()
+    api = make_api(server)
+
+    for _ in range(10):
+        assert api.get_candles('EUR_USD', 'M5', count=20) is not None
+
+    assert server.connections_opened == 1
+    stats = api.get_request_stats()
+    assert (stats['total_requests'], stats['total_retries']) == (10, 0)
+    assert 0 < stats['latency_p50'] <= stats['latency_p95'] <= \
+        stats['latency_max']
+
+
+def test_stale_range_refreshes_only_its_tail(oanda_server, make_api,
+                                             tmp_path):
+    from src.storage.response_cache import ResponseCache, request_key
+
+    server = oanda_server()
+    api = make_api(server, cache=ResponseCache(root=str(tmp_path), ttl=0))
+    end = pd.Timestamp.now(tz='UTC').floor('h') - pd.Timedelta(hours=24)
+    # OANDA's `to` is inclusive: 24 candles
+    start = end - pd.Timedelta(hours=23)
+
+    first = api.get_candles('EUR_USD', 'H1', count=None, start=start,
+                            end=end)
+    assert first is not None and len(first) == 24
+
+    # Pretend the last candles were still forming when cached
+    key = request_key('EUR_USD', 'H1', None, start, end)
+    df, _ = api.cache.get(key)
+    df.loc[df.index[-3:], 'complete'] = False
+    api.cache.put(key, df, final=False)
+    requests_before = server.requests_served
+
+    refreshed = api.get_candles('EUR_USD', 'H1', count=None, start=start,
+                                end=end)
+
+    assert server.requests_served - requests_before == 1
+    # The mock's prices restart at each request, so compare timestamps
+    assert refreshed['time'].tolist() == first['time'].tolist()
+    assert refreshed['open'].iloc[:-3].tolist() == \
+        first['open'].iloc[:-3].tolist()
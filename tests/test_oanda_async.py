@@ -0,0 +1,74 @@
+# tests/test_oanda_async.py
+
+import asyncio
+import time
+
+from src.oanda_async import AsyncCandleFetcher
+
+LATENCY = 0.1  # seconds injected per request
+JOBS = [(instrument, granularity, 50)
+        for instrument in ('EUR_USD', 'GBP_USD', 'USD_JPY', 'AUD_USD')
+        for granularity in ('M1', 'M5', 'H1', 'H4', 'D')]
+
+
+def test_concurrent_fetch_beats_serial(oanda_server, make_api):
+    api = make_api(oanda_server(latency=LATENCY), pool_size=10)
+
+    start = time.perf_counter()
+    for instrument, granularity, count in JOBS:
+        assert api.get_candles(instrument, granularity, count) is not None
+    serial = time.perf_counter() - start
+
+    with AsyncCandleFetcher(api, max_concurrency=10) as fetcher:
+        start = time.perf_counter()
+        results = fetcher.fetch_all(JOBS)
+        concurrent = time.perf_counter() - start
+
+    assert len(results) == len(JOBS)
+    assert all(df is not None and len(df) == 50 for df in results.values())
+    # 20 requests, 10 at a time would be ~10x, but the mock server shares
+    # this process (and its GIL), so payload generation and parsing stay
+    # serial
+    assert serial >= len(JOBS) * LATENCY
+    assert concurrent * 2 < serial
+
+
+def test_early_exit_does_not_wait_for_requests_in_flight(oanda_server,
+                                                         make_api):
+    latency = 0.5
+    api = make_api(oanda_server(latency=latency), pool_size=4)
+    fetcher = AsyncCandleFetcher(api, max_concurrency=4)
+
+    async def first_result():
+        results = fetcher.fetch(JOBS)
+        result = await results.__anext__()
+        start = time.perf_counter()
+        await results.aclose()
+        return result, time.perf_counter() - start
+
+    try:
+        result, closing = asyncio.run(first_result())
+    finally:
+        fetcher.close()
+
+    assert result.df is not None
+    assert closing < latency / 2
+
+
+def test_close_releases_only_an_owned_session(oanda_server, make_api,
+                                              monkeypatch):
+    server = oanda_server()
+    shared = make_api(server)
+
+    closed = []
+    monkeypatch.setattr('src.oanda_api.OandaAPI.close',
+                        lambda api: closed.append(api))
+
+    with AsyncCandleFetcher(max_concurrency=2) as owner:
+        results = owner.fetch_all(JOBS[:2])
+        assert all(df is not None for df in results.values())
+    with AsyncCandleFetcher(shared, max_concurrency=2) as borrower:
+        results = borrower.fetch_all(JOBS[:2])
+        assert all(df is not None for df in results.values())
+
+    assert closed == [owner.api]
@@ -0,0 +1,70 @@
+# tests/test_parallel_features.py
+
+from multiprocessing import shared_memory
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_candle_frame
+from src.features import parallel
+from src.features.indicators import compute_indicators
+from src.features.parallel import compute_features_parallel
+from src.storage.feature_store import FeatureStore
+
+SERIES = [('EUR_USD', 'H1'), ('USD_JPY', 'H4')]
+
+
+@pytest.fixture
+def frames():
+    return {key: make_candle_frame(2_000, key[1], seed=i)
+            for i, key in enumerate(SERIES)}
+
+
+def test_workers_store_features_and_parent_sink_gets_them(frames,
+                                                          tmp_path):
+    store = FeatureStore(str(tmp_path / 'features'))
+    sunk = {}
+
+    def sink(features, instrument, granularity):
+        sunk[(instrument, granularity)] = features
+
+    results = compute_features_parallel(SERIES, frames=frames, sink=sink,
+                                        feature_store=store, max_workers=2)
+
+    assert [r['status'] for r in results] == ['SUCCESS', 'SUCCESS']
+    for key, df in frames.items():
+        expected = compute_indicators(df)
+        stored = store.read(*key)
+        pd.testing.assert_frame_equal(
+            stored[expected.columns].reset_index(drop=True), expected,
+            check_dtype=False)
+        pd.testing.assert_frame_equal(sunk[key], expected,
+                                      check_dtype=False)
+
+
+def test_failed_submit_releases_shared_memory(frames, tmp_path,
+                                              monkeypatch):
+    created = []
+    prepare = parallel._Task.prepare
+
+    def recording_prepare(task, *args, **kwargs):
+        ready = prepare(task, *args, **kwargs)
+        created.extend(block.name for block in (task.input, task.output)
+                       if block is not None)
+        return ready
+
+    def broken_submit(self, *args, **kwargs):
+        raise RuntimeError("pool is broken")
+
+    monkeypatch.setattr(parallel._Task, 'prepare', recording_prepare)
+    monkeypatch.setattr(parallel.ProcessPoolExecutor, 'submit', broken_submit)
+
+    with pytest.raises(RuntimeError, match='pool is broken'):
+        compute_features_parallel(
+            SERIES, frames=frames, sink=lambda *args: None,
+            feature_store=FeatureStore(str(tmp_path)), max_workers=1)
+
+    assert created
+    for name in created:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
@@ -0,0 +1,109 @@
+# tests/test_pipeline.py
+
+import threading
+
+import pytest
+
+from src.db.pool import ConnectionPool
+from src.pipeline import Pipeline, Stage, build_ingest_pipeline
+
+PARTITIONS = [('EUR_USD', 'H1'), ('USD_JPY', 'H1'), ('GBP_USD', 'H1')]
+
+
+@pytest.fixture
+def pool(sqlite_url):
+    pool = ConnectionPool(sqlite_url, pool_size=1, max_overflow=0)
+    yield pool
+    pool.closeall()
+
+
+def recorded(pool):
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT instrument, status FROM extraction_metadata ORDER BY id
+        """)
+        rows = cursor.fetchall()
+        cursor.close()
+    return sorted(rows)
+
+
+def make_pipeline(pool, failing):
+    # extract -> transform -> load, with a side branch off extract
+    calls = []
+    lock = threading.Lock()
+
+    def stage(name, fail=False):
+        def func(ctx):
+            with lock:
+                calls.append((name, ctx.instrument))
+            if fail and ctx.instrument in failing:
+                raise RuntimeError("boom")
+            if name == 'load':
+                ctx.rows = 1
+            return name
+        return func
+
+    pipeline = Pipeline([
+        Stage('extract', stage('extract'), workers=2),
+        Stage('transform', stage('transform', fail=True), ('extract',)),
+        Stage('load', stage('load'), ('transform',)),
+        Stage('report', stage('report'), ('extract',)),
+    ], db=pool)
+    return pipeline, calls
+
+
+def test_failed_stage_skips_only_its_partitions_downstream(pool):
+    pipeline, calls = make_pipeline(pool, failing={'USD_JPY'})
+
+    results = pipeline.run(PARTITIONS)
+
+    statuses = {r['instrument']: r['status'] for r in results}
+    failed = [r for r in results if r['instrument'] == 'USD_JPY'][0]
+    assert statuses == {'EUR_USD': 'SUCCESS', 'USD_JPY': 'FAILED',
+                        'GBP_USD': 'SUCCESS'}
+    assert failed['error'] == 'transform: boom'
+    assert ('load', 'USD_JPY') not in calls
+    # The independent branch still ran
+    assert ('report', 'USD_JPY') in calls
+    assert sum(name == 'load' for name, _ in calls) == 2
+    assert recorded(pool) == [('EUR_USD', 'SUCCESS'), ('GBP_USD', 'SUCCESS'),
+                              ('USD_JPY', 'FAILED')]
+
+
+def test_resume_skips_partitions_that_succeeded(pool):
+    pipeline, _ = make_pipeline(pool, failing={'USD_JPY', 'GBP_USD'})
+    pipeline.run(PARTITIONS)
+    checkpoint = pipeline.last_checkpoint
+
+    retry, calls = make_pipeline(pool, failing={'GBP_USD'})
+    results = retry.run(PARTITIONS, resume=checkpoint)
+
+    assert [r['instrument'] for r in results] == ['USD_JPY', 'GBP_USD']
+    assert {instrument for _, instrument in calls} == {'USD_JPY', 'GBP_USD'}
+    # The checkpoint carries over, so a further resume skips USD_JPY too
+    assert retry.last_checkpoint == checkpoint
+    third, calls = make_pipeline(pool, failing=set())
+    results = third.run(PARTITIONS, resume=retry.last_checkpoint)
+    assert [r['instrument'] for r in results] == ['GBP_USD']
+
+
+def test_resume_needs_a_database():
+    pipeline = Pipeline([Stage('extract', lambda ctx: None)])
+    with pytest.raises(ValueError):
+        pipeline.run(PARTITIONS, resume=0)
+
+
+def test_ingest_pipeline_loads_into_sqlite(oanda_server, make_api, pool):
+    api = make_api(oanda_server())
+    pipeline = build_ingest_pipeline(api, pool, initial_count=50)
+
+    results = pipeline.run(PARTITIONS[:2])
+
+    assert [r['status'] for r in results] == ['SUCCESS', 'SUCCESS']
+    assert [r['rows_extracted'] for r in results] == [50, 50]
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM raw_market_data")
+        assert cursor.fetchone()[0] == 100
+        cursor.close()
@@ -0,0 +1,57 @@
+# tests/test_pool.py
+
+import threading
+
+import pytest
+
+from src.db import pool as pool_module
+from src.db.connection import SQLITE_PREFIX
+from src.db.pool import ConnectionPool, get_pool
+
+
+def test_sqlite_connection_is_reused_across_threads(sqlite_url):
+    pool = ConnectionPool(sqlite_url, pool_size=1, max_overflow=0)
+    with pool.connection() as conn:
+        first = conn
+
+    seen = []
+
+    def worker():
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM raw_market_data")
+            seen.append((conn, cursor.fetchone()[0]))
+            cursor.close()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen == [(first, 0)]
+    stats = pool.stats()
+    assert (stats['opened'], stats['failed_pings']) == (1, 0)
+    pool.closeall()
+
+
+def test_get_pool_keeps_one_pool_per_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(pool_module, '_pools', {})
+    url_a = f"{SQLITE_PREFIX}{tmp_path / 'a.db'}"
+    url_b = f"{SQLITE_PREFIX}{tmp_path / 'b.db'}"
+
+    assert get_pool(url_a) is get_pool(url_a)
+    assert get_pool(url_b) is not get_pool(url_a)
+    assert get_pool(url_b).db_url == url_b
+
+    monkeypatch.setenv('DATABASE_URL', url_a)
+    assert get_pool() is get_pool(url_a)
+
+
+def test_pool_times_out_when_exhausted(sqlite_url):
+    pool = ConnectionPool(sqlite_url, pool_size=1, max_overflow=0,
+                          timeout=0.05)
+    conn = pool.getconn()
+    with pytest.raises(pool_module.PoolTimeout):
+        pool.getconn()
+    pool.putconn(conn)
+    assert pool.stats()['timeouts'] == 1
+    pool.closeall()
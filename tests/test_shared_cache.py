@@ -0,0 +1,105 @@
+# tests/test_shared_cache.py
+
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_ohlcv
+from src.db.loader import load_candles
+from src.db.pool import ConnectionPool
+from src.db.reader import read_latest
+from src.storage.binary_cache import frame_to_records
+from src.storage.shared_cache import SharedCandleCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def prefix():
+    prefix = f"test{uuid.uuid4().hex[:8]}"
+    yield prefix
+    leftovers = glob.glob(f"/dev/shm/{prefix}_*") + \
+        glob.glob(os.path.join(tempfile.gettempdir(), f"{prefix}_*.lock"))
+    for path in leftovers:
+        os.remove(path)
+
+
+def test_update_appends_and_refreshes_in_place(prefix):
+    cache = SharedCandleCache(capacity=8, prefix=prefix)
+    df = make_ohlcv(10, 'M1')
+    cache.update(df, 'EUR_USD', 'M1')
+
+    latest = cache.latest('EUR_USD', 'M1')
+    assert np.array_equal(latest, frame_to_records(df)[-8:])
+
+    # The last candle was still forming: same time, new close
+    df.loc[df.index[-1], 'close'] += 0.01
+    assert cache.update(df.tail(1), 'EUR_USD', 'M1') == 1
+    assert cache.latest('EUR_USD', 'M1', 1)['close'][0] == \
+        df['close'].iat[-1]
+    assert len(cache.latest('EUR_USD', 'M1')) == 8
+    cache.close()
+
+
+def test_miss_is_filled_from_the_database(prefix, sqlite_url):
+    pool = ConnectionPool(sqlite_url)
+    with pool.connection() as conn:
+        load_candles(conn, make_ohlcv(50, 'H1'), 'EUR_USD', 'H1')
+        expected = frame_to_records(read_latest(conn, 'EUR_USD', 'H1', 20))
+
+    cache = SharedCandleCache(db=pool, capacity=20, prefix=prefix)
+    assert np.array_equal(cache.latest('EUR_USD', 'H1'), expected)
+    # Other processes attach to the filled block without a database
+    reader = SharedCandleCache(prefix=prefix)
+    assert np.array_equal(reader.latest('EUR_USD', 'H1', 5), expected[-5:])
+    assert len(reader.latest('GBP_USD', 'H1')) == 0
+
+    reader.close()
+    cache.close()
+    pool.closeall()
+
+
+def test_attached_cache_follows_a_recreated_series(prefix):
+    # Each instance keeps its own attachments, as separate processes do
+    writer = SharedCandleCache(capacity=200, prefix=prefix)
+    reader = SharedCandleCache(capacity=200, prefix=prefix)
+    writer.update(make_ohlcv(100, 'M1'), 'EUR_USD', 'M1')
+    held = reader.latest('EUR_USD', 'M1')
+
+    writer.unlink('EUR_USD', 'M1')
+    writer.update(make_ohlcv(5, 'M1'), 'EUR_USD', 'M1')
+
+    assert len(reader.latest('EUR_USD', 'M1')) == 5
+    assert len(held) == 100  # still readable, no longer updated
+    reader.update(make_ohlcv(3, 'M1', start='2030-01-01'), 'EUR_USD', 'M1')
+    assert len(writer.latest('EUR_USD', 'M1')) == 8
+
+    del held
+    reader.close()
+    writer.close()
+
+
+def test_unlink_leaves_the_resource_tracker_quiet(prefix):
+    script = f"""
+from benchmarks.synthetic import make_ohlcv
+from src.storage.shared_cache import SharedCandleCache
+
+cache = SharedCandleCache(capacity=10, prefix={prefix!r})
+cache.update(make_ohlcv(10, 'M1'), 'EUR_USD', 'M1')
+cache.clear([('EUR_USD', 'M1')])
+cache.update(make_ohlcv(10, 'M1'), 'EUR_USD', 'M1')
+cache.close()
+cache.unlink('EUR_USD', 'M1')
+"""
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT,
+                            capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert 'Traceback' not in result.stderr
+    assert not glob.glob(f"/dev/shm/{prefix}_*")
@@ -0,0 +1,162 @@
+# tests/test_sync.py
+
+from src.db.connection import to_db_time
+from src.sync import get_watermark, sync_series
+
+INSTRUMENT = 'EUR_USD'
+GRANULARITY = 'H1'
+INITIAL_COUNT = 24
+
+
+def _scalar(conn, sql, params=()):
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    value = cursor.fetchone()[0]
+    cursor.close()
+    return value
+
+
+def _row_count(conn):
+    return _scalar(conn, "SELECT COUNT(*) FROM raw_market_data")
+
+
+def _last_extraction(conn):
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT status, rows_extracted, error_message, last_candle_time
+        FROM extraction_metadata ORDER BY id DESC LIMIT 1
+    """)
+    row = cursor.fetchone()
+    cursor.close()
+    return row
+
+
+def test_first_sync_fetches_initial_count(oanda_server, make_api,
+                                          sqlite_conn):
+    api = make_api(oanda_server())
+
+    result = sync_series(api, sqlite_conn, INSTRUMENT, GRANULARITY,
+                         initial_count=INITIAL_COUNT)
+
+    assert result['status'] == 'SUCCESS'
+    assert result['rows_extracted'] == INITIAL_COUNT
+    assert _row_count(sqlite_conn) == INITIAL_COUNT
+    assert get_watermark(sqlite_conn, INSTRUMENT, GRANULARITY) == \
+        result['watermark']
+    status, rows, _, _ = _last_extraction(sqlite_conn)
+    assert (status, rows) == ('SUCCESS', INITIAL_COUNT)
+
+
+def test_resumes_from_watermark_and_refreshes_it(oanda_server, make_api,
+                                                 sqlite_conn):
+    server = oanda_server()
+    api = make_api(server)
+    first = sync_series(api, sqlite_conn, INSTRUMENT, GRANULARITY,
+                        initial_count=INITIAL_COUNT)
+    watermark = first['watermark']
+
+    # Pretend the watermark candle was still forming when it was stored
+    stored_at = to_db_time(sqlite_conn, watermark)
+    sqlite_conn.execute(
+        "UPDATE raw_market_data SET close = 999.0 WHERE time = ?",
+        (stored_at,))
+    sqlite_conn.commit()
+    requests_before = server.requests_served
+
+    second = sync_series(api, sqlite_conn, INSTRUMENT, GRANULARITY,
+                         initial_count=INITIAL_COUNT)
+
+    assert second['status'] == 'SUCCESS'
+    # One small range request from the watermark, not another full fetch
+    assert server.requests_served - requests_before == 1
+    assert 1 <= second['rows_extracted'] < INITIAL_COUNT
+    assert second['watermark'] >= watermark
+    assert get_watermark(sqlite_conn, INSTRUMENT, GRANULARITY) == \
+        second['watermark']
+
+    # The watermark candle was fetched again and upserted, not duplicated
+    assert _scalar(sqlite_conn,
+                   "SELECT COUNT(*) FROM raw_market_data WHERE time = ?",
+                   (stored_at,)) == 1
+    assert _scalar(sqlite_conn,
+                   "SELECT close FROM raw_market_data WHERE time = ?",
+                   (stored_at,)) != 999.0
+    assert _row_count(sqlite_conn) == \
+        INITIAL_COUNT + second['rows_extracted'] - 1
+
+
+def test_failed_sync_is_recorded_and_keeps_watermark(oanda_server, make_api,
+                                                     sqlite_conn):
+    api = make_api(oanda_server())
+    first = sync_series(api, sqlite_conn, INSTRUMENT, GRANULARITY,
+                        initial_count=INITIAL_COUNT)
+
+    failing_api = make_api(oanda_server(error_rate=1.0, error_status=400))
+    result = sync_series(failing_api, sqlite_conn, INSTRUMENT, GRANULARITY,
+                         initial_count=INITIAL_COUNT)
+
+    assert result['status'] == 'FAILED'
+    assert result['rows_extracted'] == 0
+    status, rows, error_message, last_candle_time = \
+        _last_extraction(sqlite_conn)
+    assert (status, rows, last_candle_time) == ('FAILED', 0, None)
+    assert error_message
+    # Nothing was written and the next run resumes from the same place
+    assert _row_count(sqlite_conn) == INITIAL_COUNT
+    assert get_watermark(sqlite_conn, INSTRUMENT, GRANULARITY) == \
+        first['watermark']
+
+
+def test_database_without_metrics_column(oanda_server, make_api,
+                                         sqlite_conn):
+    # As created before the metrics column was added to the schema
+    sqlite_conn.execute("ALTER TABLE extraction_metadata DROP COLUMN metrics")
+    sqlite_conn.commit()
+
+    api = make_api(oanda_server())
+    ok = sync_series(api, sqlite_conn, INSTRUMENT, GRANULARITY,
+                     initial_count=INITIAL_COUNT)
+    failing_api = make_api(oanda_server(error_rate=1.0, error_status=400))
+    failed = sync_series(failing_api, sqlite_conn, INSTRUMENT, GRANULARITY,
+                         initial_count=INITIAL_COUNT)
+
+    assert (ok['status'], failed['status']) == ('SUCCESS', 'FAILED')
+    assert _last_extraction(sqlite_conn)[0] == 'FAILED'
+    assert _scalar(sqlite_conn,
+                   "SELECT COUNT(*) FROM extraction_metadata") == 2
+
+
+def test_migrate_metrics_adds_the_column(sqlite_url, sqlite_conn,
+                                         monkeypatch):
+    from database.migrate_metrics import migrate
+    from src.db import pool as pool_module
+    from src.db.connection import has_column
+
+    sqlite_conn.execute("ALTER TABLE extraction_metadata DROP COLUMN metrics")
+    sqlite_conn.commit()
+    monkeypatch.setattr(pool_module, '_pools', {})
+    monkeypatch.setenv('DATABASE_URL', sqlite_url)
+
+    assert migrate()
+    assert has_column(sqlite_conn, 'extraction_metadata', 'metrics')
+    assert migrate()  # already there
+
+
+def test_binary_cache_gets_only_candles_oanda_marked_complete(
+        oanda_server, make_api, sqlite_conn, tmp_path):
+    from src.storage.binary_cache import BinaryCandleCache
+
+    # The mock flags the last candle of each response as still forming,
+    # although its period has already ended by the clock
+    api = make_api(oanda_server())
+    cache = BinaryCandleCache(root=str(tmp_path / 'cache'))
+
+    result = sync_series(api, sqlite_conn, INSTRUMENT, GRANULARITY,
+                         initial_count=INITIAL_COUNT, cache=cache)
+
+    assert result['rows_extracted'] == INITIAL_COUNT
+    assert _row_count(sqlite_conn) == INITIAL_COUNT
+    cached = cache.load(INSTRUMENT, GRANULARITY)
+    assert len(cached) == INITIAL_COUNT - 1
+    assert cache.last_time(INSTRUMENT, GRANULARITY) < result['watermark']
+    cache.close()
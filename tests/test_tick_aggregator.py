@@ -0,0 +1,78 @@
+# tests/test_tick_aggregator.py
+
+import pandas as pd
+
+from src.utils.tick_aggregator import TickAggregator
+
+T0 = pd.Timestamp('2024-01-02', tz='UTC').value
+SECOND = 10**9
+
+
+def make_aggregator(**kwargs):
+    received = []
+    aggregator = TickAggregator(
+        granularities=['M1', 'M5'], lateness=30, batch_size=1000,
+        max_delay=3600, sinks=[lambda df, *key: received.append((key, df))],
+        **kwargs)
+    return aggregator, received
+
+
+def candles(received, granularity):
+    frames = [df for (_, g), df in received if g == granularity]
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_reordered_ticks_within_lateness_update_open_and_close():
+    aggregator, received = make_aggregator()
+    for second, price in [(10, 1.0), (50, 1.2), (5, 0.9), (30, 1.5),
+                          (70, 2.0), (55, 1.1), (95, 2.5)]:
+        assert aggregator.update('EUR_USD', T0 + second * SECOND, price)
+    aggregator.close()
+
+    m1 = candles(received, 'M1')
+    assert m1['time'].tolist() == [pd.Timestamp(T0, tz='UTC'),
+                                   pd.Timestamp(T0 + 60 * SECOND, tz='UTC')]
+    # 5s opened and 55s closed minute 0 although both arrived late
+    assert m1.iloc[0][['open', 'high', 'low', 'close', 'volume']].tolist() \
+        == [0.9, 1.5, 0.9, 1.1, 5]
+    assert m1.iloc[1][['open', 'close', 'volume']].tolist() == [2.0, 2.5, 2]
+
+    m5 = candles(received, 'M5')
+    assert m5[['open', 'high', 'low', 'close', 'volume']].values.tolist() \
+        == [[0.9, 2.5, 0.9, 2.5, 7]]
+
+
+def test_ticks_past_lateness_are_dropped_and_counted():
+    aggregator, received = make_aggregator()
+    aggregator.update('EUR_USD', T0 + 10 * SECOND, 1.0)
+    # Horizon 95 - 30 = 65s closes minute 0
+    aggregator.update('EUR_USD', T0 + 95 * SECOND, 2.0)
+
+    assert not aggregator.update('EUR_USD', T0 + 59 * SECOND, 9.9)
+    assert not aggregator.update('EUR_USD', T0 + 1 * SECOND, 9.9)
+    # Minute 1 is still within the window
+    assert aggregator.update('EUR_USD', T0 + 61 * SECOND, 1.5)
+    # Lateness is per instrument: another one starts afresh
+    assert aggregator.update('USD_JPY', T0 + 1 * SECOND, 150.0)
+    aggregator.close()
+
+    assert aggregator.stats() == {'ticks': 4, 'late': 2, 'candles': 5,
+                                  'buffered': 0}
+    m1 = candles(received, 'M1')
+    eur = m1.iloc[:2]
+    assert eur[['open', 'high', 'low', 'close', 'volume']].values.tolist() \
+        == [[1.0, 1.0, 1.0, 1.0, 1], [1.5, 2.0, 1.5, 2.0, 2]]
+    assert 9.9 not in candles(received, 'M5')['high'].tolist()
+
+
+def test_quiet_instrument_closes_on_advance():
+    aggregator, received = make_aggregator()
+    aggregator.update('EUR_USD', T0 + 10 * SECOND, 1.0)
+
+    aggregator.advance(T0 + 89 * SECOND)
+    aggregator.flush()
+    assert received == []
+
+    aggregator.advance(T0 + 90 * SECOND)
+    aggregator.flush()
+    assert [key for key, _ in received] == [('EUR_USD', 'M1')]
@@ -0,0 +1,60 @@
+# tests/test_timeframes.py
+
+import pandas as pd
+
+from src.utils.resampler import bucket_start
+from src.utils.timeframes import granularity_to_timedelta, split_range
+
+
+def test_pages_share_no_candle_and_stay_within_max_candles():
+    step = granularity_to_timedelta('M1')
+    start = pd.Timestamp('2024-01-01', tz='UTC')
+    end = start + step * 12_000
+
+    pages = split_range('M1', start, end, max_candles=5000)
+
+    assert pages[0][0] == start and pages[-1][1] == end - step
+    for (_, last_open), (next_start, _) in zip(pages, pages[1:]):
+        # `to` is inclusive: the page ends one candle before the next
+        assert last_open + step == next_start
+    for page_start, last_open in pages:
+        assert (last_open - page_start) // step + 1 <= 5000
+
+
+def test_unaligned_start_is_floored():
+    pages = split_range('H1', '2024-01-01 10:30', '2024-01-01 12:00')
+    assert pages == [(pd.Timestamp('2024-01-01 10:00', tz='UTC'),
+                      pd.Timestamp('2024-01-01 11:00', tz='UTC'))]
+
+
+def test_daily_pages_follow_oanda_alignment_across_dst():
+    # New York moves to summer time on 2024-03-10: daily candles open
+    # at 22:00 UTC before it and 21:00 UTC after
+    pages = split_range('D', '2024-03-01', '2024-04-15', max_candles=10)
+
+    assert pages[0][0] == pd.Timestamp('2024-02-29 22:00', tz='UTC')
+    assert pages[-1][1] == pd.Timestamp('2024-04-14 21:00', tz='UTC')
+    for page_start, last_open in pages:
+        assert bucket_start(page_start, 'D') == page_start
+        assert bucket_start(last_open, 'D') == last_open
+    for (_, last_open), (next_start, _) in zip(pages, pages[1:]):
+        assert bucket_start(next_start - pd.Timedelta(1, 'ns'), 'D') == \
+            last_open
+
+
+def test_range_pages_fetch_each_candle_once(oanda_server, make_api):
+    from src.utils.parsers import parse_candles
+
+    server = oanda_server()
+    api = make_api(server)
+    start = pd.Timestamp('2024-01-01', tz='UTC')
+    end = start + pd.Timedelta(minutes=25)
+
+    times = []
+    for page_start, last_open in split_range('M1', start, end,
+                                             max_candles=10):
+        payload = api.get_candles_payload('EUR_USD', 'M1', start=page_start,
+                                          end=last_open)
+        times.extend(parse_candles(payload)['time'])
+
+    assert times == list(pd.date_range(start, periods=25, freq='min'))
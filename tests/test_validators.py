@@ -0,0 +1,82 @@
+# tests/test_validators.py
+
+import pandas as pd
+import pytest
+
+from src.utils.validators import validate_data
+
+NEW_YORK = 'America/New_York'
+
+
+def _load(name):
+    return pd.read_csv(f'data/{name}', parse_dates=['time'])
+
+
+def _oanda_daily(weeks, start='2024-01-07'):
+    # D candles open Sunday to Thursday at 17:00 New York time
+    days = pd.date_range(start, periods=weeks * 7, freq='D')
+    days = days[days.dayofweek.isin([6, 0, 1, 2, 3])]
+    times = (days + pd.Timedelta(hours=17)).tz_localize(NEW_YORK) \
+        .tz_convert('UTC')
+    return pd.DataFrame({'time': times, 'open': 1.1, 'high': 1.2,
+                         'low': 1.0, 'close': 1.1, 'volume': 100})
+
+
+@pytest.mark.parametrize('name, granularity, expected', [
+    # What is left are the Christmas and New Year closures
+    ('btc_usd_daily.csv', 'D', (4, 4, 73)),
+    ('usd_jpy_4h.csv', 'H4', (2, 12, 17)),
+    ('eur_usd_1h.csv', 'H1', (0, 0, 4)),
+])
+def test_bundled_data_weekends_are_not_missing_bars(name, granularity,
+                                                    expected):
+    gaps = validate_data(_load(name), granularity)['gaps']
+    assert (gaps['gap_count'], gaps['missing_bars'],
+            gaps['weekend_gaps']) == expected
+
+
+def test_oanda_daily_weekends_across_dst():
+    # March 2024 spans the US switch to daylight saving time
+    df = _oanda_daily(8, start='2024-02-18')
+
+    gaps = validate_data(df, 'D')['gaps']
+
+    assert (gaps['gap_count'], gaps['missing_bars'],
+            gaps['weekend_gaps']) == (0, 0, 7)
+
+
+def test_missing_weekday_is_a_gap_and_weekend_extra_is_counted():
+    df = _oanda_daily(4)
+    # Drop a Tuesday and the Thursday before a weekend
+    dropped = df['time'].dt.tz_convert(NEW_YORK).dt.dayofweek
+    df = df.drop(index=[dropped[dropped == 0].index[1],
+                        dropped[dropped == 2].index[2]])
+
+    gaps = validate_data(df, 'D')['gaps']
+
+    assert (gaps['gap_count'], gaps['missing_bars'],
+            gaps['weekend_gaps']) == (2, 2, 3)
+
+
+def test_series_keys_separate_gaps_and_duplicates():
+    a = _oanda_daily(2)
+    b = _oanda_daily(2).iloc[::2]
+    df = pd.concat([a.assign(instrument='EUR_USD'),
+                    b.assign(instrument='USD_JPY'),
+                    a.iloc[[-1]].assign(instrument='EUR_USD')],
+                   ignore_index=True)
+    df['granularity'] = 'D'
+
+    report = validate_data(df)
+
+    assert report['gaps']['granularity'] == 'D'
+    assert report['duplicates']['key'] == ['instrument', 'granularity',
+                                           'time']
+    assert report['duplicates']['duplicate_count'] == 1
+    # Only USD_JPY has missing bars; stepping between series is neither
+    # a gap nor out of order
+    assert report['gaps']['missing_bars'] == 4
+    assert report['timestamps']['non_monotonic_count'] == 0
+
+    df['instrument'] = df['instrument'].astype('category')
+    assert validate_data(df) == report